@@ -0,0 +1,59 @@
+#!venv/bin/python
+
+'''Memory use of a recording process as the number of recorded calls grows.
+
+  Records `--calls` calls to a decorated function and reports the memory
+  allocated by Python (tracemalloc) after every `--step` calls. With the
+  default `keep_tunes=False` the allocated memory should stay flat. With
+  `--keep-tunes` it grows with every call.
+
+  Usage:
+
+    benchmarks/memory.py [--calls 100000] [--step 10000] [--keep-tunes] [--background]
+'''
+
+import argparse
+import os
+import tempfile
+import tracemalloc
+
+from rekorder import Recorder, When
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--calls', type=int, default=100000)
+  parser.add_argument('--step', type=int, default=10000)
+  parser.add_argument('--keep-tunes', action='store_true')
+  parser.add_argument('--background', action='store_true')
+  args = parser.parse_args()
+
+  output = os.path.join(tempfile.mkdtemp(), 'memory.json')
+  recorder = Recorder.get_recorder(
+      name='memory', output=output, keep_tunes=args.keep_tunes, background=args.background)
+
+  @recorder.method.params(when=When.AROUND)
+  @recorder.method.rval
+  def work(n, payload):
+    return {'n': n, 'payload': payload}
+
+  @recorder.begin
+  @recorder.end
+  def run():
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    print("{:>10}  {:>12}  {:>12}".format('calls', 'allocated', 'per call'))
+    for n in range(1, args.calls + 1):
+      work(n, payload=['x' * 32, n, n / 3.0])
+      if n % args.step == 0:
+        allocated = tracemalloc.get_traced_memory()[0] - baseline
+        print("{:>10}  {:>12}  {:>12.1f}".format(n, allocated, allocated / n))
+    tracemalloc.stop()
+
+  run()
+  print("keep_tunes [{}] background [{}] output [{}] [{}] bytes".format(
+      args.keep_tunes, args.background, output, os.path.getsize(output)))
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,97 @@
+#!venv/bin/python
+
+'''Recording throughput and the size of a recorded tune.
+
+  Records `--calls` calls to a decorated function (two tunes per call) and
+  reports:
+    - tunes per second.
+    - bytes of output per tune.
+    - bytes of memory per tune, measured with tracemalloc while the tracks
+      keep every tune (keep_tunes=True).
+
+  Usage:
+
+    benchmarks/throughput.py [--calls 100000] [--format json|binary] [--background] [--sample 0.01]
+                             [--threads 4] [--per-thread]
+
+  With --sample, tunes per second counts the calls that were not recorded
+  too (i.e. - it is calls per second).
+
+  With --threads, the calls are shared by that many threads. --per-thread
+  gives each thread its own buffer (see ThreadBuffers).
+'''
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from rekorder import RecordingMedium, Recorder, When
+
+
+def record(args, keep_tunes, trace):
+  extension = {'json': '.json', 'binary': '.rkdr'}[args.format]
+  output = os.path.join(tempfile.mkdtemp(), 'throughput' + extension)
+  recorder = Recorder.get_recorder(
+      name='throughput-{}'.format(trace), output=output,
+      keep_tunes=keep_tunes, background=args.background, per_thread=args.per_thread)
+
+  @recorder.method.params(when=When.AROUND, sample=args.sample)
+  def work(n, payload):
+    return n
+
+  def calls(numbers):
+    for n in numbers:
+      work(n, payload=['x' * 32, n, n / 3.0])
+
+  @recorder.begin
+  @recorder.end
+  def run():
+    if trace:
+      tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0] if trace else 0
+    threads = [
+        threading.Thread(target=calls, args=(range(k, args.calls, args.threads),))
+        for k in range(args.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+    elapsed = time.perf_counter() - start
+    allocated = tracemalloc.get_traced_memory()[0] - baseline if trace else 0
+    if trace:
+      tracemalloc.stop()
+    return elapsed, allocated
+
+  elapsed, allocated = run()
+  recorder.recording_medium.close()
+  return elapsed, allocated, os.path.getsize(output)
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--calls', type=int, default=100000)
+  parser.add_argument('--format', choices=RecordingMedium.formats(), default='json')
+  parser.add_argument('--background', action='store_true')
+  parser.add_argument('--sample', type=float, default=None)
+  parser.add_argument('--threads', type=int, default=1)
+  parser.add_argument('--per-thread', action='store_true')
+  args = parser.parse_args()
+
+  tunes = 2 * args.calls
+
+  elapsed, _, size = record(args, keep_tunes=False, trace=False)
+  _, allocated, _ = record(args, keep_tunes=True, trace=True)
+
+  print("format [{}] background [{}] sample [{}] threads [{}] per-thread [{}] tunes [{}]".format(
+      args.format, args.background, args.sample, args.threads, args.per_thread, tunes))
+  print("  {:>12.0f}  tunes per second".format(tunes / elapsed))
+  print("  {:>12.1f}  bytes of output per tune".format(size / tunes))
+  print("  {:>12.1f}  bytes of memory per tune".format(allocated / tunes))
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,61 @@
+#!venv/bin/python
+
+'''Illustrates recording values that JSON cannot record by itself.
+'''
+
+import dataclasses
+import datetime
+import enum
+import os
+import sys
+from rekorder import Recorder, When, What
+
+recorder = Recorder.get_recorder(
+    name=os.path.basename(__file__).replace('.py', ''),
+    output=os.path.basename(__file__).replace('.py', '.json'))
+
+
+class Color(enum.Enum):
+  RED = 1
+  GREEN = 2
+
+
+@dataclasses.dataclass
+class Point:
+  x: int
+  y: str
+
+
+class Celsius:
+  def __init__(self, degrees):
+    self.degrees = degrees
+
+
+# Values of types that rekorder does not know are recorded as str() unless
+# they have a serializer.
+@recorder.serializer(Celsius)
+def celsius(value):
+  return {'celsius': value.degrees}
+
+
+@recorder.begin
+@recorder.end
+def main():
+  paint(Color.RED, Point(1, 'a'), {3, 1}, data=b'xx')
+  when(datetime.date(2020, 2, 29), Celsius(21.5))
+
+
+@recorder.method.params
+@recorder.method.rval
+def paint(color, point, ids, data=None):
+  return {'color': color, 'ids': frozenset(ids), 'data': bytearray(data)}
+
+
+@recorder.method.params
+@recorder.method.rval
+def when(date, temperature):
+  return date + datetime.timedelta(days=1), temperature
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,43 @@
+#!venv/bin/python
+
+'''Illustrates recording to the compact binary format.
+
+  The format is chosen by the output's extension (`.rkdr`) or by
+  `format='binary'`. `rekorder describe` & `rekorder playback` detect it.
+'''
+
+import os
+import sys
+from rekorder import Recorder, When, What
+
+recorder = Recorder.get_recorder(
+    name=os.path.basename(__file__).replace('.py', ''),
+    output=os.path.basename(__file__).replace('.py', '.rkdr'))
+
+
+@recorder.begin
+@recorder.end
+def main():
+  inventory = {}
+  for n in range(100):
+    add(inventory, 'item-{}'.format(n % 10), quantity=n, tags=['new', 'sale'][n % 2:])
+  return checksum(b'\x00\x01binary\xff')
+
+
+# Repeated names & keys are written once to the cassette's string table.
+@recorder.method.params(when=When.AROUND)
+@recorder.method.rval
+def add(inventory, name, quantity=1, tags=()):
+  inventory[name] = {'quantity': inventory.get(name, {}).get('quantity', 0) + quantity, 'tags': tags}
+  return inventory[name]
+
+
+# bytes are recorded as bytes.
+@recorder.method.params
+@recorder.method.rval
+def checksum(data):
+  return sum(data) % 256
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,37 @@
+#!venv/bin/python
+
+'''Illustrates compressing a cassette while it is recorded.
+
+  The compression is chosen by the output's extension (`.gz`, `.bz2`, `.xz`).
+  `rekorder describe` & `rekorder playback` decompress it as it is read.
+'''
+
+import os
+import sys
+from rekorder import Recorder, When, What
+
+recorder = Recorder.get_recorder(
+    name=os.path.basename(__file__).replace('.py', ''),
+    output=os.path.basename(__file__).replace('.py', '.json.gz'),
+    compression_level=1)
+
+
+@recorder.begin
+@recorder.end
+def main():
+  words = 'the quick brown fox jumps over the lazy dog'.split()
+  counts = {}
+  for n in range(1000):
+    count(counts, words[n % len(words)])
+  return counts
+
+
+@recorder.method.params
+@recorder.method.rval
+def count(counts, word):
+  counts[word] = counts.get(word, 0) + 1
+  return counts[word]
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,40 @@
+#!venv/bin/python
+
+'''Illustrates counting calls instead of recording them.
+
+  A counting Recorder (`counting=True` or REKORDER_MODE=count) records the
+  header, entry & exit and, when the Cassette is closed, the statistics of
+  every decorated function on the 'statistics' track.
+  `rekorder describe` shows them.
+'''
+
+import os
+import sys
+from rekorder import Recorder, When, What
+
+recorder = Recorder.get_recorder(
+    name=os.path.basename(__file__).replace('.py', ''),
+    output=os.path.basename(__file__).replace('.py', '.json'),
+    counting=True)
+
+
+@recorder.begin
+@recorder.end
+def main():
+  total = 0
+  for n in range(1000):
+    try:
+      total += divide(100, n % 7)
+    except ZeroDivisionError:
+      pass
+  return total
+
+
+@recorder.method.params
+@recorder.method.rval
+def divide(a, b):
+  return a // b
+
+
+if __name__ == "__main__":
+  main()
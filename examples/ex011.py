@@ -0,0 +1,44 @@
+#!venv/bin/python
+
+'''Illustrates recording from several threads.
+
+  With `per_thread=True` each thread buffers its own tunes. On playback each
+  thread validates the tunes recorded by the thread of the same name so the
+  threads are given names.
+'''
+
+import os
+import sys
+import threading
+from rekorder import Recorder, When, What
+
+recorder = Recorder.get_recorder(
+    name=os.path.basename(__file__).replace('.py', ''),
+    output=os.path.basename(__file__).replace('.py', '.json'),
+    per_thread=True)
+
+
+@recorder.begin
+@recorder.end
+def main():
+  results = {}
+  threads = [threading.Thread(target=work, name='worker-{}'.format(n), args=(n, results)) for n in range(4)]
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+  return sorted(results.items())
+
+
+def work(n, results):
+  results[n] = sum(square(n * 100 + i) for i in range(100))
+
+
+@recorder.method.params
+@recorder.method.rval
+def square(x):
+  return x * x
+
+
+if __name__ == "__main__":
+  main()
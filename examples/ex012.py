@@ -0,0 +1,52 @@
+#!venv/bin/python
+
+'''Illustrates recording coroutines & async generators.
+
+  Each Task validates the tunes that it recorded on playback so the Tasks
+  are given names. A recording that begins with a coroutine is played back
+  with asyncio.run().
+'''
+
+import asyncio
+import os
+import random
+import sys
+from rekorder import Recorder, When, What
+
+recorder = Recorder.get_recorder(
+    name=os.path.basename(__file__).replace('.py', ''),
+    output=os.path.basename(__file__).replace('.py', '.json'))
+
+
+@recorder.begin
+@recorder.end
+async def main():
+  tasks = [asyncio.create_task(fetch(n), name='fetch-{}'.format(n)) for n in range(3)]
+  pages = await asyncio.gather(*tasks)
+  words = [word async for word in split(' '.join(pages))]
+  return len(words)
+
+
+@recorder.method.params
+@recorder.method.rval
+async def fetch(n):
+  latency = await network(n)
+  await asyncio.sleep(latency)
+  return 'page {} took {}'.format(n, latency)
+
+
+# The latency is different every time. It is mocked on playback.
+@recorder.method.mock
+async def network(n):
+  return round(random.random() / 100, 4)
+
+
+@recorder.method.params
+@recorder.method.rval
+async def split(text):
+  for word in text.split():
+    yield word
+
+
+if __name__ == "__main__":
+  asyncio.run(main())
@@ -0,0 +1,45 @@
+#!venv/bin/python
+
+'''Illustrates recording from a forked process.
+
+  The child records to a shard of the parent's cassette
+  (`ex013.pid.<pid>.json`). `rekorder merge --input ex013.json --output
+  ex013.merged.json` combines them and the merged cassette is played back
+  as the parent's.
+'''
+
+import os
+import sys
+from rekorder import Recorder, When, What
+
+recorder = Recorder.get_recorder(
+    name=os.path.basename(__file__).replace('.py', ''),
+    output=os.path.basename(__file__).replace('.py', '.json'))
+
+
+@recorder.begin
+@recorder.end
+def main():
+  pid = os.fork()
+  if pid == 0:
+    # The child's tunes are recorded to its shard.
+    total(range(10))
+    sys.exit(0)
+  _, status = os.waitpid(pid, 0)
+  return total(range(5)), os.WEXITSTATUS(status)
+
+
+@recorder.method.params
+@recorder.method.rval
+def total(values):
+  return sum(square(v) for v in values)
+
+
+@recorder.method.params
+@recorder.method.rval
+def square(x):
+  return x * x
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,39 @@
+#!venv/bin/python
+
+'''Illustrates recording through a collector.
+
+  Start the collector first:
+
+    rekorder collect --socket tmp/ex014.sock --directory tmp/ex014
+
+  The cassette is written by the collector (`tmp/ex014/ex014.pid.<pid>.json`).
+  If the collector cannot be reached it is written to `ex014.json` instead.
+'''
+
+import os
+import sys
+from rekorder import Recorder, When, What
+
+recorder = Recorder.get_recorder(
+    name=os.path.basename(__file__).replace('.py', ''),
+    output=os.path.basename(__file__).replace('.py', '.json'),
+    collector='tmp/ex014.sock')
+
+
+@recorder.begin
+@recorder.end
+def main():
+  return [fibonacci(n) for n in range(20)]
+
+
+@recorder.method.params
+@recorder.method.rval
+def fibonacci(n):
+  a, b = 0, 1
+  for _ in range(n):
+    a, b = b, a + b
+  return a
+
+
+if __name__ == "__main__":
+  main()
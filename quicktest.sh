@@ -8,12 +8,42 @@ rm -rf examples/rekorder
 git clone --depth=1 git@github.com:jcejohnson/rekorder.git examples/rekorder
 (cd examples/rekorder ; git fetch --tags)  # ex005 tests against v0.1.0
 
-for i in $(seq 1 6)
-do
+# Execute examples/$1.py then play back the cassette that it recorded ($2).
+example() {
   echo "============================================================"
-  echo "Execute: examples/ex00${i}.py"
-  examples/ex00${i}.py
-  echo "Validate: examples/ex00${i}.py"
-  ./rekorder.sh playback --input ex00${i}.json 2>&1 | tee tmp/ex00${i}.log
+  echo "Execute: examples/${1}.py"
+  examples/${1}.py
+  echo "Validate: examples/${1}.py"
+  ./rekorder.sh playback --input ${2} 2>&1 | tee tmp/${1}.log
   echo
+}
+
+for i in $(seq 1 7)
+do
+  example ex00${i} ex00${i}.json
 done
+
+example ex008 ex008.rkdr
+example ex009 ex009.json.gz
+example ex010 ex010.json
+example ex011 ex011.json
+example ex012 ex012.json
+
+# The child of ex013 records to a shard that is merged with ex013.json.
+rm -f ex013.pid.*.json*
+example ex013 ex013.json
+./rekorder.sh merge --input ex013.json --output ex013.merged.json
+./rekorder.sh playback --input ex013.merged.json 2>&1 | tee tmp/ex013.merged.log
+
+# ex014 records through a collector. It is stopped before its cassette is played back.
+rm -rf tmp/ex014
+venv/bin/rekorder collect --socket tmp/ex014.sock --directory tmp/ex014 &
+collector=$!
+sleep 1
+echo "============================================================"
+echo "Execute: examples/ex014.py"
+examples/ex014.py
+kill ${collector}
+wait ${collector}
+echo "Validate: examples/ex014.py"
+./rekorder.sh playback --input $(ls tmp/ex014/ex014.pid.*.json) 2>&1 | tee tmp/ex014.log
@@ -57,7 +57,13 @@
 '''
 
 
+from .lib.collector import Collector
+from .lib.medium import RecordingMedium
+from .lib.governor import Detail, Governor
 from .lib.player import Player
 from .lib.recorder import Recorder
+from .lib.sampling import Sampling
+from .lib.snapshot import Snapshot
 from .lib.what import What
 from .lib.when import When
+from .lib.writer import Backpressure, FlushPolicy, RotationPolicy, Shards
@@ -1,7 +1,10 @@
 
+import signal
+import sys
+
 import click
 
-from rekorder import Player, What
+from rekorder import Collector, Player, Shards, What
 
 
 @click.group()
@@ -13,17 +16,28 @@ def main(ctx, *args, **kwargs):
 
 @main.command()
 @click.option(u'--input', required=True)
+@click.option(u'--drop-tunes/--keep-tunes', default=False)
+@click.option(u'--summary', is_flag=True, default=False)
+@click.option(u'--thread', u'threads', multiple=True,
+              help=u'Only describe the tunes recorded by this thread. May be repeated.')
 @click.pass_obj
 def describe(obj, *args, **kwargs):
 
   click.echo("Describe [{input}]".format(**kwargs))
 
+  if kwargs.pop('summary'):
+    Player.describe_summary(kwargs['input'])
+    return
+
   player = Player(output='/dev/null', mode=What.DESCRIBE, **kwargs)
   player.describe()
 
 
 @main.command()
 @click.option(u'--input', required=True)
+@click.option(u'--drop-tunes/--keep-tunes', default=False)
+@click.option(u'--thread', u'threads', multiple=True,
+              help=u'Only validate the calls made by this thread. May be repeated.')
 @click.pass_obj
 def playback(obj, *args, **kwargs):
 
@@ -31,3 +45,38 @@ def playback(obj, *args, **kwargs):
 
   player = Player(output='/dev/null', mode=What.PLAYBACK, **kwargs)
   player.playback()
+
+
+@main.command()
+@click.option(u'--input', required=True,
+              help=u'The output of the recording process. Its shards are found next to it.')
+@click.option(u'--output', required=True)
+@click.option(u'--format', default=None,
+              help=u'Format of the merged cassette. Default is selected by its extension.')
+@click.pass_obj
+def merge(obj, *args, **kwargs):
+
+  click.echo("Merge [{input}] -> [{output}]".format(**kwargs))
+
+  merged = Shards.merge(kwargs['input'], kwargs['output'], format=kwargs['format'])
+  click.echo("Merged [{}] cassettes".format(merged))
+
+
+@main.command()
+@click.option(u'--socket', required=True,
+              help=u'Path of the Unix domain socket on which to listen.')
+@click.option(u'--directory', default=u'.',
+              help=u'Where the cassettes of the recording processes are written.')
+@click.pass_obj
+def collect(obj, *args, **kwargs):
+
+  click.echo("Collect [{socket}] -> [{directory}]".format(**kwargs))
+
+  collector = Collector(kwargs['socket'], directory=kwargs['directory'])
+  signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+  try:
+    collector.serve()
+  except KeyboardInterrupt:
+    pass
+  finally:
+    collector.close()
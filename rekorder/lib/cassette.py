@@ -1,45 +1,125 @@
 
-import json
-
+import atexit
+import itertools
+import multiprocessing.util
+import os
+import threading
+import weakref
+
+from . import compression
 from .device import Device
-from .medium import RecordingMedium
+from .medium import CassetteIndex, RecordingMedium
+from .strand import running_loop, strand
 from .track import TrackManager
 from .tune import Tune
 from .what import What
+from .writer import LoopSink, Manifest, Shards, ThreadBuffers, ThreadedWriter, Writer
+
+# Cassettes that are recording or being played back. See Cassette._forked().
+_CASSETTES = weakref.WeakValueDictionary()
+
+# What Cassette._open() is given.
+_OPTIONS = ['format', 'background', 'queue_size', 'batch_size', 'backpressure', 'flush_policy',
+            'compression_level', 'rotation_policy', 'per_thread', 'buffer_size', 'collector']
 
 
-class Cassette(RecordingMedium, Device):
+class Cassette(Device):
   '''A Cassette contains recordings of sipmle CLI apps.
 
       A Cassette is written to by a Recorder in RECORD mode and
       read from by a Recorder in PLAYBACK mode.
 
+      The format of the recording is determined by a RecordingMedium.
+
       FIXME: Cassette should not be a Device.
              Use DeviceProxy like RepositoryManager or
              a CassetteDevice like Recorder/RecordingDevice.
   '''
 
-  # TODO : Consider moving most of the implementation into RecordingMedium
-
   def __init__(self, *args, **kwargs):
     '''Construct the Cassette.
 
       A Cassette contains an internal collection of events.
 
-      In record mode this list will be written to the output on every
-      call to the record() function.
+      Once a tune is recorded from within an asyncio event loop the Writer
+      (unless it is already `background`) is handed to a LoopSink so that
+      recording never does file I/O on the loop's thread. From then on every
+      tune is tagged with the strand (thread & Task) that recorded it, as if
+      `per_thread` was given, so that concurrent Tasks are played back from
+      their own positions. See strand().
+
+      A process forked while we are recording (e.g. - by multiprocessing)
+      records to a shard of our output rather than to the output itself.
+      See Shards & _forked(). A child that ends with os._exit() (rather
+      than by returning from a multiprocessing target or exiting normally)
+      must close() its Cassette first.
+
+      In record mode each tune is appended to the output on every call to
+      the record() function. The output is never rewritten so the cost of
+      recording is linear in the number of tunes.
 
       Args:
         input (str): Path from which recorded data is read for playback
                      or describe.
         output (str): Path at which to record or from which to playback.
+                      Compressed while recording if it ends in .gz, .bz2
+                      or .xz. Compressed inputs are always detected.
         mode (enum): rekorder.What.RECORD or rekorder.What.PLAYBACK
+        format (str): Optional. In record mode, the RecordingMedium to use
+                      (e.g. - 'json' or 'binary'). Default is selected by
+                      the output's extension. On playback the format is
+                      always detected from the input.
+        background (bool): Optional. In record mode, write tunes to the
+                           output from a background thread so that record()
+                           never blocks on disk. Default is False.
+        queue_size (int): Optional. See ThreadedWriter.
+        batch_size (int): Optional. See ThreadedWriter.
+        backpressure (Backpressure): Optional. See ThreadedWriter.
+        flush_policy (FlushPolicy): Optional. When tunes are written to the
+                                    output. Default is after every tune.
+        compression_level (int): Optional. See compression.open_output().
+        rotation_policy (RotationPolicy): Optional. In record mode, write
+                                          the output as a series of
+                                          segments. See RotationPolicy.
+        collector (str): Optional. In record mode, send the tunes to the
+                         Collector listening on this socket rather than
+                         writing them to the output (unless there is no
+                         Collector). See Writer.
+        keep_tunes (bool): Optional. In record mode, keep every tune in
+                           memory after it has been written. Default is
+                           False: memory use does not grow with the number
+                           of tunes recorded.
+        drop_tunes (bool): Optional. On playback, release each tune after
+                           it has been used. See Track. Default is False.
+        per_thread (bool): Optional. In record mode, each thread buffers its
+                           tunes and the buffers are merged in the order the
+                           tunes were recorded. Tunes are tagged with their
+                           thread & sequence number. See ThreadBuffers.
+                           Default is False: tunes are written one at a
+                           time under a lock.
+        buffer_size (int): Optional. See ThreadBuffers.
+        threads (list): Optional. On playback & describe, the names of the
+                        threads whose tunes are validated / described.
+                        Default is every thread. See Track.
     '''
 
     super().__init__(*args, **kwargs)
 
     self.input = kwargs['input'] if 'input' in kwargs else None
     self.output = kwargs['output'] if 'output' in kwargs else None
+    # The id of the recording process and, for a shard, the pid & output of
+    # the process from which it was forked.
+    self.pid = kwargs.get('pid', None)
+    self.parent = kwargs.get('parent', None)
+    self._writer = None
+    self._buffers = None
+    # Serializes record() unless each thread has its own buffer.
+    self._lock = threading.Lock()
+    # last_tune of each thread on playback.
+    self._local = threading.local()
+    # Has a tune been recorded from within an event loop?
+    self._looped = False
+    self._sequence = itertools.count()
 
     if self.mode == What.RECORD:
       self._init_for_record(*args, **kwargs)
@@ -55,18 +135,91 @@ class Cassette(RecordingMedium, Device):
 
   def _init_for_record(self, *args, **kwargs):
 
-    self._json_kwargs = {'sort_keys': True, 'indent': 2}
-    self.track_manager = TrackManager(mode=self.mode)
+    self.pid = os.getpid()
+    self.track_manager = TrackManager(mode=self.mode, keep=kwargs.get('keep_tunes', False))
+
+    self._options = {k: kwargs[k] for k in _OPTIONS if k in kwargs}
+    self._open()
+    _CASSETTES[id(self)] = self
+    multiprocessing.util.register_after_fork(self, Cassette._in_process)
 
     # Device
 
     tune = Tune(
         device=self,
-        notes={'input': self.input, 'output': self.output}
+        notes={'input': self.input, 'output': self.output, 'pid': self.pid}
     )
 
     self.record(tune)
 
+  def _open(self):
+    '''Open self.output for recording.
+    '''
+    options = self._options
+    self.medium = RecordingMedium.for_output(
+        self.output, format=options.get('format', None),
+        serializers=getattr(self.recorder, 'serializers', None))
+
+    # Any previous recording at self.output is discarded by the writer.
+    # From now on we only ever append to it.
+    writer = ThreadedWriter if options.get('background', False) else Writer
+    self._writer = writer(self.output, self.medium, name=getattr(self.recorder, 'name', None),
+                          **{k: options[k] for k in [
+                              'queue_size', 'batch_size', 'backpressure', 'flush_policy',
+                              'compression_level', 'rotation_policy', 'collector'] if k in options})
+
+    if options.get('per_thread', False):
+      size = {'size': options['buffer_size']} if 'buffer_size' in options else {}
+      self._buffers = ThreadBuffers(self._writer, **size)
+      # Before the Writer closes at exit.
+      atexit.register(self.close)
+
+  def _forked(self):
+    '''We are in a child that was just forked from the recording process.
+
+      Whatever the parent has not written yet is the parent's to write so
+      the inherited Writer is abandoned. The child records the rest of its
+      calls to a shard of the parent's output (see Shards) which begins
+      with our tune, linked to the parent.
+
+      On playback the child stops validating. See TrackManager.validating().
+    '''
+    if self.mode != What.RECORD:
+      self.track_manager.forked = True
+      return
+    if self._writer.closed:
+      return
+
+    parent = {'pid': self.pid, 'output': self.output}
+    self._writer.abandon()
+    # Other threads did not survive the fork. Neither did their locks.
+    self._lock = threading.Lock()
+    self._buffers = None
+    self._looped = False
+    self._sequence = itertools.count()
+
+    self.pid = os.getpid()
+    self.parent = parent
+    self.output = Shards.path(parent['output'], self.pid)
+    self._open()
+
+    tune = Tune(
+        device=self,
+        notes={'input': self.input, 'output': self.output, 'pid': self.pid, 'parent': parent}
+    )
+    # The shard's header. We are on whichever track the parent was.
+    self._writer.write({'index': 0, 'title': 'header', 'tune': tune})
+
+    atexit.unregister(self.close)
+    atexit.register(self.close)
+
+  @staticmethod
+  def _in_process(cassette):
+    '''We are in a child started by multiprocessing (after _forked()).
+        It exits without running atexit.
+    '''
+    multiprocessing.util.Finalize(cassette, cassette.close, exitpriority=0)
+
   def _init_for_describe(self, *args, **kwargs):
     self._init_for_playback(*args, **kwargs)
 
@@ -88,11 +241,48 @@ class Cassette(RecordingMedium, Device):
     # Disable the record() method.
     # We cannot record and playback at the same time!
     self.record = self._record_in_playback_mode
-    self._write = None
-
-    with open(self.input, 'r') as f:
-      tracks = json.load(f)
-      self.track_manager = TrackManager.playback_instance(tracks, mode=self.mode)
+    self._writer = None
+    # See played().
+    self._played_by = None
+    # See failed().
+    self.failures = []
+
+    # A recording made with a RotationPolicy is played back as if its
+    # segments were one cassette.
+    manifest = Manifest.find(self.input)
+    paths = manifest.paths() if manifest else [self.input]
+
+    self.indexes = []
+    segments = [self._load_segment(path) for path in paths]
+    self.track_manager = TrackManager.playback_segments(
+        segments, mode=self.mode, drop=kwargs.get('drop_tunes', False),
+        threads=kwargs.get('threads', None))
+    _CASSETTES[id(self)] = self
+
+  def _load_segment(self, path):
+    '''The tracks (see TrackManager.playback_segments()) of the cassette
+        (or segment) at `path`.
+    '''
+    with compression.open_input(path) as f:
+      self.medium = RecordingMedium.for_input(f)
+      if compression.is_compressed(f) or not self.medium.indexable(f):
+        return TrackManager.stream_tracks(self.medium.decode(f))
+
+    # Random access. Tunes are only decoded when they are needed.
+    index = CassetteIndex(path, self.medium)
+    self.indexes.append(index)
+    return TrackManager.index_tracks(index)
+
+  @property
+  def tracks(self):
+    '''Our TrackManager.
+
+      Usage:
+        for track in cassette.tracks:
+          ...
+        cassette.tracks['recording'][10:20]
+    '''
+    return self.track_manager.tracks
 
   def playback(self, *args, rval, **kwargs):
     return rval
@@ -100,11 +290,21 @@ class Cassette(RecordingMedium, Device):
   def _record_in_playback_mode(self, tune):
     self.last_tune = tune
 
+  @property
+  def last_tune(self):
+    '''The tune most recently recorded by the calling thread on playback.
+    '''
+    return getattr(self._local, 'last_tune', None)
+
+  @last_tune.setter
+  def last_tune(self, tune):
+    self._local.last_tune = tune
+
   def record(self, tune):
     '''
       Verify that the tune's device can record in our current state.
       Append the tune to the list current track.
-      Write everything to the output file.
+      Append the tune to the output file.
     '''
 
     current_track = self.track_manager.current_track
@@ -123,13 +323,101 @@ class Cassette(RecordingMedium, Device):
           raise Exception("[{}] is not recordable on track [{}]".format(
               repr(tune.device), current_track.title))
 
-    current_track.add(tune)
+    if current_track.parent is not None:
+      # Sub-tracks (e.g. - 'mock') are bookkeeping for the Devices that use
+      # them and are not part of the recording.
+      current_track.add(tune)
+      return
+
+    record = {'index': current_track.index, 'title': current_track.title, 'tune': tune}
+
+    if not self._looped and running_loop() is not None:
+      self._loop_found()
+
+    if self._buffers:
+      current_track.add(tune)
+      self._buffers.write(record)
+      return
+
+    with self._lock:
+      if self._looped:
+        tune.thread = strand()
+        tune.sequence = next(self._sequence)
+      current_track.add(tune)
+      self._writer.write(record)
 
-    self._write()
+  def _loop_found(self):
+    '''The first tune recorded from within an event loop.
+    '''
+    with self._lock:
+      if self._looped:
+        return
+      if not isinstance(self._writer, ThreadedWriter):
+        self._writer = LoopSink(self._writer)
+        if self._buffers:
+          self._buffers.writer = self._writer
+      # Before the Writer closes at exit.
+      atexit.unregister(self.close)
+      atexit.register(self.close)
+      self._looped = True
+
+  def played(self, value):
+    '''`value` as it would be played back had it been recorded (e.g. - an
+        Enum becomes a str & a tuple becomes a list). On playback, live
+        values are compared with the recorded ones in this form.
+    '''
+    # Our Recorder (and its serializers) is only known once playback has
+    # begun. See Player.
+    medium = self._played_by
+    if medium is None:
+      medium = self._played_by = self.medium.__class__(
+          serializers=getattr(self.recorder, 'serializers', None))
+    return medium.decode_value(medium.encode_value(value))
+
+  def failed(self, exception):
+    '''Remember that playback failed with `exception`. A failure in a thread
+        other than the one that began the recording does not reach the
+        Player. See validated().
+    '''
+    if not any(failure is exception for failure in self.failures):
+      self.failures.append(exception)
+
+  def validated(self):
+    '''Raise the first failure of every thread validated on playback (see
+        failed()), if any.
+    '''
+    if self.failures:
+      raise Exception("Playback failed [{}] time(s). The first failure was [{}].".format(
+          len(self.failures), self.failures[0])) from self.failures[0]
+
+  def flush(self):
+    '''Write any pending tunes to the output regardless of our FlushPolicy.
+        RecordingEnd does this at the end of every recording.
+    '''
+    if self._buffers:
+      self._buffers.merge()
+    if self._writer:
+      self._writer.flush()
+
+  def close(self):
+    '''Write any pending tunes and close the output.
+        Called automatically at interpreter exit.
+    '''
+    # They follow everything else. See Recorder.record_statistics().
+    if self.recorder:
+      self.recorder.record_statistics()
+    if self._buffers:
+      self._buffers.merge()
+    atexit.unregister(self.close)
+    if self._writer:
+      self._writer.close()
 
   # Device
 
   def describe_device(self):
+    if self.parent:
+      return "{} output=[{}] pid [{}] forked from [{}] [{}]".format(
+          self.__class__.__name__, self.output, self.pid, self.parent['pid'], self.parent['output'])
     return "{} output=[{}]".format(self.__class__.__name__, self.output)
 
   def recordable(self, track_title):
@@ -137,25 +425,10 @@ class Cassette(RecordingMedium, Device):
     '''
     return track_title == 'header'
 
-  # Internals
-
-  def _write(self):
-    '''Write (save) the current event stream to the file.
-    '''
-
-    class RecordingEncoder(json.JSONEncoder):
-      '''JSONEncoder implementation that is aware of rekorder objects.
-      '''
 
-      def default(self, obj):
-        '''json.JSONEncoder default encoding method.
-        '''
+def _forked():
+  for cassette in list(_CASSETTES.values()):
+    cassette._forked()
 
-        f = getattr(obj, 'recordable_data', None)
-        return f(obj) if f else json.JSONEncoder.default(self, obj)
 
-    with open(self.output, 'w') as f:
-      try:
-        json.dump(self.track_manager, f, cls=RecordingEncoder, **self._json_kwargs)
-      except TypeError as e:
-        raise Exception(self.track_manager) from e
+os.register_at_fork(after_in_child=_forked)
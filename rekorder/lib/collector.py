@@ -0,0 +1,110 @@
+import json
+import logging
+import os
+import socketserver
+import stat
+import threading
+
+from .medium import RecordingMedium
+
+logger = logging.getLogger(__name__)
+
+
+class Collector:
+  '''Collect the cassettes of many recording processes on one host.
+
+    The Collector listens on a Unix domain socket. A Recorder given
+    `collector=` (see Writer) connects to it, says who it is (the
+    Recorder's name, its pid & format) and sends its encoded records a
+    batch at a time. The Collector appends what each process sends to a
+    cassette of its own in `directory`:
+
+      greatest-hits.pid.4242.json
+
+    so the recording processes do not write (or fsync) any files. A process
+    that finds no Collector records to its own output instead.
+
+    Usage:
+
+      collector = Collector('/tmp/rekorder.sock', directory='recordings')
+      collector.serve()  # Until close() is called from another thread.
+
+    Or:
+
+      rekorder collect --socket /tmp/rekorder.sock --directory recordings
+  '''
+
+  # Bytes read from a connection at once.
+  CHUNK = 1 << 16
+
+  def __init__(self, socket, directory='.'):
+    '''Construct the Collector and begin listening.
+
+      Args:
+        socket (str): Path of the socket. A stale socket is replaced.
+        directory (str): Where the cassettes are written.
+    '''
+    super().__init__()
+
+    self.socket = socket
+    self.directory = directory
+
+    os.makedirs(directory, exist_ok=True)
+    if os.path.exists(socket) and stat.S_ISSOCK(os.stat(socket).st_mode):
+      os.unlink(socket)
+
+    self._lock = threading.Lock()
+    self._server = socketserver.ThreadingUnixStreamServer(socket, _Connection)
+    self._server.daemon_threads = True
+    self._server.collector = self
+
+  def serve(self):
+    '''Receive cassettes until close() is called.
+    '''
+    self._server.serve_forever()
+
+  def close(self):
+    '''Stop listening. Cassettes still being received are not waited for.
+    '''
+    self._server.shutdown()
+    self._server.server_close()
+    if os.path.exists(self.socket):
+      os.unlink(self.socket)
+
+  def path(self, hello):
+    '''The cassette to which the process that said `hello` is written.
+        A process id that is seen again (i.e. - it was reused) gets a new
+        cassette.
+    '''
+    name = str(hello.get('name', None) or 'rekorder').replace(os.sep, '_')
+    extension = RecordingMedium.for_output(None, format=hello['format']).extensions[0]
+    root = os.path.join(self.directory, '{}.pid.{}'.format(name, hello['pid']))
+    path, n = root + extension, 1
+    while os.path.exists(path):
+      n += 1
+      path = '{}.{}{}'.format(root, n, extension)
+    return path
+
+  # Internals
+
+  def _receive(self, rfile):
+    '''Write a connection's cassette.
+    '''
+    hello = json.loads(rfile.readline())
+    with self._lock:
+      path = self.path(hello)
+      f = open(path, 'wb', buffering=0)
+    logger.info("Receiving [{}] from [{}].".format(path, hello['pid']))
+    with f:
+      while True:
+        data = rfile.read1(Collector.CHUNK)
+        if not data:
+          break
+        f.write(data)
+    logger.info("Received [{}].".format(path))
+
+
+class _Connection(socketserver.StreamRequestHandler):
+
+  def handle(self):
+    self.server.collector._receive(self.rfile)
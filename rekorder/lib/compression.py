@@ -0,0 +1,199 @@
+
+import bz2
+import gzip
+import logging
+import lzma
+import os
+
+logger = logging.getLogger(__name__)
+
+# TruncatedStream.read() decompresses no more than this at a time.
+PIECE_SIZE = 1 << 13
+
+# Compressed file extension -> (module, magic number, name of the level kwarg)
+COMPRESSORS = {
+    '.gz': (gzip, b'\x1f\x8b', 'compresslevel'),
+    '.bz2': (bz2, b'BZh', 'compresslevel'),
+    '.xz': (lzma, b'\xfd7zXZ\x00', 'preset'),
+}
+
+# Compressors that cannot flush part way through a stream. See StreamedOutput.
+STREAMED = {
+    '.bz2': bz2.BZ2Compressor,
+    '.xz': lzma.LZMACompressor,
+}
+
+
+def strip(path):
+  '''Remove the compression extension (if any) from `path`.
+      'session.json.gz' -> 'session.json'
+  '''
+  root, extension = os.path.splitext(path)
+  return root if extension in COMPRESSORS else path
+
+
+def open_output(path, level=None):
+  '''Open `path` for writing binary data.
+
+    Data written to a path ending in .gz, .bz2 or .xz is compressed as it is
+    written. flush() makes everything written so far readable: .gz flushes
+    its compressor and .bz2 & .xz end one compressed stream and begin the
+    next (see StreamedOutput).
+
+    Args:
+      path (str): Path of the output.
+      level (int): Optional. Compression level (1-9, lzma preset 0-9).
+                   Lower is faster, higher is smaller.
+  '''
+  extension = os.path.splitext(path)[1]
+  if extension not in COMPRESSORS:
+    # Unbuffered so that each write is exactly one write to the output.
+    return open(path, 'wb', buffering=0)
+
+  module, magic, level_kwarg = COMPRESSORS[extension]
+  kwargs = {level_kwarg: level} if level is not None else {}
+  if extension in STREAMED:
+    return StreamedOutput(path, STREAMED[extension], **kwargs)
+  return module.open(path, 'wb', **kwargs)
+
+
+def streamed(path):
+  '''Does flush() end a compressed stream of an output at `path`? Each
+      stream costs its compressor's header & trailer and starts compressing
+      from nothing so they should not be flushed after every tune.
+  '''
+  return os.path.splitext(path)[1] in STREAMED
+
+
+def open_input(path):
+  '''Open `path` for reading binary data.
+
+    The compression (if any) is detected from the content of `path` rather
+    than its name. Compressed data is decompressed as it is read.
+  '''
+  f = open(path, 'rb')
+  head = f.read(8)
+  f.seek(0)
+
+  for module, magic, level_kwarg in COMPRESSORS.values():
+    if head.startswith(magic):
+      return TruncatedStream(module.open(f, 'rb'), name=path)
+
+  return f
+
+
+def is_compressed(f):
+  '''Was `f` opened by open_input() on a compressed file?
+  '''
+  return isinstance(f, TruncatedStream)
+
+
+class StreamedOutput:
+  '''Compress with bz2 or lzma as a series of concatenated streams.
+
+    Neither compressor can make what it has compressed so far readable
+    without ending its stream so flush() ends the current stream and the
+    next write() begins a new one. The readers of both formats read
+    concatenated streams as one. Whatever was written before the last
+    flush() can be read even if the process dies before close().
+  '''
+
+  def __init__(self, path, compressor, **kwargs):
+    # Unbuffered so that each compressed piece is written when we have it.
+    self.raw = open(path, 'wb', buffering=0)
+    self.name = path
+    self._compressor_class = compressor
+    self._kwargs = kwargs
+    # None between streams.
+    self._compressor = None
+
+  @property
+  def closed(self):
+    return self.raw.closed
+
+  def fileno(self):
+    return self.raw.fileno()
+
+  def write(self, data):
+    if self._compressor is None:
+      self._compressor = self._compressor_class(**self._kwargs)
+    self._write(self._compressor.compress(data))
+    return len(data)
+
+  def flush(self):
+    '''End the current stream (if any).
+    '''
+    if self._compressor is None:
+      return
+    compressor, self._compressor = self._compressor, None
+    self._write(compressor.flush())
+
+  def close(self):
+    if self.raw.closed:
+      return
+    try:
+      self.flush()
+    finally:
+      self.raw.close()
+
+  def _write(self, data):
+    view = memoryview(data)
+    while view:
+      view = view[self.raw.write(view):]
+
+
+class TruncatedStream:
+  '''Wrap a decompressing stream so that a compressed file that was cut off
+      (e.g. - the recording process was killed) reads as if it ended at the
+      last byte that could be decompressed.
+  '''
+
+  def __init__(self, stream, name):
+    self.stream = stream
+    self.name = name
+    self.truncated = False
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *args):
+    self.close()
+
+  def __iter__(self):
+    while True:
+      line = self.readline()
+      if not line:
+        return
+      yield line
+
+  def read(self, size=-1):
+    # Read in small pieces so that, if the stream is truncated, only the
+    # last piece is lost rather than everything asked for.
+    pieces = []
+    while size != 0:
+      piece = self._guard(self.stream.read, PIECE_SIZE if size < 0 else min(size, PIECE_SIZE))
+      if not piece:
+        break
+      pieces.append(piece)
+      size = size - len(piece) if size > 0 else size
+    return b''.join(pieces)
+
+  def readline(self, size=-1):
+    return self._guard(self.stream.readline, size)
+
+  def seek(self, offset, whence=os.SEEK_SET):
+    self.truncated = False
+    return self.stream.seek(offset, whence)
+
+  def close(self):
+    self.stream.close()
+
+  def _guard(self, f, size):
+    if self.truncated:
+      return b''
+    try:
+      return f(size)
+    except EOFError:
+      logger.warning("[{}] is truncated. Ignoring the rest of it.".format(self.name))
+      self.truncated = True
+      return b''
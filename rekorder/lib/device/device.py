@@ -134,8 +134,12 @@ class Device:
       self.validation_failure(actual, expectation)
 
   def validation_failure(self, actual, expectation):
-    raise Exception("Device expectation failed: expectation [{}] actual [{}]".format(
+    failure = Exception("Device expectation failed: expectation [{}] actual [{}]".format(
         expectation.device, actual.device))
+    # Whichever thread we are in, and whatever it does with the failure,
+    # playback fails. See Cassette.validated().
+    self.recorder.recording_medium.failed(failure)
+    raise failure
 
   def recordable(self, track_title):
     '''Is this device recordable for the named track?
@@ -148,6 +152,9 @@ class Device:
     '''Replaces record() in VALIDATE mode.
         Delegates to the original record() method then to validate().
         The idea is to transparently invoke validate() after record().
+        Nothing is validated for threads that are not being validated
+        (see Track.validates()).
     '''
     self.__record__(*args, notes=notes, when=when, **kwargs)
-    self.validate(*args, notes=notes, when=when, **kwargs)
+    if self.recorder.recording_medium.track_manager.validating():
+      self.validate(*args, notes=notes, when=when, **kwargs)
@@ -0,0 +1,80 @@
+
+import itertools
+import sys
+
+
+class FunctionDescriptor:
+  '''The name, qualname & module of a recorded function, computed once when
+      the function is decorated.
+
+    Every descriptor has a small integer id. Tunes refer to their function
+    by id ({'function': {'id': 3, 'args': [...], ...}}) and the cassette
+    carries a table of the descriptors it refers to:
+
+      {"functions": [{"id": 3, "module": "app", "name": "foo", "qualname": "foo"}]}
+
+    The table record for a descriptor precedes the first tune (of each
+    segment) that refers to it. On playback the RecordingMedium replaces
+    the id with the descriptor's name, qualname & module again. See
+    RecordingMedium.function_record() & RecordingMedium.resolve().
+
+    Usage:
+
+      descriptor = FunctionDescriptor.of(some_func)
+  '''
+
+  __slots__ = ('id', 'name', 'qualname', 'module', 'key')
+
+  __ids = itertools.count(1)
+
+  @staticmethod
+  def of(function):
+    '''The descriptor of `function`. Computed the first time it is asked for.
+    '''
+    descriptor = getattr(function, '_rekorder_descriptor', None)
+    if descriptor is None:
+      descriptor = FunctionDescriptor(function)
+      try:
+        function._rekorder_descriptor = descriptor
+      except AttributeError:
+        pass
+    return descriptor
+
+  @staticmethod
+  def module_of(function):
+    '''The module that owns `function`.
+        For __main__ it is derived from the script's path.
+    '''
+    if function.__module__ == '__main__':
+      return sys.modules[function.__module__].__file__.replace('/', '.').replace('.py', '')
+    return function.__module__
+
+  @staticmethod
+  def recordable_data(obj):
+    # Tunes refer to the descriptor by id. See entry for the table.
+    return obj.id
+
+  def __init__(self, function):
+    self.id = next(FunctionDescriptor.__ids)
+    self.name = function.__name__
+    self.qualname = function.__qualname__
+    self.module = FunctionDescriptor.module_of(function)
+    # module.qualname. See Tune.function.
+    self.key = '{}.{}'.format(self.module, self.qualname)
+
+  def __repr__(self):
+    return "FunctionDescriptor({} {})".format(self.id, self.key)
+
+  # Descriptors are immutable and shared by every tune of their function.
+
+  def __copy__(self):
+    return self
+
+  def __deepcopy__(self, memo):
+    return self
+
+  @property
+  def entry(self):
+    '''Our entry in the cassette's function table.
+    '''
+    return {'id': self.id, 'name': self.name, 'qualname': self.qualname, 'module': self.module}
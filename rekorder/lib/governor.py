@@ -0,0 +1,214 @@
+
+import time
+
+from enum import Enum
+
+from .what import What
+
+
+class Detail(Enum):
+  '''How much a Governor lets the decorators of a function record.
+
+    FULL   : Every call (subject to the decorators' own Sampling).
+    SAMPLE : 1 in Governor.every calls.
+    COUNT  : None. The calls are counted (see Statistics).
+  '''
+  FULL = 501
+  SAMPLE = 502
+  COUNT = 503
+
+
+# Detail of the next step down / up.
+_LOWER = {Detail.FULL: Detail.SAMPLE, Detail.SAMPLE: Detail.COUNT}
+_HIGHER = {Detail.COUNT: Detail.SAMPLE, Detail.SAMPLE: Detail.FULL}
+
+
+class Governor:
+  '''Keep the time spent recording under a fraction of wall time.
+
+    The Governor measures the time that the decorators of each function
+    spend recording its calls (the before & after steps and the recording
+    of their tunes). About every `window` seconds it compares the total
+    with the wall time that has passed:
+
+      - Over `budget`: the function that cost the most steps down one
+        Detail (FULL -> SAMPLE -> COUNT).
+      - Under half of `budget`: the function that stepped down most
+        recently steps back up one Detail.
+
+    Every step is recorded as a GovernorStep tune on the 'recording' track
+    so that the calls that were sampled or only counted can be told apart
+    from those that were recorded in full. On playback the steps are
+    replayed as they are reached so that the same calls are validated.
+
+    Only stacked decorators (see Stack) are governed. A Governor cannot be
+    given to a Recorder that records `per_thread`.
+
+    Args:
+      budget (float): Fraction of wall time that recording may cost.
+                      Default is 0.05 (5%).
+      window (float): Seconds between adjustments. Default is 1.
+      sample (float): Fraction of calls recorded at Detail.SAMPLE.
+                      Default is 0.01. See Sampling.
+
+    Usage:
+
+      recorder = Recorder.get_recorder(..., governor=Governor(budget=0.02))
+  '''
+
+  # Calls between looks at the clock.
+  CHECK_EVERY = 64
+
+  @staticmethod
+  def playback_instance(data, *args, **kwargs):
+    return Governor(**data)
+
+  @staticmethod
+  def recordable_data(obj):
+    return {'budget': obj.budget, 'window': obj.window, 'sample': obj.sample}
+
+  def __init__(self, budget=0.05, window=1.0, sample=0.01):
+    super().__init__()
+
+    if not 0 < budget < 1:
+      raise Exception("Governor budget must be > 0 and < 1. Got [{}].".format(budget))
+    if window <= 0:
+      raise Exception("Governor window must be > 0. Got [{}].".format(window))
+    if not 0 < sample <= 1:
+      raise Exception("Governor sample must be > 0 and <= 1. Got [{}].".format(sample))
+
+    self.budget = budget
+    self.window = window
+    self.sample = sample
+    # Record every n'th call at Detail.SAMPLE.
+    self.every = max(1, round(1 / sample))
+
+    # Set by the Recorder that we govern.
+    self.recorder = None
+
+    # FunctionDescriptor.key -> Governed
+    self._governed = {}
+    # Details replayed for functions that have not been decorated yet.
+    self._details = {}
+    # Functions that stepped down, most recent last.
+    self._lowered = []
+    # Every governed call.
+    self._calls = 0
+    self._next_check = Governor.CHECK_EVERY
+    self._start = time.perf_counter_ns()
+
+  def __repr__(self):
+    return "Governor(budget={}, window={}, sample={})".format(self.budget, self.window, self.sample)
+
+  def governed(self, descriptor):
+    '''The Governed state of the function described by `descriptor`.
+    '''
+    governed = self._governed.get(descriptor.key, None)
+    if governed is None:
+      governed = self._governed[descriptor.key] = Governed(
+          self, descriptor, self._details.get(descriptor.key, Detail.FULL))
+    return governed
+
+  @property
+  def validating(self):
+    return self.recorder.mode == What.VALIDATE
+
+  # Record
+
+  def check(self):
+    '''Called every CHECK_EVERY calls. Adjust once `window` has passed.
+    '''
+    self._next_check = self._calls + Governor.CHECK_EVERY
+    now = time.perf_counter_ns()
+    elapsed = now - self._start
+    if elapsed < self.window * 1e9:
+      return
+
+    # Steps are recorded between the tunes of the 'recording' track.
+    if self.recorder.recording_medium.track_manager.current_track.title != 'recording':
+      return
+
+    spent = sum(governed.spent for governed in self._governed.values())
+    overhead = spent / elapsed
+
+    if overhead > self.budget:
+      candidates = [
+          governed for governed in self._governed.values()
+          if governed.detail in _LOWER and governed.spent]
+      if candidates:
+        governed = max(candidates, key=lambda governed: governed.spent)
+        self._step(governed, _LOWER[governed.detail], overhead)
+        self._lowered.append(governed)
+
+    elif overhead < self.budget / 2 and self._lowered:
+      governed = self._lowered.pop()
+      self._step(governed, _HIGHER[governed.detail], overhead)
+
+    for governed in self._governed.values():
+      governed.spent = 0
+    self._start = time.perf_counter_ns()
+
+  def _step(self, governed, detail, overhead):
+    from .recorder.governor import GovernorStep
+
+    previous, governed.detail = governed.detail, detail
+    GovernorStep(recorder=self.recorder, governed=governed, previous=previous,
+                 overhead=overhead, at=self._calls).record()
+
+  # Playback
+
+  def replay(self):
+    '''Apply the GovernorSteps that are next on the current track and were
+        taken by the current call. A call that was skipped at Detail.SAMPLE
+        recorded nothing so the step may be next well before it was taken.
+    '''
+    from .recorder.governor import GovernorStep
+
+    track = self.recorder.recording_medium.track_manager.current_track
+    tune = track.peek()
+    while tune is not None and isinstance(tune.device, GovernorStep) and \
+        tune.device.at <= self._calls:
+      track.next_tune()
+      key, detail = tune.device.key, tune.device.detail
+      self._details[key] = detail
+      if key in self._governed:
+        self._governed[key].detail = detail
+      tune = track.peek()
+
+
+class Governed:
+  '''A Governor's state for one function.
+  '''
+
+  __slots__ = ('governor', 'descriptor', 'detail', 'calls', 'spent')
+
+  def __init__(self, governor, descriptor, detail):
+    self.governor = governor
+    self.descriptor = descriptor
+    self.detail = detail
+    # Every call while recording is enabled. Numbers the calls recorded at
+    # Detail.SAMPLE.
+    self.calls = 0
+    # ns spent recording our calls in the current window.
+    self.spent = 0
+
+  def enter(self):
+    '''Count a call. Returns the Detail with which it is recorded.
+    '''
+    governor = self.governor
+    governor._calls += 1
+    if governor.validating:
+      governor.replay()
+    elif governor._calls >= governor._next_check:
+      governor.check()
+    self.calls += 1
+    return self.detail
+
+  def admit(self):
+    '''At Detail.SAMPLE, the number of this call if it is recorded,
+        otherwise 0.
+    '''
+    calls = self.calls
+    if self.governor.validating or (calls - 1) % self.governor.every == 0:
+      return calls
+    return 0
@@ -1,5 +0,0 @@
-
-class RecordingMedium:
-
-  def __init__(self, *args, **kwargs):
-    super().__init__(*args, **kwargs)
@@ -0,0 +1,7 @@
+
+from .index import CassetteIndex, TuneView
+from .medium import Encoded, RecordingMedium
+
+# Importing these registers them with RecordingMedium.
+from .binary_medium import BinaryMedium
+from .json_medium import JsonMedium
@@ -0,0 +1,416 @@
+
+import logging
+import struct
+
+from ..timestamp import Timestamp
+from ..tune import Tune
+from .medium import Encoded, RecordingMedium
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'RKDR\x01'
+
+# Record kinds. The first byte of every record.
+STRINGS = 0x53  # 'S' : Definitions for the string table.
+TUNE = 0x54     # 'T' : A tune on a track : index, title, tune.
+RECORD = 0x52   # 'R' : Any other record.
+
+# Value tags. The first byte of every value.
+# Tags after FLOAT are followed by a varint.
+NONE, FALSE, TRUE, FLOAT, INT, REF, STR, LIST, DICT, BYTES = range(10)
+
+# Strings longer than this are always written inline.
+INTERN_LENGTH = 64
+# No more than this many strings are added to the string table.
+INTERN_LIMIT = 1 << 16
+
+# How much of the input is read at a time when decoding.
+CHUNK_SIZE = 1 << 20
+
+_DOUBLE = struct.Struct('<d')
+_SMALL = [bytes([n]) for n in range(0x80)]
+
+
+def varint(n):
+  '''Encode a non-negative int as a LEB128 varint.
+  '''
+  if n < 0x80:
+    return _SMALL[n]
+  out = bytearray()
+  while n >= 0x80:
+    out.append((n & 0x7f) | 0x80)
+    n >>= 7
+  out.append(n)
+  return bytes(out)
+
+
+def read_varint(buf, pos):
+  '''Decode the varint at buf[pos]. Returns the int and the position after it.
+  '''
+  n = buf[pos]
+  if n < 0x80:
+    return n, pos + 1
+  n &= 0x7f
+  shift = 7
+  while True:
+    pos += 1
+    b = buf[pos]
+    n |= (b & 0x7f) << shift
+    if b < 0x80:
+      return n, pos + 1
+    shift += 7
+
+
+@RecordingMedium.register
+class BinaryMedium(RecordingMedium):
+  '''A compact, length-prefixed binary encoding.
+
+    The output starts with MAGIC and is followed by records. Each record is
+    a varint length followed by that many bytes. The first of those bytes is
+    the kind of record (STRINGS, TUNE or RECORD).
+
+    Dict keys and short strings (e.g. - device.module, device.class,
+    function.name) are written once to a string table (a STRINGS record
+    preceding the first record that uses them) and then referred to by a
+    varint id.
+
+    Values are a tag byte followed by:
+      NONE, FALSE, TRUE : nothing
+      INT               : zig-zag varint
+      FLOAT             : little-endian double
+      REF               : varint id in the string table
+      STR, BYTES        : varint length then utf-8 / raw bytes
+      LIST              : varint count then values
+      DICT              : varint count then key & value pairs
+  '''
+
+  format = 'binary'
+  extensions = ['.rkdr']
+
+  def __init__(self, *args, **kwargs):
+    super().__init__(*args, **kwargs)
+    # Encoding : string -> encoded REF value
+    self._refs = {}
+    self._new = []
+    # Encoded fragments of the parts of a tune that repeat from one tune to
+    # the next. (device class, when, intern) -> bytes
+    self._heads = {}
+    # Decoding
+    self._strings = []
+
+  @staticmethod
+  def sniff(head):
+    return head.startswith(MAGIC)
+
+  def preamble(self):
+    return MAGIC
+
+  # Encoding
+
+  def encode(self, record, standalone=False):
+    parts = []
+    intern = not standalone
+    # The function table record (if any) precedes the tune's record.
+    table = b''
+
+    try:
+      if len(record) == 3 and 'tune' in record:
+        parts.append(_SMALL[TUNE])
+        parts.append(varint(record['index']))
+        self._value(record['title'], parts, intern)
+        if isinstance(record['tune'], Tune):
+          functions = self.function_record(record['tune'], standalone)
+          if functions is not None:
+            table = self.encode(functions, standalone)
+          self._tune(record['tune'], parts, intern)
+        else:
+          self._value(record['tune'], parts, intern)
+      else:
+        parts.append(_SMALL[RECORD])
+        self._value(record, parts, intern)
+    except TypeError as e:
+      raise Exception(record) from e
+
+    payload = b''.join(parts)
+    data = varint(len(payload)) + payload
+
+    if self._new:
+      data = self._strings_record() + data
+
+    return table + data
+
+  def _strings_record(self):
+    parts = [_SMALL[STRINGS], varint(len(self._new))]
+    for string in self._new:
+      b = string.encode()
+      parts.append(varint(len(b)))
+      parts.append(b)
+    self._new = []
+    payload = b''.join(parts)
+    return varint(len(payload)) + payload
+
+  def _intern(self, string):
+    if len(self._refs) >= INTERN_LIMIT:
+      return None
+    ref = _SMALL[REF] + varint(len(self._refs))
+    self._refs[string] = ref
+    self._new.append(string)
+    return ref
+
+  def _value(self, obj, parts, intern, key=False):
+    t = type(obj)
+
+    if t is str:
+      ref = self._refs.get(obj) if intern else None
+      if ref is None and intern and (key or len(obj) <= INTERN_LENGTH):
+        ref = self._intern(obj)
+      if ref is not None:
+        parts.append(ref)
+      else:
+        b = obj.encode()
+        parts.append(_SMALL[STR] + varint(len(b)))
+        parts.append(b)
+
+    elif t is dict:
+      parts.append(_SMALL[DICT] + varint(len(obj)))
+      for k, v in obj.items():
+        self._value(k, parts, intern, key=True)
+        self._value(v, parts, intern)
+
+    elif t is int:
+      parts.append(_SMALL[INT] + varint(obj << 1 if obj >= 0 else (-obj << 1) - 1))
+
+    elif obj is None:
+      parts.append(_SMALL[NONE])
+
+    elif t is bool:
+      parts.append(_SMALL[TRUE] if obj else _SMALL[FALSE])
+
+    elif t is float:
+      parts.append(_SMALL[FLOAT] + _DOUBLE.pack(obj))
+
+    elif t in (list, tuple):
+      parts.append(_SMALL[LIST] + varint(len(obj)))
+      for v in obj:
+        self._value(v, parts, intern)
+
+    elif t in (bytes, bytearray):
+      parts.append(_SMALL[BYTES] + varint(len(obj)))
+      parts.append(bytes(obj))
+
+    elif t is Encoded and isinstance(obj.medium, BinaryMedium):
+      # Encoded by encode_value() so it does not refer to the string table.
+      parts.append(obj.data)
+
+    else:
+      self._value(self.serializers(obj), parts, intern, key)
+
+  def _tune(self, tune, parts, intern):
+    '''Encode a Tune (see Tune.recordable_data()). The device & when are
+        encoded once for each class of device.
+    '''
+    cls = tune.device.__class__
+    threaded = tune.thread is not None
+    key = (cls, tune.when, intern, threaded)
+    head = self._heads.get(key, None)
+    if head is None:
+      head = []
+      data = {'device': {'module': cls.__module__, 'class': cls.__name__}}
+      if tune.when:
+        data['when'] = tune.when
+      # notes & timestamp (and thread & sequence) follow.
+      head.append(_SMALL[DICT] + varint(len(data) + (4 if threaded else 2)))
+      for k, v in data.items():
+        self._value(k, head, intern, key=True)
+        self._value(v, head, intern)
+      self._value('notes', head, intern, key=True)
+      head = self._heads[key] = b''.join(head)
+    parts.append(head)
+
+    encoded = tune.encoded_notes
+    if encoded is not None and isinstance(encoded.medium, BinaryMedium):
+      parts.append(encoded.data)
+    else:
+      self._value(tune.notes, parts, intern)
+
+    self._value('timestamp', parts, intern, key=True)
+    self._value(Timestamp.recordable_data(tune.timestamp), parts, intern)
+
+    if threaded:
+      self._value('thread', parts, intern, key=True)
+      self._value(tune.thread, parts, intern)
+      self._value('sequence', parts, intern, key=True)
+      self._value(tune.sequence, parts, intern)
+
+  def encode_value(self, value):
+    parts = []
+    try:
+      self._value(value, parts, intern=False)
+    except TypeError as e:
+      raise Exception(value) from e
+    return b''.join(parts)
+
+  # Decoding
+
+  def decode(self, f):
+    '''Generate the records in `f`.
+
+        If the recording process was killed during a write the last record
+        may be incomplete. It is ignored so that the rest can be played back.
+    '''
+    if f.read(len(MAGIC)) != MAGIC:
+      raise Exception("[{}] is not a binary recording.".format(f.name))
+
+    buf = b''
+    pos = 0
+    while True:
+      chunk = f.read(CHUNK_SIZE)
+      buf = buf[pos:] + chunk
+      pos = 0
+
+      while True:
+        frame = BinaryMedium.frame(buf, pos)
+        if not frame:
+          break
+        start, pos = frame
+        record = self.decode_record(buf[start:pos])
+        if record is not None:
+          yield record
+
+      if not chunk:
+        break
+
+    if pos < len(buf):
+      logger.warning("Ignoring incomplete record at the end of [{}].".format(f.name))
+
+  @staticmethod
+  def frame(buf, pos):
+    '''Locate the length-prefixed record at buf[pos].
+
+        Returns the start and end of its payload or None if buf does not
+        contain all of it.
+    '''
+    try:
+      n, start = read_varint(buf, pos)
+    except IndexError:
+      return None
+    end = start + n
+    if end > len(buf):
+      return None
+    return start, end
+
+  # Random access
+
+  def indexable(self, f):
+    return True
+
+  def scan(self, buf, pos=None):
+    pos = pos or len(MAGIC)
+    while True:
+      frame = BinaryMedium.frame(buf, pos)
+      if not frame:
+        if pos < len(buf):
+          logger.warning("Ignoring incomplete record at the end of the recording.")
+        return
+      start, end = frame
+
+      if buf[start] == TUNE:
+        index, p = read_varint(buf, start + 1)
+        title, p = self._read_value(buf, p)
+        yield index, title, pos, end
+      else:
+        # Keeps the string table up to date.
+        self.decode_record(buf[start:end])
+        yield None, None, pos, end
+
+      pos = end
+
+  def decode_tune(self, buf, start, end):
+    start, end = BinaryMedium.frame(buf, start)
+    return self.decode_record(buf[start:end])['tune']
+
+  def scan_state(self):
+    state = super().scan_state()
+    state['strings'] = self._strings
+    return state
+
+  def restore_scan_state(self, state):
+    super().restore_scan_state(state)
+    self._strings = list(state['strings'])
+
+  def decode_value(self, data):
+    return self._read_value(data, 0)[0]
+
+  def decode_record(self, payload):
+    '''Decode a single record.
+        Returns None for STRINGS and function table records which only
+        update the string / function table.
+    '''
+    kind = payload[0]
+
+    if kind == TUNE:
+      index, pos = read_varint(payload, 1)
+      title, pos = self._read_value(payload, pos)
+      tune, pos = self._read_value(payload, pos)
+      return {'index': index, 'title': title, 'tune': self.resolve(tune)}
+
+    if kind == RECORD:
+      record = self._read_value(payload, 1)[0]
+      return None if self.learn(record) else record
+
+    if kind == STRINGS:
+      count, pos = read_varint(payload, 1)
+      for _ in range(count):
+        n, pos = read_varint(payload, pos)
+        self._strings.append(payload[pos:pos + n].decode())
+        pos += n
+      return None
+
+    raise Exception("Unknown record kind [{}]".format(kind))
+
+  def _read_value(self, buf, pos):
+    tag = buf[pos]
+
+    if tag <= FLOAT:
+      if tag == NONE:
+        return None, pos + 1
+      if tag == TRUE:
+        return True, pos + 1
+      if tag == FALSE:
+        return False, pos + 1
+      return _DOUBLE.unpack_from(buf, pos + 1)[0], pos + 9
+
+    n = buf[pos + 1]
+    pos += 2
+    if n >= 0x80:
+      n, pos = read_varint(buf, pos - 1)
+
+    if tag == REF:
+      return self._strings[n], pos
+
+    if tag == DICT:
+      r = {}
+      read = self._read_value
+      for _ in range(n):
+        k, pos = read(buf, pos)
+        r[k], pos = read(buf, pos)
+      return r, pos
+
+    if tag == INT:
+      return (n >> 1) if not n & 1 else -((n + 1) >> 1), pos
+
+    if tag == STR:
+      return buf[pos:pos + n].decode(), pos + n
+
+    if tag == LIST:
+      r = []
+      read = self._read_value
+      for _ in range(n):
+        v, pos = read(buf, pos)
+        r.append(v)
+      return r, pos
+
+    if tag == BYTES:
+      return bytes(buf[pos:pos + n]), pos + n
+
+    raise Exception("Unknown value tag [{}]".format(tag))
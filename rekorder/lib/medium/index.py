@@ -0,0 +1,168 @@
+
+import array
+import json
+import mmap
+import os
+
+from collections.abc import Sequence
+
+
+class CassetteIndex:
+  '''Random access to the tunes of an (uncompressed) cassette.
+
+    The cassette is mmap'd and the byte offsets of every tune, grouped by
+    track, are collected by RecordingMedium.scan(). Only the tunes that are
+    asked for are ever decoded.
+
+    The offsets are saved to a sidecar file (the cassette's path + '.idx')
+    so that they only need to be collected once. Because cassettes are
+    append-only, a sidecar for a cassette that has since grown is extended
+    by scanning only what was appended.
+
+    Usage:
+
+      index = CassetteIndex('greatest-hits.json', medium)
+      for n, title in index.tracks():
+        view = index.view(n)
+        print(title, len(view), view[0], view[-10:])
+  '''
+
+  SUFFIX = '.idx'
+  VERSION = 2
+
+  def __init__(self, path, medium):
+    '''Construct the CassetteIndex.
+
+      Args:
+        path (str): Path of the cassette.
+        medium (RecordingMedium): The cassette's medium. See
+                                  RecordingMedium.for_input().
+    '''
+    super().__init__()
+
+    self.path = path
+    self.medium = medium
+    self.sidecar = path + CassetteIndex.SUFFIX
+
+    self._file = open(path, 'rb')
+    size = os.fstat(self._file.fileno()).st_size
+    self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    # track index -> title, array of start & end offsets
+    self._tracks = {}
+    self._covered = None
+
+    self._load()
+    if self._covered is None or self._covered < len(self._buf):
+      self._scan()
+      # Nothing to save if not even one record is complete (e.g. - the
+      # recording process was killed during its first write).
+      if self._covered is not None:
+        self._save()
+
+  def tracks(self):
+    '''List of the index & title of every track with at least one tune.
+    '''
+    return [(n, self._tracks[n][0]) for n in sorted(self._tracks)]
+
+  def view(self, index):
+    '''A TuneView of the tunes of the track with `index`.
+    '''
+    offsets = self._tracks[index][1] if index in self._tracks else array.array('Q')
+    return TuneView(self, offsets)
+
+  def decode(self, start, end):
+    '''Decode the tune recorded at buf[start:end].
+    '''
+    return self.medium.decode_tune(self._buf, start, end)
+
+  def close(self):
+    if isinstance(self._buf, mmap.mmap):
+      self._buf.close()
+    self._file.close()
+
+  # Internals
+
+  def _scan(self):
+    pos = self._covered
+    for index, title, start, end in self.medium.scan(self._buf, pos):
+      if index is not None:
+        if index not in self._tracks:
+          self._tracks[index] = (title, array.array('Q'))
+        self._tracks[index][1].extend((start, end))
+      self._covered = end
+
+  def _load(self):
+    '''Load the sidecar if it describes (a prefix of) our cassette.
+    '''
+    try:
+      with open(self.sidecar, 'r') as f:
+        sidecar = json.load(f)
+    except (OSError, ValueError):
+      return
+
+    if sidecar.get('version') != CassetteIndex.VERSION or \
+            sidecar.get('format') != self.medium.format or \
+            sidecar['covered'] > len(self._buf) or \
+            sidecar.get('fingerprint') != self._fingerprint(sidecar['covered']):
+      return
+
+    self.medium.restore_scan_state(sidecar['state'])
+    self._tracks = {
+        track['index']: (track['title'], array.array('Q', track['offsets']))
+        for track in sidecar['tracks']
+    }
+    self._covered = sidecar['covered']
+
+  def _fingerprint(self, covered):
+    '''Distinguish our cassette from another recording made to the same path.
+    '''
+    return (self._buf[:64] + self._buf[max(0, covered - 64):covered]).hex()
+
+  def _save(self):
+    '''Save the sidecar. Failure to do so (e.g. - a read-only directory)
+        is not an error.
+    '''
+    sidecar = {
+        'version': CassetteIndex.VERSION,
+        'format': self.medium.format,
+        'covered': self._covered,
+        'fingerprint': self._fingerprint(self._covered),
+        'state': self.medium.scan_state(),
+        'tracks': [
+            {'index': n, 'title': title, 'offsets': offsets.tolist()}
+            for n, (title, offsets) in sorted(self._tracks.items())
+        ]
+    }
+    temp = self.sidecar + '.tmp'
+    try:
+      with open(temp, 'w') as f:
+        json.dump(sidecar, f)
+      os.replace(temp, self.sidecar)
+    except OSError:
+      pass
+
+
+class TuneView(Sequence):
+  '''The recorded tunes of one track of a CassetteIndex.
+
+    Indexing a TuneView decodes just that tune. Slicing decodes just the
+    tunes in the slice. Tunes are decoded into the data recorded by
+    Tune.recordable_data(). See Tune.playback_instance().
+  '''
+
+  def __init__(self, index, offsets):
+    self._index = index
+    self._offsets = offsets
+
+  def __len__(self):
+    return len(self._offsets) // 2
+
+  def __getitem__(self, i):
+    if isinstance(i, slice):
+      return [self[n] for n in range(*i.indices(len(self)))]
+    if i < 0:
+      i += len(self)
+    if not 0 <= i < len(self):
+      raise IndexError("Tune index [{}] out of range".format(i))
+    return self._index.decode(self._offsets[2 * i], self._offsets[2 * i + 1])
@@ -0,0 +1,204 @@
+
+import base64
+import json
+import logging
+import re
+
+from ..tune import Tune
+from .medium import RecordingMedium
+
+logger = logging.getLogger(__name__)
+
+# No more than this many fragments (e.g. - titles) are cached.
+FRAGMENT_LIMIT = 1 << 12
+
+# Records are written with sorted keys so every tune record begins with this.
+TUNE_PREFIX = re.compile(rb'\{"index": (\d+), "title": ("(?:[^"\\]|\\.)*"), "tune": ')
+
+
+class RecordingEncoder(json.JSONEncoder):
+  '''JSONEncoder implementation that is aware of rekorder objects.
+      Anything else that JSON cannot encode is converted by `serializers`.
+  '''
+
+  def __init__(self, *args, serializers, **kwargs):
+    super().__init__(*args, **kwargs)
+    self.serializers = serializers
+
+  def default(self, obj):
+    '''json.JSONEncoder default encoding method.
+    '''
+
+    if isinstance(obj, bytes):
+      # JSON has no bytes type.
+      return base64.b64encode(obj).decode('ascii')
+
+    return self.serializers(obj)
+
+
+@RecordingMedium.register
+class JsonMedium(RecordingMedium):
+  '''Records are written as lines of JSON.
+
+      {"index": 0, "title": "header", "tune": {...}}
+      {"index": 0, "title": "header", "tune": {...}}
+      ...
+
+    A function table record (see FunctionDescriptor) precedes the first
+    tune that refers to each function.
+
+    Also reads recordings made by rekorder 0.6.0 and earlier which are a
+    single JSON list of tracks.
+  '''
+
+  format = 'json'
+  extensions = ['.json', '.jsonl']
+
+  def __init__(self, *args, **kwargs):
+    super().__init__(*args, **kwargs)
+    self._encoder = RecordingEncoder(sort_keys=True, serializers=self.serializers)
+    # Encoded fragments of the parts of a tune record that repeat from one
+    # tune to the next. Device class / title / when -> JSON.
+    self._devices = {}
+    self._fragments = {}
+
+  @staticmethod
+  def sniff(head):
+    return head.lstrip()[:1] in [b'{', b'[']
+
+  def encode(self, record, standalone=False):
+    try:
+      tune = record.get('tune', None)
+      if len(record) == 3 and isinstance(tune, Tune):
+        # Same output as encoding the record with sorted keys.
+        text = '{{"index": {}, "title": {}, "tune": {}}}'.format(
+            record['index'], self._fragment(record['title']), self._tune(tune))
+        functions = self.function_record(tune, standalone)
+        if functions is not None:
+          text = self._encoder.encode(functions) + '\n' + text
+      else:
+        text = self._encoder.encode(record)
+    except TypeError as e:
+      raise Exception(record) from e
+
+    return text.encode() + b'\n'
+
+  def _tune(self, tune):
+    '''Encode a Tune (see Tune.recordable_data()) from the cached fragments
+        and its notes & timestamp.
+    '''
+    cls = tune.device.__class__
+    device = self._devices.get(cls, None)
+    if device is None:
+      device = self._devices[cls] = self._encoder.encode(
+          {'module': cls.__module__, 'class': cls.__name__})
+
+    encoded = tune.encoded_notes
+    if encoded is not None and isinstance(encoded.medium, JsonMedium):
+      notes = encoded.data
+    else:
+      notes = self._encoder.encode(tune.notes)
+
+    timestamp = '{{"time": {}}}'.format(float.__repr__(tune.timestamp.time))
+
+    # Keys are sorted.
+    threaded = ''
+    if tune.thread is not None:
+      threaded = ', "sequence": {}, "thread": {}'.format(tune.sequence, self._fragment(tune.thread))
+
+    if not tune.when:
+      return '{{"device": {}, "notes": {}{}, "timestamp": {}}}'.format(
+          device, notes, threaded, timestamp)
+    return '{{"device": {}, "notes": {}{}, "timestamp": {}, "when": {}}}'.format(
+        device, notes, threaded, timestamp, self._fragment(tune.when))
+
+  def _fragment(self, value):
+    '''JSON for a (hashable) value that is likely to be encoded again.
+    '''
+    fragment = self._fragments.get(value, None)
+    if fragment is None:
+      if len(self._fragments) >= FRAGMENT_LIMIT:
+        return self._encoder.encode(value)
+      fragment = self._fragments[value] = self._encoder.encode(value)
+    return fragment
+
+  def encode_value(self, value):
+    return self._encoder.encode(value)
+
+  def decode_value(self, data):
+    return json.loads(data)
+
+  def decode(self, f):
+    '''Generate the records in `f`.
+
+        The output is always written whole records at a time. If the
+        recording process was killed during a write the last record may
+        be incomplete. It is ignored so that the rest can be played back.
+    '''
+    if f.read(64).lstrip().startswith(b'['):
+      f.seek(0)
+      yield from JsonMedium._decode_legacy(f)
+      return
+    f.seek(0)
+
+    for line in f:
+      if not line.strip():
+        continue
+      try:
+        record = json.loads(line)
+      except ValueError:
+        if line.endswith(b'\n'):
+          raise
+        logger.warning("Ignoring incomplete record at the end of [{}].".format(f.name))
+        continue
+      if self.learn(record):
+        continue
+      if 'tune' in record:
+        self.resolve(record['tune'])
+      yield record
+
+  # Random access
+
+  def indexable(self, f):
+    head = f.read(64)
+    f.seek(0)
+    return not head.lstrip().startswith(b'[')
+
+  def scan(self, buf, pos=None):
+    pos = pos or 0
+    size = len(buf)
+    while pos < size:
+      end = buf.find(b'\n', pos)
+      if end < 0:
+        end = size
+        try:
+          json.loads(buf[pos:end])
+        except ValueError:
+          logger.warning("Ignoring incomplete record at the end of the recording.")
+          return
+      else:
+        end += 1
+
+      match = TUNE_PREFIX.match(buf, pos)
+      if match:
+        index, title = int(match.group(1)), json.loads(match.group(2))
+      elif buf[pos:end].strip():
+        record = json.loads(buf[pos:end])
+        self.learn(record)
+        index, title = record.get('index', None), record.get('title', None)
+      else:
+        index, title = None, None
+
+      yield index, title, pos, end
+      pos = end
+
+  def decode_tune(self, buf, start, end):
+    return self.resolve(json.loads(buf[start:end])['tune'])
+
+  @staticmethod
+  def _decode_legacy(f):
+    '''Recorded by rekorder <= 0.6.0 as a single JSON list of tracks.
+    '''
+    for track in json.load(f):
+      for tune in track['tunes']:
+        yield {'index': track['index'], 'title': track['title'], 'tune': tune}
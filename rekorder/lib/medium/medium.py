@@ -0,0 +1,261 @@
+
+import os
+
+from .. import compression
+from .. import serializer
+
+
+class RecordingMedium:
+  '''The format in which a Cassette's records are written.
+
+    A Cassette is a stream of records. Most of them are the tunes recorded
+    on the Cassette's tracks:
+
+      {'index': 0-n, 'title': 'header|entry|etc...', 'tune': Tune}
+
+    A RecordingMedium encodes records for a Writer on record and decodes
+    them again on describe/playback. Derived classes are registered with
+    RecordingMedium.register() and are selected by the output's file
+    extension (see `extensions`), by an explicit `format=` or, on playback,
+    by sniffing the first bytes of the input.
+
+    Derived classes must provide:
+      format (str): Name by which the medium can be requested.
+      extensions (list[str]): File extensions that select the medium.
+      sniff(head): Does `head` (the first bytes of a file) look like ours?
+      encode(record): bytes to append to the output for `record`.
+      decode(f): Generate the records in binary file `f`.
+
+    They may also provide preamble(): bytes written once at the start of
+    every output.
+
+    Values that a medium cannot encode by itself are converted by its
+    Serializers (see Serializers).
+
+    Media that can snapshot values (see Snapshot.ENCODE) provide
+    encode_value() and decode_value() and copy Encoded values given to
+    encode() directly to the output.
+
+    Media that support random access (see CassetteIndex) also provide
+    indexable(), scan(), decode_tune(), scan_state() and restore_scan_state().
+
+    Tunes refer to their function by id. Media write the function table
+    record returned by function_record() before a tune's record and, on
+    decode, learn() the table and resolve() the ids in decoded tunes (see
+    FunctionDescriptor).
+  '''
+
+  format = None
+  extensions = []
+
+  # Used when the output's extension does not select a medium.
+  default = 'json'
+
+  __media = {}
+
+  @staticmethod
+  def register(cls):
+    '''Register a RecordingMedium class. Can be used as a class decorator.
+    '''
+    RecordingMedium.__media[cls.format] = cls
+    return cls
+
+  @staticmethod
+  def formats():
+    return list(RecordingMedium.__media)
+
+  def __init__(self, serializers=None):
+    '''Construct the RecordingMedium.
+
+      Args:
+        serializers (Serializers): Optional. Converts values that the medium
+                                   cannot encode by itself.
+    '''
+    super().__init__()
+    self.serializers = serializers if serializers else serializer.DEFAULT
+    # Function table. Encode: ids of the descriptors already written.
+    # Decode: id -> entry.
+    self._written = set()
+    self._functions = {}
+
+  @staticmethod
+  def for_output(path, format=None, serializers=None):
+    '''Construct the RecordingMedium for writing to `path`.
+
+      Args:
+        path (str): Output path. Its extension selects the medium.
+                    A compression extension is ignored ('x.rkdr.gz' is
+                    a binary recording).
+        format (str): Optional. Name of the medium to use regardless of
+                      the extension.
+        serializers (Serializers): Optional. See RecordingMedium().
+    '''
+    if format:
+      if format not in RecordingMedium.__media:
+        raise Exception("Unknown format [{}]. Expected one of {}.".format(
+            format, RecordingMedium.formats()))
+      return RecordingMedium.__media[format](serializers=serializers)
+
+    extension = os.path.splitext(compression.strip(path))[1] if path else ''
+    for cls in RecordingMedium.__media.values():
+      if extension in cls.extensions:
+        return cls(serializers=serializers)
+
+    return RecordingMedium.__media[RecordingMedium.default](serializers=serializers)
+
+  @staticmethod
+  def for_input(f):
+    '''Construct the RecordingMedium able to read binary file `f`.
+        Leaves `f` positioned at its beginning.
+    '''
+    head = f.read(64)
+    f.seek(0)
+    for cls in RecordingMedium.__media.values():
+      if cls.sniff(head):
+        return cls()
+    raise Exception("[{}] is not a recording.".format(getattr(f, 'name', f)))
+
+  # Codec
+
+  def preamble(self):
+    return b''
+
+  @staticmethod
+  def sniff(head):
+    raise NotImplementedError()
+
+  def encode(self, record, standalone=False):
+    '''Encode `record` for appending to the output.
+
+      Args:
+        record (dict): The record.
+        standalone (bool): The encoding must not depend on (or add to) any
+                           state kept by the medium for earlier records.
+                           Used when a record may reach the output out of
+                           order (e.g. - ThreadedWriter's spill file).
+    '''
+    raise NotImplementedError()
+
+  def decode(self, f):
+    raise NotImplementedError()
+
+  # Function table
+
+  def function_record(self, tune, standalone=False):
+    '''The function table record that must precede the record of `tune`.
+        None if the table already has `tune`'s function.
+
+      Args:
+        tune (Tune): The tune about to be encoded.
+        standalone (bool): See encode(). The record is always returned
+                           and the function is not added to the table.
+    '''
+    descriptor = tune.descriptor
+    if descriptor is None:
+      return None
+    if not standalone:
+      if descriptor.id in self._written:
+        return None
+      self._written.add(descriptor.id)
+    return {'functions': [descriptor.entry]}
+
+  def learn(self, record):
+    '''Add the entries of function table `record` to the table.
+        Returns False if `record` is not a function table record.
+    '''
+    if not isinstance(record, dict) or 'functions' not in record or 'tune' in record:
+      return False
+    for entry in record['functions']:
+      self._functions[entry['id']] = entry
+    return True
+
+  def resolve(self, tune):
+    '''Replace the function id in decoded `tune` (data, not a Tune) with the
+        function's name, qualname & module. Returns `tune`.
+    '''
+    notes = tune.get('notes', None) if isinstance(tune, dict) else None
+    function = notes.get('function', None) if isinstance(notes, dict) else None
+    if isinstance(function, dict) and 'id' in function:
+      entry = self._functions.get(function['id'], None)
+      if entry is not None:
+        del function['id']
+        function['name'] = entry['name']
+        function['qualname'] = entry['qualname']
+        function['module'] = entry['module']
+    return tune
+
+  # Snapshots
+
+  def snapshot(self, value):
+    '''Encode `value` now so that later changes to it are not recorded.
+        Returns an Encoded value for encode().
+    '''
+    return Encoded(self.encode_value(value), self)
+
+  def encode_value(self, value):
+    '''Encode a single value (not a record) independently of any state
+        kept by the medium. It may be given to encode() from any thread.
+    '''
+    raise NotImplementedError()
+
+  def decode_value(self, data):
+    '''Decode data returned by encode_value().
+    '''
+    raise NotImplementedError()
+
+  # Random access
+
+  def indexable(self, f):
+    '''Can CassetteIndex be used to read `f`?
+        Leaves `f` positioned at its beginning.
+    '''
+    return False
+
+  def scan(self, buf, pos=None):
+    '''Generate (index, title, start, end) for each record in buf[pos:].
+
+      For tunes, `index` and `title` are those of the tune's track and
+      buf[start:end] can be given to decode_tune(). Other records are
+      generated with an index and title of None.
+
+      Args:
+        buf (bytes-like): The content of a cassette (e.g. - an mmap).
+        pos (int): Where to begin. The end of a previously scanned record or
+                   None to begin at the first record.
+    '''
+    raise NotImplementedError()
+
+  def decode_tune(self, buf, start, end):
+    '''Decode the tune of the record at buf[start:end] located by scan().
+    '''
+    raise NotImplementedError()
+
+  def scan_state(self):
+    '''Anything (JSON-able) that scan() learned and that decode_tune() will
+        need when a CassetteIndex is restored from its sidecar.
+    '''
+    return {'functions': list(self._functions.values())}
+
+  def restore_scan_state(self, state):
+    for entry in state['functions']:
+      self._functions[entry['id']] = entry
+
+
+class Encoded:
+  '''A value that was encoded by RecordingMedium.snapshot().
+
+    The medium that made it writes `data` in place of the value. Anything
+    else uses the decoded value (see recordable_data()).
+  '''
+
+  def __init__(self, data, medium):
+    self.data = data
+    self.medium = medium
+
+  @staticmethod
+  def recordable_data(obj):
+    return obj.value
+
+  @property
+  def value(self):
+    return self.medium.decode_value(self.data)
@@ -1,14 +1,50 @@
 
+import inspect
 import os
-import sys
 
 from functools import wraps
 
 from ..device import Device
+from ..function import FunctionDescriptor
+from ..sampling import Sampler, Sampling
 from ..timestamp import Timestamp
 from ..tune import Tune
+from ..what import What
 from ..when import When
 
+from .frame import FRAMES, Frame
+from .stack import Stack
+
+
+class _Calls:
+  '''The call of a Decorator that is not recording (e.g. - one that was
+      played back).
+  '''
+
+  __slots__ = ('current',)
+
+  def __init__(self):
+    self.current = Frame()
+
+
+class _InFrame:
+  '''An attribute of a Decorator that describes the call it is recording.
+      It is kept in the call's Frame.
+  '''
+
+  __slots__ = ('name',)
+
+  def __init__(self, name):
+    self.name = name
+
+  def __get__(self, obj, cls=None):
+    if obj is None:
+      return self
+    return getattr(obj._calls.current, self.name)
+
+  def __set__(self, obj, value):
+    setattr(obj._calls.current, self.name, value)
+
 
 class Decorator(Device):
   '''Decorate a method so that we can record things about it.
@@ -35,8 +71,8 @@ class Decorator(Device):
     to record the desired data at those points.
 
     Default behaviors:
-      before  : Provides function module and name, args & kwargs
-      after   : Provides function module and name, args & return value
+      before  : Provides function descriptor, args & kwargs
+      after   : Provides function descriptor, args & return value
       afround : Delegates to before(). If when is When.AFTER, delegates to
                 after() and merges results.
 
@@ -44,8 +80,42 @@ class Decorator(Device):
     record() or the pre/post hooks around invoke() and record().
     See their definitions for more detail.
 
+    Decorators that are stacked on the same function share a single wrapper
+    if they can (see stackable() and Stack).
+
+    When the Recorder's mode is What.OFF the function is returned as is.
+    While the Recorder is not `enabled` (see Recorder.recording()) the
+    function is invoked without recording anything unless the Decorator
+    is not `pausable`. While the Recorder is `counting` the calls of
+    `pausable` Decorators are counted instead (see Statistics).
+
+    Any Decorator that is `samplable` can be told to record only some calls
+    (e.g. - @d(sample=0.01)). See Sampling.
+
+    A Decorator is shared by every call of the function it decorates, from
+    any thread. While recording, `args`, `kwargs`, `rval` & `call` describe
+    the call that is being recorded. They are kept in its Frame (`frame`).
+
+    Coroutine functions are decorated with a coroutine function so that
+    the value that the coroutine returns (or the exception it raises) is
+    recorded when it is awaited. Each asyncio Task records its calls from
+    Frames of its own. invoke() may return an awaitable which is awaited
+    for the rval. Async generator functions can only be decorated by
+    stackable Decorators (see Stack).
+
   '''
 
+  # The call being recorded. See Frame.
+  args = _InFrame('args')
+  kwargs = _InFrame('kwargs')
+  rval = _InFrame('rval')
+  call = _InFrame('call')
+
+  # Does Recorder.enabled apply to us?
+  pausable = True
+  # Can our calls be sampled? See Sampling.
+  samplable = True
+
   @staticmethod
   def playback_instance(cls, *args, **kwargs):
     '''Construct a playback instance of `cls`.
@@ -85,8 +155,34 @@ class Decorator(Device):
                      method invocation. Default is When.AROUND.
     '''
 
+    self._calls = _Calls()
+
     super().__init__(*args, when=when, **kwargs)
 
+    if self.mode in [What.RECORD, What.VALIDATE]:
+      # The calling thread's Frames.
+      self._calls = FRAMES
+
+    # Number of the (sampled) call being recorded. See Sampler.admit().
+    self.call = None
+
+  @property
+  def frame(self):
+    '''The Frame of the call being recorded.
+    '''
+    return self._calls.current
+
+  def played(self, name):
+    '''Our `args`, `kwargs` or `rval` in the form in which they are
+        compared on playback. Those of a call that is being validated are
+        converted as they would have been recorded. See Cassette.played().
+    '''
+    value = getattr(self, name)
+    if self.mode != What.VALIDATE:
+      return value
+    value = self.recorder.recording_medium.played(value)
+    return tuple(value) if name == 'args' else value
+
   def _describe_function(self):
     if isinstance(self.function, dict):
       m = self.function['module']
@@ -110,14 +206,11 @@ class Decorator(Device):
         Returns a dict representing the Notes of the Tune to be recorded.
 
         Default behavior:
-          Provides function module and name, args & kwargs
+          Provides function (see FunctionDescriptor), args & kwargs
     '''
-    from ..recorder import Recorder
     return {
         'function': {
-            'name': self.function.__name__,
-            'qualname': self.function.__qualname__,
-            'module': self._get_module_of(self.function),
+            'id': self.descriptor,
             'args': self.args,
             'kwargs': self.kwargs,
         }
@@ -155,27 +248,17 @@ class Decorator(Device):
         Returns a dict representing the Notes of the Tune to be recorded.
 
         Default behavior:
-          Provides function module and name, args, kwargs & result.
+          Provides function (see FunctionDescriptor), args, kwargs & result.
     '''
     return {
         'function': {
-            'name': self.function.__name__,
-            'qualname': self.function.__qualname__,
-            'module': self._get_module_of(self.function),
+            'id': self.descriptor,
             'args': self.args,
             'kwargs': self.kwargs,
             'rval': self.rval
         }
     }
 
-  def _get_module_of(self, function):
-    '''Get the module that owns the function we are recording.
-    '''
-
-    if self.function.__module__ == '__main__':
-      return sys.modules[self.function.__module__].__file__.replace('/', '.').replace('.py', '')
-    return function.__module__
-
   def outtro(self, **moar):
     '''This is called immediately before returning from function wrapper.
         Its output is not recorded.
@@ -198,36 +281,113 @@ class Decorator(Device):
   def post_invoke(self, rval):
     return rval
 
+  def direct(self, function):
+    '''What to call instead of invoke() while recording is paused.
+        Derivatives that change how `function` is invoked override this.
+    '''
+    return function
+
   def silence(self, *args, **kwargs):
     '''Utility method for derivatives that want to record silence for one or
         more of before(), around() or after() instead of the default notes.
     '''
     return {}
 
-  def __call__(self, function=None, *, when=When.NA, **moar):
+  def __call__(self, function=None, *, when=When.NA, sample=None, rate=None, first=None, **moar):
+
+    if self.mode == What.OFF:
+      return function if function else Decorator._undecorated
 
     self.when = when
+    recorder = self.recorder
+    pausable = self.pausable
+    sampling = {'sample': sample, 'rate': rate, 'first': first}
 
     def wrapper(f):
 
+      if self.stackable():
+        stack = Stack.push(self, f, when, moar, sampling)
+        return stack.seal(Decorator.wrap_if_necessary(self, stack.function, stack.wrapper()))
+
       self.function = f
+      self.descriptor = FunctionDescriptor.of(f)
+      direct = self.direct(f)
+      sampler = self.sampler(self.descriptor, sampling)
+      statistics = recorder.statistics_of(self.descriptor) if pausable else None
 
       def wrapper_inner(*args, **kwargs):
 
-        self.args, self.kwargs, self.rval = args, kwargs, None
+        if pausable and not recorder.enabled:
+          return direct(*args, **kwargs)
 
-        self.intro(**moar)
+        if statistics and recorder.counting:
+          return statistics.invoke(direct, args, kwargs)
 
-        self._baa(when, When.BEFORE, self.before, **moar)
+        call = sampler.admit() if sampler else None
+        if call == 0:
+          return direct(*args, **kwargs)
 
-        self.rval = self.invoke()
+        frame = FRAMES.push(args, kwargs)
+        try:
+          frame.call = call
 
-        self._baa(when, When.AFTER, self.after, **moar)
+          self.intro(**moar)
 
-        self.outtro(**moar)
+          self._baa(when, When.BEFORE, self.before, **moar)
 
-        return self.rval
+          rval = frame.rval = self.invoke()
+          frame.call = call
 
+          self._baa(when, When.AFTER, self.after, **moar)
+
+          self.outtro(**moar)
+
+          return rval
+
+        finally:
+          FRAMES.pop(frame)
+
+      async def async_wrapper_inner(*args, **kwargs):
+        # wrapper_inner() for a coroutine function.
+
+        if pausable and not recorder.enabled:
+          return await direct(*args, **kwargs)
+
+        if statistics and recorder.counting:
+          return await statistics.ainvoke(direct, args, kwargs)
+
+        call = sampler.admit() if sampler else None
+        if call == 0:
+          return await direct(*args, **kwargs)
+
+        frame = FRAMES.push(args, kwargs)
+        try:
+          frame.call = call
+
+          self.intro(**moar)
+
+          self._baa(when, When.BEFORE, self.before, **moar)
+
+          rval = self.invoke()
+          if inspect.isawaitable(rval):
+            rval = await rval
+          frame.rval = rval
+          frame.call = call
+
+          self._baa(when, When.AFTER, self.after, **moar)
+
+          self.outtro(**moar)
+
+          return rval
+
+        finally:
+          FRAMES.pop(frame)
+
+      if inspect.iscoroutinefunction(f):
+        return Decorator.wrap_if_necessary(self, self.function, async_wrapper_inner)
+      if inspect.isasyncgenfunction(f):
+        raise Exception("[{}] cannot decorate async generator [{}].".format(
+            self.__class__.__name__, self.descriptor.key))
       return Decorator.wrap_if_necessary(self, self.function, wrapper_inner)
 
     if function:
@@ -235,15 +395,75 @@ class Decorator(Device):
 
     return wrapper
 
+  def stackable(self):
+    '''Can we share a wrapper with the decorators stacked around us?
+        Only if we invoke the function the way that Decorator does.
+    '''
+    cls = type(self)
+    return all(getattr(cls, name) is getattr(Decorator, name) for name in Decorator._INVOCATION)
+
+  def sampler(self, descriptor, sampling):
+    '''The Sampler for our calls of the function described by `descriptor`
+        or None if every call is recorded.
+
+      Args:
+        descriptor (FunctionDescriptor): The decorated function.
+        sampling (dict): sample, rate & first given to __call__().
+    '''
+    policy = Sampling.of(self.recorder.sampling, **sampling)
+    if policy is None or not self.samplable:
+      return None
+    sampler = Sampler(policy, self, descriptor, validating=self.mode == What.VALIDATE,
+                      per_strand=self.recorder.per_thread)
+    self.recorder.samplers.append(sampler)
+    return sampler
+
+  def expected(self, call):
+    '''On playback, was `call` of our function recorded by us?
+        It was if the next recorded tune is its tune. Functions are told
+        apart by module & qualname (see Tune.function), not by name.
+    '''
+    tune = self.recorder.recording_medium.track_manager.current_track.peek()
+    if tune is None or type(tune.device) is not type(self) or tune.function != self.descriptor.key:
+      return False
+    function = tune.notes.get('function', None)
+    return isinstance(function, dict) and function.get('call', None) == call
+
+  # Methods that a stackable Decorator must not override.
+  _INVOCATION = ('intro', 'outtro', 'pre_invoke', 'invoke', 'post_invoke', 'direct')
+
+  @staticmethod
+  def _undecorated(function):
+    return function
+
   def _baa(self, when, target, function, **moar):
     # Before/Around/After
 
+    if when != target and when != When.AROUND:
+      return
+
+    # Only some calls of a sampled function were recorded.
+    call = self.call
+    if call is not None and self.mode == What.VALIDATE and not self.expected(call):
+      return
+
     if when == target:
       notes = function(**moar)
-    elif when == When.AROUND:
-      notes = self.around(when=target, **moar)
     else:
-      return
+      notes = self.around(when=target, **moar)
+
+    function = notes.get('function', None) if isinstance(notes, dict) else None
+    if isinstance(function, dict):
+      # Our place in the call tree. See Frame.
+      frame = self._calls.current
+      if frame.parent is not None:
+        function['frame'] = frame.id
+        parent = frame.recorded_parent
+        if parent.id:
+          function['parent'] = parent.id
+        frame.recorded = True
+      if call is not None:
+        function['call'] = call
 
     # record the notes from the device when mode is RECORD
     # validate the notes from the device against the recorded notes when when mode is VALIDATE.
@@ -2,8 +2,10 @@
 import traceback
 
 from .decorator import Decorator
+from .stack import Stack
 
 from ..device import Device
+from ..what import What
 from ..when import When
 
 
@@ -58,26 +60,27 @@ class MethodException(Device):
         some_func(...): ...
     '''
 
-    self.function = function
-
-    def exception_wrapper(*args, **kwargs):
-      try:
-        return function(*args, **kwargs)
-      except Exception as original:
-        self.cls = original.__class__.__name__
-        self.message = str(original)
-        self.traceback = traceback.format_tb(original.__traceback__)
-        self.record(
-            when=When.EXCEPTION,
-            notes={
-                'class': self.cls,
-                'message': self.message,
-                'traceback': self.traceback
-            }
-        )
-        raise
-
-    return Decorator.wrap_if_necessary(self, self.function, exception_wrapper)
+    if self.mode == What.OFF:
+      return function
+
+    # We share a wrapper with any decorators stacked around us.
+    stack = Stack.push(self, function, When.EXCEPTION, {})
+    return stack.seal(Decorator.wrap_if_necessary(self, stack.function, stack.wrapper()))
+
+  def record_exception(self, original):
+    '''Record the exception `original` raised by our function.
+    '''
+    self.cls = original.__class__.__name__
+    self.message = str(original)
+    self.traceback = traceback.format_tb(original.__traceback__)
+    self.record(
+        when=When.EXCEPTION,
+        notes={
+            'class': self.cls,
+            'message': self.message,
+            'traceback': self.traceback
+        }
+    )
 
   def __eq__(self, other):
     return type(self) == type(other) and self.cls == other.cls and self.message == other.message
@@ -0,0 +1,134 @@
+
+import contextvars
+import threading
+import time
+
+from ..strand import running_loop
+
+
+class Frame:
+  '''A decorated call that is being recorded.
+
+    The Decorators of a function read the call's args, kwargs & rval (and
+    the number of the sampled call, see Sampler) from its Frame rather than
+    from themselves so that a call made while another call of the same
+    function is being recorded (e.g. - recursion) does not overwrite them.
+
+      args, kwargs : The call's arguments.
+      rval         : The call's return value once it has returned.
+      call         : The number of the call recorded by the Decorator that
+                     is recording. None unless it is sampled.
+      start        : time.perf_counter_ns() when the call began.
+      parent       : The Frame of the decorated call that made this call
+                     (a root Frame for the outermost calls).
+      id           : The number of the call among the thread's decorated
+                     calls. Recorded with each tune together with the id of
+                     the nearest ancestor that has recorded a tune (see
+                     recorded_parent) so that tunes can be placed in the
+                     call tree. The root Frame's id is 0 and its parent is
+                     None.
+      recorded     : Has a tune been recorded for the call?
+  '''
+
+  __slots__ = ('args', 'kwargs', 'rval', 'call', 'start', 'parent', 'id', 'recorded')
+
+  def __init__(self):
+    self.args = None
+    self.kwargs = None
+    self.rval = None
+    self.call = None
+    self.start = 0
+    self.parent = None
+    self.id = 0
+    self.recorded = False
+
+  @property
+  def recorded_parent(self):
+    '''Our nearest ancestor that has recorded a tune (or the root Frame).
+        A call that was not recorded (e.g. - it was sampled out) has no
+        tunes in which its children could be placed.
+    '''
+    parent = self.parent
+    while parent.id and not parent.recorded:
+      parent = parent.parent
+    return parent
+
+
+class Frames(threading.local):
+  '''The Frames of the decorated calls that a thread (or asyncio Task) is
+      in, innermost (`current`) first, and a pool of Frames for the next
+      ones.
+
+    The current Frame is a context variable so that each asyncio Task has
+    its own and a Task begins with the Frame of the call that created it as
+    its current Frame.
+
+    Frames are taken from the pool by push() and returned to it by pop() so
+    that recording a call does not allocate one. The pool holds at most
+    POOL_SIZE Frames. Deeper recursion allocates the Frames that it needs.
+    Frames that end on a thread that runs an event loop are not returned to
+    the pool since a Task that outlives the call may still refer to them.
+
+    Usage:
+
+      frame = FRAMES.push(args, kwargs)
+      try:
+        ...
+      finally:
+        FRAMES.pop(frame)
+  '''
+
+  POOL_SIZE = 64
+
+  def __init__(self):
+    super().__init__()
+    self.calls = 0
+    self._pool = []
+
+  @property
+  def current(self):
+    return _CURRENT.get()
+
+  def push(self, args, kwargs):
+    '''Begin the Frame of a call and make it `current`.
+    '''
+    pool = self._pool
+    frame = pool.pop() if pool else Frame()
+    frame.args = args
+    frame.kwargs = kwargs
+    frame.parent = _CURRENT.get()
+    frame.recorded = False
+    self.calls = frame.id = self.calls + 1
+    frame.start = time.perf_counter_ns()
+    _CURRENT.set(frame)
+    return frame
+
+  def pop(self, frame):
+    '''End `frame` (the `current` Frame) and return it to the pool.
+    '''
+    _CURRENT.set(frame.parent)
+    if running_loop() is not None:
+      return
+    # Do not keep the call's objects alive.
+    frame.args = frame.kwargs = frame.rval = frame.call = frame.parent = None
+    if len(self._pool) < Frames.POOL_SIZE:
+      self._pool.append(frame)
+
+  @staticmethod
+  def suspend(frame):
+    '''`frame`'s call (an async generator) is giving control back to its
+        caller. Its parent is current again until resume().
+    '''
+    _CURRENT.set(frame.parent)
+
+  @staticmethod
+  def resume(frame):
+    _CURRENT.set(frame)
+
+
+# The parent of the outermost calls.
+_ROOT = Frame()
+_CURRENT = contextvars.ContextVar('rekorder_frame', default=_ROOT)
+
+# Every thread's Frames.
+FRAMES = Frames()
@@ -1,4 +1,6 @@
 
+from functools import partial, wraps
+
 from ..device import DeviceManager
 from ..what import What
 from ..when import When
@@ -89,5 +91,15 @@ class MethodPassRecorder(MethodParameters):
     '''
     return self.function(self.recorder, *self.args, **self.kwargs)
 
-  def __call__(self, function):
-    return super().__call__(function=function, when=When.BEFORE)
+  def direct(self, function):
+    return partial(function, self.recorder)
+
+  def __call__(self, function=None, **sampling):
+    if function is None:
+      return lambda function: self(function, **sampling)
+
+    if self.mode == What.OFF:
+      # The function still expects to be given the recorder.
+      return wraps(function)(self.direct(function))
+
+    return super().__call__(function=function, when=When.BEFORE, **sampling)
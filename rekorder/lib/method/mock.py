@@ -17,6 +17,9 @@ class MethodMock(Decorator):
         def some_func(...):
   '''
 
+  # Every call must be recorded for it to be mocked on playback.
+  samplable = False
+
   def __eq__(self, other):
     '''Compare the attributes common between describe_playable_device() and describe_recordable_device()
     '''
@@ -29,7 +32,7 @@ class MethodMock(Decorator):
         return False
     if self._describe_function() != other._describe_function():
       return False
-    if self.rval != other.rval:
+    if self.played('rval') != other.played('rval'):
       return False
     return True
 
@@ -14,6 +14,7 @@ class MethodParameters(Decorator):
 
       Args:
         when (When):
+        sample, rate, first: Optional. Record only some calls. See Sampling.
 
       Usage:
 
@@ -22,6 +23,9 @@ class MethodParameters(Decorator):
 
         @rekorder.method.param(when=When.AROUND)
         def some_func(...):
+
+        @rekorder.method.param(sample=0.01)  # 1 in 100 calls
+        def some_func(...):
   '''
 
   def __eq__(self, other):
@@ -36,9 +40,9 @@ class MethodParameters(Decorator):
         return False
     if self._describe_function() != other._describe_function():
       return False
-    if self.args != other.args:
+    if self.played('args') != other.played('args'):
       return False
-    if self.kwargs != other.kwargs:
+    if self.played('kwargs') != other.played('kwargs'):
       return False
     return True
 
@@ -95,6 +99,6 @@ class MethodParameters(Decorator):
   def after(self):
     return self.before()
 
-  def __call__(self, function=None, *, when=When.BEFORE):
+  def __call__(self, function=None, *, when=When.BEFORE, **sampling):
     # Default to When.BEFORE (Decorator defaults to When.AROUND)
-    return super().__call__(function=function, when=when)
+    return super().__call__(function=function, when=when, **sampling)
@@ -13,6 +13,7 @@ class MethodRepository(Decorator):
       Args:
         when (When): Optional. Default is When.BEFORE.
         paths (list[str]): Optional. Default is ['.']
+        sample, rate, first: Optional. Record only some calls. See Sampling.
 
       Usage:
 
@@ -105,8 +106,8 @@ class MethodRepository(Decorator):
   def describe_playable_device(self):
     return self.describe_device()
 
-  def __call__(self, function=None, *, when=When.BEFORE, paths=['.']):
-    return super().__call__(function=function, when=when, paths=paths)
+  def __call__(self, function=None, *, when=When.BEFORE, paths=['.'], **sampling):
+    return super().__call__(function=function, when=when, paths=paths, **sampling)
 
   def __eq__(self, other):
     return type(self) == type(other) and self.repository_manager == other.repository_manager
@@ -11,12 +11,15 @@ class MethodReturn(Decorator):
       Method result is available as self.rval.
 
       Args:
-        None
+        sample, rate, first: Optional. Record only some calls. See Sampling.
 
       Usage:
 
         @rekorder.method.rval
         def some_func(...):
+
+        @rekorder.method.rval(first=1000)
+        def some_func(...):
   '''
 
   def __eq__(self, other):
@@ -31,7 +34,7 @@ class MethodReturn(Decorator):
         return False
     if self._describe_function() != other._describe_function():
       return False
-    if self.rval != other.rval:
+    if self.played('rval') != other.played('rval'):
       return False
     return True
 
@@ -64,6 +67,6 @@ class MethodReturn(Decorator):
     del(r['function']['kwargs'])
     return r
 
-  def __call__(self, function):
+  def __call__(self, function=None, **sampling):
     # rval only has meaning after a function's invocation
-    return super().__call__(function=function, when=When.AFTER)
+    return super().__call__(function=function, when=When.AFTER, **sampling)
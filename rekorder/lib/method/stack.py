@@ -0,0 +1,326 @@
+
+import inspect
+import time
+
+from ..function import FunctionDescriptor
+from ..governor import Detail
+from ..when import When
+from .frame import FRAMES
+
+_BEFORE = (When.BEFORE, When.AROUND)
+_AFTER = (When.AFTER, When.AROUND)
+
+
+class Stack:
+  '''Stacked decorators collapsed into a single wrapper.
+
+    Without a Stack, each decorator in:
+
+      @recorder.method.params(when=When.AROUND)
+      @recorder.method.rval
+      @recorder.method.exception
+      def some_func(...)
+
+    wraps the one below it so that every call goes through three wrappers.
+    Instead, a decorator that is given a function that is already wrapped by
+    a Stack joins (a copy of) that Stack. The Stack's single wrapper invokes
+    the function once and runs each decorator's before & after steps (and
+    records exceptions) in the order that the nested wrappers would have so
+    the same tunes are recorded in the same order.
+
+    The wrapper of a coroutine function is a coroutine function that records
+    what the coroutine returns (or raises) when it is awaited. The wrapper
+    of an async generator function is an async generator function that
+    records the items that it yielded once it is exhausted.
+
+    Only decorators that do not change how the function is invoked can join
+    a Stack (see Decorator.stackable()). Any other decorator wraps the
+    Stack's wrapper as usual and a new Stack may begin above it.
+  '''
+
+  @staticmethod
+  def push(device, function, when, moar, sampling=None):
+    '''Add `device` to the Stack that wraps `function` (or to a new one).
+        Returns the Stack. See wrapper() & seal().
+
+      Args:
+        device (Device): The new outermost decorator of the stack.
+        function (callable): What `device` is decorating.
+        when (When): When `device` records. When.EXCEPTION for a
+                     MethodException.
+        moar (dict): Extra kwargs for `device`'s before() / after().
+        sampling (dict): Optional. sample, rate & first given to `device`.
+                         See Decorator.sampler().
+    '''
+    stack = getattr(function, '_rekorder_stack', None)
+    # Other wrappers copy our attributes (functools.wraps) so make sure that
+    # `function` really is our wrapper.
+    if stack is not None and stack.wrapped is function and stack.recorder is device.recorder:
+      stack = Stack(stack.recorder, stack.function, stack.layers)
+    else:
+      stack = Stack(device.recorder, function, [])
+    device.function = stack.function
+    device.descriptor = stack.descriptor
+    sampler = device.sampler(stack.descriptor, sampling) if sampling is not None else None
+    stack.layers.insert(0, (device, when, moar, sampler))
+    return stack
+
+  def __init__(self, recorder, function, layers):
+    super().__init__()
+
+    self.recorder = recorder
+    # The function that is invoked. Every layer records it.
+    self.function = function
+    self.descriptor = FunctionDescriptor.of(function)
+    # (device, when, moar, sampler), outermost first.
+    self.layers = list(layers)
+    self.wrapped = None
+
+  def seal(self, wrapper):
+    '''Mark `wrapper` as ours so that decorators above it can join us.
+    '''
+    wrapper._rekorder_stack = self
+    self.wrapped = wrapper
+    return wrapper
+
+  def wrapper(self):
+    '''Build the function that replaces the decorated function.
+    '''
+    recorder = self.recorder
+    function = self.function
+
+    # (device, when, moar, before?, after?, exception?)
+    layers = tuple(
+        (device, when, moar, when in _BEFORE, when in _AFTER, when == When.EXCEPTION)
+        for device, when, moar, sampler in self.layers)
+    # What records while the recorder is not enabled (see Recorder.recording())
+    # or is counting (see Statistics).
+    paused = tuple(
+        layer for layer in layers
+        if not layer[5] and not getattr(layer[0], 'pausable', True))
+    # What the other layers count instead of recording.
+    statistics = recorder.statistics_of(self.descriptor) if len(paused) < len(layers) else None
+    # Sampled layers. See Sampling.
+    samplers = tuple(sampler for device, when, moar, sampler in self.layers)
+    sampled = any(samplers)
+    everything_sampled = all(samplers)
+    # Layers that record every call regardless of the Governor.
+    fixed = tuple(layer[5] or not getattr(layer[0], 'pausable', True) for layer in layers)
+    anything_fixed = any(fixed)
+    governed = recorder.governor.governed(self.descriptor) \
+        if recorder.governor and statistics else None
+    clock = time.perf_counter_ns
+
+    def admit():
+      '''Which layers record this call. Returns (active, counted, calls) or
+          None if the call is not recorded (nor counted). See stack().
+      '''
+      if not recorder.enabled:
+        return paused, None, None
+      if recorder.counting and statistics:
+        return paused, statistics, None
+      calls = None
+      if governed:
+        detail = governed.enter()
+        if detail is Detail.COUNT:
+          return paused, statistics, None
+        if detail is Detail.SAMPLE:
+          call = governed.admit()
+          if not call and not anything_fixed:
+            return None
+          calls = [None if f else call for f in fixed]
+      if sampled and calls is None:
+        calls = [sampler.admit() if sampler else None for sampler in samplers]
+        if everything_sampled and not any(calls):
+          return None
+      return layers, None, calls
+
+    def enter(active, calls, frame):
+      '''The before steps of the `active` layers, outermost first.
+      '''
+      # How deep we are in the equivalent nested wrappers. An exception is
+      # recorded by the exception layers above that depth.
+      depth = 0
+      try:
+        for depth, (device, when, moar, before, after, exception) in enumerate(active):
+          call = calls[depth] if calls else None
+          if exception or call == 0:
+            continue
+          frame.call = call
+          if before:
+            device._baa(when, When.BEFORE, device.before, **moar)
+      except Exception as original:
+        fail(active, depth, original)
+        raise
+
+    def leave(active, calls, frame):
+      '''The after steps of the `active` layers, innermost first.
+      '''
+      depth = len(active)
+      try:
+        for depth in range(len(active) - 1, -1, -1):
+          device, when, moar, before, after, exception = active[depth]
+          call = calls[depth] if calls else None
+          if exception or call == 0:
+            continue
+          frame.call = call
+          if after:
+            device._baa(when, When.AFTER, device.after, **moar)
+      except Exception as original:
+        fail(active, depth, original)
+        raise
+
+    def fail(active, depth, original):
+      '''Record `original` by the exception layers above `depth`.
+      '''
+      for n in range(depth - 1, -1, -1):
+        device, when, moar, before, after, exception = active[n]
+        if exception:
+          device.record_exception(original)
+
+    def stack(*args, **kwargs):
+
+      # Nothing records a call made while recording is disabled unless a
+      # layer is not pausable, so such a call must not pay for admit().
+      if not recorder.enabled and not paused:
+        return function(*args, **kwargs)
+
+      admitted = admit()
+      if admitted is None:
+        return function(*args, **kwargs)
+      active, counted, calls = admitted
+
+      if not active:
+        if counted:
+          return counted.invoke(function, args, kwargs)
+        return function(*args, **kwargs)
+
+      # What recording this call costs. See Governor.
+      start = clock() if governed else 0
+
+      # Every layer records this call from its Frame.
+      frame = FRAMES.push(args, kwargs)
+      try:
+        enter(active, calls, frame)
+
+        if governed:
+          governed.spent += clock() - start
+        try:
+          if counted:
+            rval = counted.invoke(function, args, kwargs)
+          else:
+            rval = function(*args, **kwargs)
+        except Exception as original:
+          fail(active, len(active), original)
+          raise
+        if governed:
+          start = clock()
+
+        frame.rval = rval
+        leave(active, calls, frame)
+
+        if governed:
+          governed.spent += clock() - start
+        return rval
+
+      finally:
+        FRAMES.pop(frame)
+
+    async def coroutine(*args, **kwargs):
+      # stack() for a coroutine function. The call's rval is what the
+      # coroutine returns. Each Task records its calls from its own Frames.
+
+      admitted = admit()
+      if admitted is None:
+        return await function(*args, **kwargs)
+      active, counted, calls = admitted
+
+      if not active:
+        if counted:
+          return await counted.ainvoke(function, args, kwargs)
+        return await function(*args, **kwargs)
+
+      start = clock() if governed else 0
+      frame = FRAMES.push(args, kwargs)
+      try:
+        enter(active, calls, frame)
+
+        if governed:
+          governed.spent += clock() - start
+        try:
+          if counted:
+            rval = await counted.ainvoke(function, args, kwargs)
+          else:
+            rval = await function(*args, **kwargs)
+        except Exception as original:
+          fail(active, len(active), original)
+          raise
+        if governed:
+          start = clock()
+
+        frame.rval = rval
+        leave(active, calls, frame)
+
+        if governed:
+          governed.spent += clock() - start
+        return rval
+
+      finally:
+        FRAMES.pop(frame)
+
+    async def generator(*args, **kwargs):
+      # stack() for an async generator function. The call's rval is the
+      # list of the items that it yielded. The caller's Frame is current
+      # while it has an item. Items are yielded as they are produced but
+      # values given to asend() are not passed on.
+
+      admitted = admit()
+      if admitted is None:
+        async for item in function(*args, **kwargs):
+          yield item
+        return
+      active, counted, calls = admitted
+
+      if not active:
+        # Only the calls are counted.
+        items = counted.invoke(function, args, kwargs) if counted else function(*args, **kwargs)
+        async for item in items:
+          yield item
+        return
+
+      start = clock() if governed else 0
+      frame = FRAMES.push(args, kwargs)
+      try:
+        enter(active, calls, frame)
+
+        if governed:
+          governed.spent += clock() - start
+        rval = []
+        try:
+          async for item in function(*args, **kwargs):
+            rval.append(item)
+            FRAMES.suspend(frame)
+            try:
+              yield item
+            finally:
+              FRAMES.resume(frame)
+        except Exception as original:
+          fail(active, len(active), original)
+          raise
+        if governed:
+          start = clock()
+
+        frame.rval = rval
+        leave(active, calls, frame)
+
+        if governed:
+          governed.spent += clock() - start
+
+      finally:
+        FRAMES.pop(frame)
+
+    if inspect.iscoroutinefunction(function):
+      return coroutine
+    if inspect.isasyncgenfunction(function):
+      return generator
+    return stack
@@ -2,9 +2,13 @@
 from .cassette import Cassette
 from .device import Device
 from .recorder.device import RecordingDevice
+from .summary import Summary
+from .track import TrackManager
+from .writer import Manifest
 from .what import What
 
 import importlib
+import threading
 
 
 class Player:
@@ -16,23 +20,67 @@ class Player:
 
   def describe(self):
     '''Describe a recording.
+        Tunes that were tagged with their thread (see ThreadBuffers) are
+        prefixed with its name and, in a merged cassette (see Shards), with
+        the id of their process. The tunes of decorated calls are indented
+        by their depth in the call tree (see Frame).
     '''
 
     for track in self._recording_medium.tracks:
+      if not len(track) and track.index > TrackManager.TITLES.index('trailer'):
+        # Only recordings that use them (e.g. - counting) have the tracks
+        # that follow the trailer.
+        continue
+
       print(track.title)
 
-      if not len(track.tunes):
+      if not len(track):
         print("  None")
         continue
 
-      for tune in track.tunes:
-        print("  {}".format(tune.device))
+      # (process, thread, frame id) -> depth
+      depths = {}
+
+      for tune in track:
+        indent = "  " * Player._depth(tune, depths)
+        tags = ' '.join(str(tag) for tag in (tune.process, tune.thread) if tag is not None)
+        if tune.thread is None or track.validates(tune.thread):
+          print("  {}{}{}".format(indent, "[{}] ".format(tags) if tags else '', tune.device))
 
         if isinstance(tune.device, RecordingDevice):
           if self._recording_medium.recorder:
             raise Exception("Too many recorders")
           self._recording_medium.recorder = tune.device
 
+  @staticmethod
+  def _depth(tune, depths):
+    '''The depth of `tune`'s call below the outermost recorded call.
+    '''
+    function = tune.notes.get('function', None) if isinstance(tune.notes, dict) else None
+    if not isinstance(function, dict) or 'frame' not in function:
+      return 0
+    parent = depths.get((tune.process, tune.thread, function.get('parent', None)), -1)
+    depth = depths[(tune.process, tune.thread, function['frame'])] = parent + 1
+    return depth
+
+  @staticmethod
+  def describe_summary(input):
+    '''Describe a recording from the Summary saved while it was recorded.
+        None of the recording itself is read.
+    '''
+
+    manifest = Manifest.find(input)
+
+    for path in manifest.paths() if manifest else [input]:
+      summary = Summary.load(path)
+      if not summary:
+        raise Exception("No summary for [{}]. Expected [{}].".format(path, Summary.sidecar(path)))
+
+      if manifest:
+        print("segment [{}]".format(path))
+      for line in summary.describe():
+        print(line)
+
   def playback(self):
     '''Play back a recording.
     '''
@@ -58,7 +106,9 @@ class Player:
 
     rval = None
 
-    for tune in track.tunes:
+    for tune in track:
+      if not track.plays(tune):
+        continue
       print("  {}".format(tune.device))
 
       if isinstance(tune.device, RecordingDevice):
@@ -93,7 +143,20 @@ class Player:
     # to the 'exit' track and validating the application's exit which then
     # puts us on the 'trailer' track.
 
-    rval = tune.playback(rval=rval)
+    # A thread that fails validation only fails itself. Its failure is
+    # collected (see Cassette.failed()) and raised when the entry point
+    # returns.
+    excepthook = threading.excepthook
+
+    def failed(args):
+      self._recording_medium.failed(args.exc_value)
+      excepthook(args)
+
+    threading.excepthook = failed
+    try:
+      rval = tune.playback(rval=rval, validated=self._recording_medium.validated)
+    finally:
+      threading.excepthook = excepthook
 
     track = self._recording_medium.track_manager.tracks.current_track
     assert track.title == 'trailer'
@@ -107,7 +170,9 @@ class Player:
     track = self._recording_medium.track_manager.tracks.current_track
     assert track.title == 'trailer'
 
-    for tune in track.tunes:
+    for tune in track:
+      if not track.plays(tune):
+        continue
       print("  {}".format(tune.device))
       rval = tune.playback(rval=rval)
 
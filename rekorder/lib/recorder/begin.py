@@ -1,4 +1,7 @@
 
+import asyncio
+import inspect
+
 from .. import util
 from ..method import MethodParameters
 from ..when import When
@@ -22,6 +25,10 @@ class RecordingBegin(MethodParameters):
         def some_func(...):
   '''
 
+  # A recording always has its entry and exit. See Recorder.recording().
+  pausable = False
+  samplable = False
+
   # Device
 
   def describe_device(self):
@@ -29,12 +36,21 @@ class RecordingBegin(MethodParameters):
       return super().describe_device() + " @ [{}]".format(self.timestamp.localtime)
     return super().describe_device()
 
-  def playback(self, *args, **kwargs):
+  def playback(self, *args, validated=None, **kwargs):
+    '''Invoke the recorded entry point.
+        `validated` (see Cassette.validated()) raises the failures of the
+        threads that did not fail the entry point itself.
+    '''
     print("** Beginning playback")
     f = util.load_function(self.function)
     args = self.function['args']
     kwargs = self.function['kwargs']
     r = f(*args, **kwargs)
+    if inspect.iscoroutine(r):
+      # The recording began with a coroutine. Run it as asyncio.run() did.
+      r = asyncio.run(r)
+    if validated:
+      validated()
     print("** Playback complete")
     return r
 
@@ -16,6 +16,9 @@ class CliState(Device):
     '''
     self.sys_argv = kwargs['argv']
 
+  def _init_describable(self, *args, **kwargs):
+    self._init_playable(*args, **kwargs)
+
   def describe_playable_device(self):
     r = "{} {}".format(
         self.__class__.__name__,
@@ -1,5 +1,7 @@
 
 from ..device import Device
+from ..governor import Governor
+from ..sampling import Sampling
 from ..when import When
 
 
@@ -10,17 +12,45 @@ class RecordingDevice(Device):
   @staticmethod
   def playback_instance(cls, *args, **kwargs):
     from . import Recorder
+    if 'sampling' in kwargs:
+      kwargs['sampling'] = Sampling.playback_instance(kwargs['sampling'])
+    if 'governor' in kwargs:
+      kwargs['governor'] = Governor.playback_instance(kwargs['governor'])
     return RecordingDevice(recorder=Recorder.get_recorder(*args, **kwargs))
 
   def describe_device(self):
-    return "{} name=[{}] mode=[{}]".format(
+    r = "{} name=[{}] mode=[{}]".format(
         self.recorder.__class__.__name__, self.recorder.name, self.mode)
+    if self.recorder.sampling:
+      r = r + " sampling=[{}]".format(self.recorder.sampling)
+    if not self.recorder.enabled:
+      r = r + " paused"
+    if self.recorder.counting:
+      r = r + " counting"
+    if self.recorder.governor:
+      r = r + " governor=[{}]".format(self.recorder.governor)
+    if self.recorder.per_thread:
+      r = r + " per_thread"
+    return r
 
   def playback(self, *args, rval, **kwargs):
     return rval
 
   def record(self):
-    super().record(notes={'name': self.recorder.name}, when=When.NA)
+    notes = {'name': self.recorder.name}
+    if self.recorder.sampling:
+      notes['sampling'] = self.recorder.sampling
+    if not self.recorder.enabled:
+      # Playback begins paused too. See Recorder.recording().
+      notes['enabled'] = False
+    if self.recorder.counting:
+      notes['counting'] = True
+    if self.recorder.governor:
+      notes['governor'] = Governor.recordable_data(self.recorder.governor)
+    if self.recorder.per_thread:
+      # Sampled calls are numbered per thread. See Sampler.
+      notes['per_thread'] = True
+    super().record(notes=notes, when=When.NA)
 
   def recordable(self, track_title):
     '''A Recorder can only record its information to the header track.
@@ -2,6 +2,8 @@
 from ..method import MethodReturn
 from ..what import What
 
+from .sampling import SamplingReport
+
 
 class RecordingEnd(MethodReturn):
   '''Declare the end of a recording.
@@ -20,6 +22,10 @@ class RecordingEnd(MethodReturn):
         def some_func(...):
   '''
 
+  # A recording always has its entry and exit. See Recorder.recording().
+  pausable = False
+  samplable = False
+
   # Device
 
   def describe_device(self):
@@ -43,6 +49,12 @@ class RecordingEnd(MethodReturn):
 
     self.recorder.recording_medium.track_manager.set_track('trailer')
 
+    if self.recorder.samplers:
+      SamplingReport(recorder=self.recorder).record()
+
+    # Whatever the FlushPolicy, a completed recording is written out.
+    self.recorder.recording_medium.flush()
+
   def validate(self, *args, **kwargs):
     super().validate(*args, **kwargs)
     self.recorder.recording_medium.track_manager.set_track('trailer')
@@ -0,0 +1,55 @@
+
+from ..device import Device
+from ..governor import Detail
+from ..when import When
+
+
+class GovernorStep(Device):
+  '''A function's Detail was changed by the Governor.
+      Recorded on the 'recording' track before the next tune. `at` is the
+      number of the governed call (of any function) that it applies from.
+  '''
+
+  def _init_recordable(self, *args, **kwargs):
+    super()._init_recordable(*args, **kwargs)
+    governed = kwargs['governed']
+    self.key = governed.descriptor.key
+    self.notes = {
+        'function': {'id': governed.descriptor},
+        'previous': kwargs['previous'].name,
+        'detail': governed.detail.name,
+        'overhead': kwargs['overhead'],
+        'at': kwargs['at'],
+    }
+    self.previous = kwargs['previous']
+    self.detail = governed.detail
+    self.overhead = kwargs['overhead']
+    self.at = kwargs['at']
+
+  def _init_playable(self, *args, **kwargs):
+    '''kwargs is our recorded tune's notes.
+        See record()
+    '''
+    function = kwargs['function']
+    self.key = '{}.{}'.format(function['module'], function['qualname'])
+    self.previous = Detail[kwargs['previous']]
+    self.detail = Detail[kwargs['detail']]
+    self.overhead = kwargs['overhead']
+    self.at = kwargs['at']
+
+  def _init_describable(self, *args, **kwargs):
+    self._init_playable(*args, **kwargs)
+
+  def describe_playable_device(self):
+    return "{} {} [{}] -> [{}] overhead [{:.1%}] at call [{}]".format(
+        self.__class__.__name__, self.key, self.previous.name, self.detail.name,
+        self.overhead, self.at)
+
+  def describe_recordable_device(self):
+    return self.describe_playable_device()
+
+  def playback(self, *args, rval, **kwargs):
+    return rval
+
+  def record(self):
+    super().record(notes=self.notes, when=When.NA)
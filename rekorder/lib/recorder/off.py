@@ -0,0 +1,14 @@
+
+class Off:
+  '''Stands in for the things a Recorder hands out (e.g. -
+      recorder.repository_manager) when its mode is What.OFF.
+
+    Every attribute is a method that does nothing and returns None.
+  '''
+
+  def __getattr__(self, name):
+    return Off._nothing
+
+  @staticmethod
+  def _nothing(*args, **kwargs):
+    return None
@@ -1,15 +1,23 @@
 
+import atexit
+import contextlib
 import copy
+import os
 import sys
 
 from .cli_state import CliState
 from .device import RecordingDevice
 from .manager import RecordingManager
+from .off import Off
+from .statistics import FunctionStatistics
 
 from ..cassette import Cassette
 from ..device import DeviceManager
 from ..method import Method
 from ..repository import RepositoryManager
+from ..serializer import Serializers
+from ..snapshot import Snapshot
+from ..statistics import Statistics
 from ..tune import Tune
 from ..what import What
 from ..when import When
@@ -58,18 +66,82 @@ class Recorder(DeviceManager):
         @rekorder.method...
         @rekorder.method...
         def  some_func(...)
+
+    Turning recording off:
+
+      A Recorder that is not given a `mode` takes it from the REKORDER_MODE
+      environment variable (see MODES):
+
+        REKORDER_MODE=off     What.OFF. The decorators return the function
+                              they decorate so they cost nothing when it is
+                              called. Nothing is written.
+        REKORDER_MODE=paused  What.RECORD but the decorators only record
+                              while recording is enabled (see recording()).
+        REKORDER_MODE=count   What.RECORD but the decorators only count
+                              their calls. See `counting`.
+        REKORDER_MODE=record  What.RECORD. The default.
+
+    Counting:
+
+      A Recorder that is `counting` records the header, entry, exit and
+      trailer as usual but the method decorators only update the
+      Statistics of the functions they decorate. The Statistics are
+      recorded on the 'statistics' track at exit (or when the Cassette is
+      closed), after anything recorded on the trailer.
+
+    Threads:
+
+      Decorated functions may be called from any thread. Tunes are written
+      one at a time under a lock unless the Recorder is given
+      `per_thread=True`: each thread then buffers its own tunes which are
+      tagged with the thread's name and merged in the order in which they
+      were recorded (see ThreadBuffers). On playback each thread validates
+      the tunes recorded by the thread of the same name and a thread that
+      fails validation fails the playback (see Cassette.failed()). Sampled
+      calls are then numbered per thread (see Sampler). A Governor cannot
+      be combined with `per_thread`: its steps are taken for every thread
+      at once and could not be replayed.
+
+    Asyncio:
+
+      Coroutine functions and async generator functions may be decorated.
+      What a coroutine returns (or raises) is recorded when it is awaited.
+      Each Task records its calls from Frames of its own (see Frame).
+      Once a tune is recorded from within an event loop the Cassette's
+      output is written from a thread of its own (see LoopSink) and every
+      tune is tagged with the thread & Task that recorded it so that each
+      Task validates its own tunes on playback (see strand()). A recording
+      that begins with a coroutine is played back with asyncio.run().
+
+    Processes:
+
+      A process forked while recording records to a shard of the output
+      (see Shards). `rekorder merge` combines the output and its shards.
   '''
 
   __recorders = {}
 
+  # Environment variable from which Recorders that are not given a mode
+  # take it.
+  MODE_VARIABLE = 'REKORDER_MODE'
+  # REKORDER_MODE -> (mode, enabled, counting)
+  MODES = {
+      'record': (What.RECORD, True, False),
+      'paused': (What.RECORD, False, False),
+      'count': (What.RECORD, True, True),
+      'off': (What.OFF, False, False),
+  }
+
   @staticmethod
   def get_recorder(*args, name, **kwargs):
     '''Recorder instance factory.
 
       Args:
         name (str): Name of the Recorder. Will create new if necessary.
-        mode (What): rekorder.What.RECORD (default) or rekorder.What.PLAYBACK.
-        *args / **kwargs: Passed to Cassette() along with `mode`.
+        mode (What): rekorder.What.RECORD (default), rekorder.What.PLAYBACK
+                     or rekorder.What.OFF. See REKORDER_MODE.
+        *args / **kwargs: Passed to Cassette() along with `mode`
+                           (e.g. - output, background, flush_policy).
     '''
     if name not in Recorder.__recorders:
       Recorder(*args, name=name, **kwargs)
@@ -84,15 +156,55 @@ class Recorder(DeviceManager):
 
       Args:
         name (str): Name of the Recorder. Will create new if necessary.
-        mode (What): rekorder.What.RECORD (default) or rekorder.What.PLAYBACK.
+        mode (What): Optional. rekorder.What.RECORD, rekorder.What.PLAYBACK
+                     or rekorder.What.OFF. Default is taken from
+                     REKORDER_MODE (What.RECORD if it is not set).
+        enabled (bool): Optional. Are the method decorators recording?
+                        See recording(). Default is True unless
+                        REKORDER_MODE=paused.
+        snapshot (Snapshot): How tunes protect their notes from later
+                             changes. Default is Snapshot.DEEPCOPY.
+        sampling (Sampling): Optional. Which calls the method decorators
+                             record unless they are given their own
+                             policy. Default is every call.
+        counting (bool): Optional. Count calls instead of recording them.
+                         See Statistics. Default is False unless
+                         REKORDER_MODE=count.
+        governor (Governor): Optional. Limits the time spent recording by
+                             recording less of the functions that cost
+                             the most.
+        per_thread (bool): Optional. Each thread buffers its own tunes.
+                           See Threads.
         *args / **kwargs: Passed to Cassette() along with `mode`.
     '''
     super().__init__()
 
     self.debug = False
-
-    self.mode = kwargs.get('mode', What.RECORD)
+    self.snapshot = kwargs.pop('snapshot', Snapshot.DEEPCOPY)
+    self.sampling = kwargs.pop('sampling', None)
+    # Every Sampler created by our decorators. See SamplingReport.
+    self.samplers = []
+    self.serializers = Serializers()
+
+    mode, enabled, counting = Recorder.environment_mode()
+    if 'mode' in kwargs:
+      mode, enabled, counting = kwargs['mode'], kwargs['mode'] != What.OFF, False
+
+    self.mode = mode
+    self.enabled = kwargs.pop('enabled', enabled)
+    self.counting = kwargs.pop('counting', counting)
+    # FunctionDescriptor.id -> Statistics. See statistics_of().
+    self.statistics = {}
+    self._statistics_recorded = False
+    self.governor = kwargs.pop('governor', None)
+    if self.governor:
+      self.governor.recorder = self
+    # Also given to our Cassette.
+    self.per_thread = kwargs.get('per_thread', False)
+    if self.governor and self.per_thread:
+      raise Exception("A Governor cannot be combined with per_thread. Use Sampling instead.")
     self.name = kwargs['name']
+    self.recording_medium = None
 
     if self.mode == What.RECORD:  # Record mode
 
@@ -111,12 +223,20 @@ class Recorder(DeviceManager):
 
       CliState(recorder=self).record()
 
+      if self.counting or self.governor:
+        # Registered after our Cassette's Writer so that it runs first.
+        atexit.register(self.record_statistics)
+
     elif self.mode == What.DESCRIBE:
       pass
 
     elif self.mode == What.PLAYBACK:
       pass
 
+    elif self.mode == What.OFF:
+      # Nothing is recorded. The decorators leave their functions alone.
+      self.enabled = False
+
     elif self.mode == What.VALIDATE:
       # Recorder should be created in RECORD, DESCRIBE or PLAYBACK mode.
       # The Player will change the Recorder's mode to VALIDATE at the appropriate time.
@@ -130,6 +250,93 @@ class Recorder(DeviceManager):
     # Add ourselves to the dict of named recorders
     Recorder.__save_recorder(self)
 
+  @staticmethod
+  def environment_mode():
+    '''The (mode, enabled, counting) selected by REKORDER_MODE.
+    '''
+    value = os.environ.get(Recorder.MODE_VARIABLE, 'record').lower()
+    if value not in Recorder.MODES:
+      raise Exception("Unknown {} [{}]. Expected one of {}.".format(
+          Recorder.MODE_VARIABLE, value, list(Recorder.MODES)))
+    return Recorder.MODES[value]
+
+  @contextlib.contextmanager
+  def recording(self, enabled=True):
+    '''Enable (or disable) recording by the method decorators for the
+        duration of a `with` block.
+
+        While recording is disabled decorated functions are called directly
+        and nothing is recorded for them. @recorder.begin and @recorder.end
+        always record so that the cassette can be described.
+
+        Whether the Recorder began enabled is recorded in the header and
+        playback begins the same way so the same `with` blocks enable (and
+        disable) the recording of the same calls on playback. Only the calls
+        made while recording was enabled are validated. A recording whose
+        enabled state was changed by anything that does not happen the same
+        way on playback (e.g. - a signal, a timer or `recorder.enabled`
+        being set by another thread) can only be described.
+
+        Has no effect in What.OFF mode since there is nothing to enable.
+
+      Usage:
+
+        recorder = Recorder.get_recorder(..., enabled=False)
+
+        with recorder.recording():
+          some_func(...)  # Recorded
+        some_func(...)    # Not recorded
+    '''
+    was = self.enabled
+    self.enabled = enabled and self.mode != What.OFF
+    try:
+      yield self
+    finally:
+      self.enabled = was
+
+  def serializer(self, cls):
+    '''Register a function that converts values of type `cls` into
+        something that can be recorded. See Serializers.
+
+      Usage:
+
+        @recorder.serializer(MyType)
+        def my_type(value):
+          return {'name': value.name}
+    '''
+    def register(handler):
+      self.serializers.register(cls, handler)
+      return handler
+    return register
+
+  def statistics_of(self, descriptor):
+    '''The Statistics of the function described by `descriptor`.
+    '''
+    statistics = self.statistics.get(descriptor.id, None)
+    if statistics is None:
+      statistics = self.statistics[descriptor.id] = Statistics(descriptor)
+    return statistics
+
+  def record_statistics(self):
+    '''Record the Statistics of every function that was called while we
+        were counting (or the Governor had it counted) on the 'statistics'
+        track. Only done once, at exit or by Cassette.close(), so that
+        Devices can still record on the trailer after @recorder.end.
+    '''
+    if self.mode != What.RECORD or self._statistics_recorded:
+      return
+    self._statistics_recorded = True
+    atexit.unregister(self.record_statistics)
+
+    called = [statistics for statistics in self.statistics.values() if statistics.calls]
+    if not called:
+      return
+
+    self.recording_medium.track_manager.set_track('statistics')
+    for statistics in called:
+      FunctionStatistics(recorder=self, statistics=statistics).record()
+    self.recording_medium.flush()
+
   def record(self, tune):
     '''Record a tune on a recording_medium for later playback.
 
@@ -187,5 +394,8 @@ class Recorder(DeviceManager):
         or more repositories before and/or after method invocation.
 
         A new RepositoryManager is created on each call to repository_manager.
+        With What.OFF it does nothing.
     '''
+    if self.mode == What.OFF:
+      return Off()
     return RepositoryManager(recorder=self)
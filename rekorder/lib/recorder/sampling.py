@@ -0,0 +1,43 @@
+
+from ..device import Device
+from ..sampling import Sampling
+from ..when import When
+
+
+class SamplingReport(Device):
+  '''The calls of each sampled function that were recorded & skipped.
+      RecordingEnd records it on the trailer if any function was sampled.
+      See Sampling.
+  '''
+
+  def _init_recordable(self, *args, **kwargs):
+    super()._init_recordable(*args, **kwargs)
+    self.sampled = [sampler.entry for sampler in self.recorder.samplers]
+
+  def _init_playable(self, *args, **kwargs):
+    '''kwargs is our recorded tune's notes.
+        See record()
+    '''
+    self.sampled = kwargs['sampled']
+
+  def _init_describable(self, *args, **kwargs):
+    self._init_playable(*args, **kwargs)
+
+  def describe_playable_device(self):
+    return "{} {}".format(self.__class__.__name__, ''.join(
+        "\n    {} {} recorded [{}] of [{}] calls {}".format(
+            entry['device'], entry['function'], entry['recorded'], entry['calls'],
+            Sampling.playback_instance(entry['policy']))
+        for entry in self.sampled))
+
+  def describe_recordable_device(self):
+    return self.describe_playable_device()
+
+  def playback(self, *args, rval, **kwargs):
+    return rval
+
+  def record(self):
+    super().record(notes={'sampled': self.sampled}, when=When.NA)
+
+  def recordable(self, track_title):
+    return track_title == 'trailer'
@@ -0,0 +1,53 @@
+
+from ..device import Device
+from ..when import When
+
+
+class FunctionStatistics(Device):
+  '''The Statistics of a function that was called while the Recorder was
+      counting. One is recorded on the 'statistics' track for each function.
+      See Recorder.record_statistics().
+  '''
+
+  def _init_recordable(self, *args, **kwargs):
+    super()._init_recordable(*args, **kwargs)
+    self.statistics = kwargs['statistics']
+    self.notes = self.statistics.notes
+
+  def _init_playable(self, *args, **kwargs):
+    '''kwargs is our recorded tune's notes.
+        See record()
+    '''
+    self.notes = {name: kwargs[name] for name in
+                  ('function', 'calls', 'exceptions', 'duration', 'arg_bytes', 'rval_bytes')}
+
+  def _init_describable(self, *args, **kwargs):
+    self._init_playable(*args, **kwargs)
+
+  def describe_playable_device(self):
+    function = self.notes['function']
+    duration = self.notes['duration']
+    calls = self.notes['calls']
+    r = "{} {}.{} calls [{}] exceptions [{}] mean [{:.0f} ns] min [{} ns] max [{} ns]".format(
+        self.__class__.__name__,
+        function['module'], function['qualname'],
+        calls,
+        sum(self.notes['exceptions'].values()),
+        duration['total'] / calls if calls else 0,
+        duration['min'], duration['max'])
+    for name, count in sorted(self.notes['exceptions'].items()):
+      r = r + "\n    {} [{}]".format(name, count)
+    return r
+
+  def describe_recordable_device(self):
+    descriptor = self.statistics.descriptor
+    return "{} {} calls [{}]".format(self.__class__.__name__, descriptor.key, self.statistics.calls)
+
+  def playback(self, *args, rval, **kwargs):
+    return rval
+
+  def record(self):
+    super().record(notes=self.notes, when=When.NA)
+
+  def recordable(self, track_title):
+    return track_title == 'statistics'
@@ -0,0 +1,165 @@
+
+import time
+
+from .strand import strand
+
+
+class Sampling:
+  '''Which calls of a decorated function are recorded.
+
+    Any combination of:
+
+      sample (float): Record 1 in round(1 / sample) calls.
+                      e.g. - 0.01 records the 1st, 101st, 201st... call.
+      rate (float): Record at most `rate` calls per second.
+      first (int): Record only the first `first` calls.
+
+    A call is recorded only if every given limit allows it. The before &
+    after tunes of a call are recorded (or skipped) together. Skipping a
+    call costs a counter increment.
+
+    A policy can be given to any Decorator (it applies to that decorator's
+    tunes only) or to the Recorder (it applies to every Decorator that is
+    not given one). @recorder.begin, @recorder.end, @recorder.method.mock
+    and @recorder.method.exception are never sampled.
+
+    The tunes of a sampled function carry the number of the call that they
+    recorded (notes['function']['call']). On playback, a sampled decorator
+    validates only the calls that were recorded. The Recorder's policy is
+    recorded in the header and the calls recorded & skipped for each
+    sampled function in the trailer (see SamplingReport).
+
+    A Recorder given `per_thread=True` numbers the calls of each strand
+    (thread or asyncio Task, see strand()) on their own, and applies
+    `first` to each, so that the calls validated by a strand on playback
+    are those that it recorded however the strands were interleaved.
+
+    Usage:
+
+      @recorder.method.params(sample=0.01)
+      def hot_helper(...)
+
+      @recorder.method.rval(rate=100, first=10000)
+      def other_helper(...)
+
+      recorder = Recorder.get_recorder(..., sampling=Sampling(sample=0.1))
+  '''
+
+  __slots__ = ('sample', 'rate', 'first', 'every')
+
+  @staticmethod
+  def playback_instance(data, *args, **kwargs):
+    return Sampling(**data)
+
+  @staticmethod
+  def recordable_data(obj):
+    return {name: getattr(obj, name) for name in ('sample', 'rate', 'first')
+            if getattr(obj, name) is not None}
+
+  @staticmethod
+  def of(default, sample=None, rate=None, first=None):
+    '''The policy given to a Decorator or `default` if it was not given one.
+    '''
+    if sample is None and rate is None and first is None:
+      return default
+    return Sampling(sample=sample, rate=rate, first=first)
+
+  def __init__(self, sample=None, rate=None, first=None):
+    super().__init__()
+
+    if sample is not None and not 0 < sample <= 1:
+      raise Exception("Sampling sample must be > 0 and <= 1. Got [{}].".format(sample))
+    if rate is not None and rate <= 0:
+      raise Exception("Sampling rate must be > 0. Got [{}].".format(rate))
+    if first is not None and first < 0:
+      raise Exception("Sampling first must be >= 0. Got [{}].".format(first))
+
+    self.sample = sample
+    self.rate = rate
+    self.first = first
+    # Record every n'th call.
+    self.every = max(1, round(1 / sample)) if sample else 1
+
+  def __repr__(self):
+    return "Sampling({})".format(', '.join(
+        "{}={}".format(name, value) for name, value in Sampling.recordable_data(self).items()))
+
+
+class Sampler:
+  '''Counts the calls of one function through one Decorator and decides
+      which of them are recorded. See Sampling.
+  '''
+
+  __slots__ = ('policy', 'device', 'descriptor', 'calls', 'recorded', 'validating',
+               '_every', '_first', '_rate', '_window', '_in_window', '_strands')
+
+  def __init__(self, policy, device, descriptor, validating=False, per_strand=False):
+    '''Construct the Sampler.
+
+      Args:
+        policy (Sampling): Which calls to record.
+        device (Decorator): The decorator whose tunes are sampled.
+        descriptor (FunctionDescriptor): The decorated function.
+        validating (bool): On playback the recording decides which calls
+                           are validated. Every call is admitted.
+        per_strand (bool): Number the calls of each strand on their own.
+    '''
+    super().__init__()
+
+    self.policy = policy
+    self.device = device
+    self.descriptor = descriptor
+    self.calls = 0
+    self.recorded = 0
+    self.validating = validating
+
+    self._every = policy.every
+    self._first = policy.first if policy.first is not None else float('inf')
+    self._rate = policy.rate
+    self._window = 0.0
+    self._in_window = 0
+    # Strand -> its calls. None unless per_strand.
+    self._strands = {} if per_strand else None
+
+  def admit(self):
+    '''Count a call.
+        Returns its number (from 1) if it is recorded, otherwise 0.
+    '''
+    self.calls = calls = self.calls + 1
+    if self._strands is not None:
+      # Only the strand called `name` counts its calls.
+      name = strand()
+      self._strands[name] = calls = self._strands.get(name, 0) + 1
+    if self.validating:
+      return calls
+
+    if calls > self._first or (calls - 1) % self._every:
+      return 0
+
+    if self._rate:
+      now = time.monotonic()
+      if now - self._window >= 1.0:
+        self._window, self._in_window = now, 0
+      if self._in_window >= self._rate:
+        return 0
+      self._in_window += 1
+
+    self.recorded += 1
+    return calls
+
+  @property
+  def skipped(self):
+    return self.calls - self.recorded
+
+  @property
+  def entry(self):
+    '''Our entry in the SamplingReport.
+    '''
+    return {
+        'device': self.device.__class__.__name__,
+        'function': self.descriptor.key,
+        'policy': Sampling.recordable_data(self.policy),
+        'calls': self.calls,
+        'recorded': self.recorded,
+        'skipped': self.skipped,
+    }
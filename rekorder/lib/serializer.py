@@ -0,0 +1,123 @@
+
+import dataclasses
+import datetime
+import decimal
+import enum
+import pathlib
+import uuid
+
+
+class Serializers:
+  '''Convert values that a RecordingMedium cannot record by itself into
+      values that it can.
+
+    A RecordingMedium records None, bool, int, float, str, bytes, dicts,
+    lists & tuples itself. Whenever it finds a value of any other type, at
+    any depth within a tune, it asks its Serializers to convert it. The
+    result is recorded in place of the value (and may itself contain values
+    that need to be converted).
+
+    Each type has a handler. Handlers are found by exact type with a single
+    dict lookup. The handler for a type seen for the first time is resolved
+    (in this order: registered handlers for the type or a base class,
+    recordable_data(), the built in handlers, dataclasses, str()) and
+    cached.
+
+    Built in handlers:
+      dict, list, tuple, str,
+      int, float                  : the base type (derived classes only)
+      set, frozenset              : list (sorted if possible)
+      bytearray, memoryview       : bytes
+      Enum                        : str() e.g. - 'Color.RED'
+      datetime, date, time        : isoformat()
+      timedelta                   : total_seconds()
+      Decimal, UUID, PurePath     : str()
+      dataclasses                 : dict of fields
+      anything else               : str()
+
+    Handlers are not consulted for the types that the medium records by
+    itself. Classes derived from them are recorded as the type they derive
+    from (e.g. - an OrderedDict as a dict and an IntEnum as an int).
+
+    Usage:
+
+      @recorder.serializer(MyType)
+      def my_type(value):
+        return {'name': value.name, 'size': value.size}
+  '''
+
+  def __init__(self):
+    super().__init__()
+    # Registered handlers. Type -> handler.
+    self._handlers = {}
+    # Resolved handlers. Exact type -> handler.
+    self._cache = {}
+
+  def register(self, cls, handler):
+    '''Convert values of type `cls` (and of classes derived from it) with
+        `handler(value)`. The result must not be another `cls`.
+    '''
+    self._handlers[cls] = handler
+    self._cache.clear()
+
+  def __call__(self, value):
+    cls = type(value)
+    handler = self._cache.get(cls, None)
+    if handler is None:
+      handler = self._cache[cls] = self._resolve(cls)
+    return handler(value)
+
+  def _resolve(self, cls):
+    '''Find the handler for values of type `cls`.
+    '''
+    for base in cls.__mro__:
+      if base in self._handlers:
+        return self._handlers[base]
+
+    if hasattr(cls, 'recordable_data'):
+      return cls.recordable_data
+
+    for base in cls.__mro__:
+      if base in BUILT_IN:
+        return BUILT_IN[base]
+
+    if dataclasses.is_dataclass(cls):
+      return _dataclass
+
+    return str
+
+
+def _set(value):
+  try:
+    return sorted(value)
+  except TypeError:
+    return list(value)
+
+
+def _dataclass(value):
+  return {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+
+
+# Handlers for types derived from these are found through the MRO.
+BUILT_IN = {
+    dict: dict,
+    list: list,
+    tuple: list,
+    str: str,
+    int: int,
+    float: float,
+    set: _set,
+    frozenset: _set,
+    bytearray: bytes,
+    memoryview: bytes,
+    enum.Enum: str,
+    datetime.date: lambda value: value.isoformat(),  # Includes datetime
+    datetime.time: lambda value: value.isoformat(),
+    datetime.timedelta: lambda value: value.total_seconds(),
+    decimal.Decimal: str,
+    uuid.UUID: str,
+    pathlib.PurePath: str,
+}
+
+# Used when a RecordingMedium is not given any Serializers.
+DEFAULT = Serializers()
@@ -0,0 +1,19 @@
+from enum import Enum
+
+
+class Snapshot(Enum):
+  '''How does a Tune protect its notes from changes made after it is
+      recorded? (e.g. - a function that modifies the list it was given)
+
+    DEEPCOPY : copy.deepcopy() the notes. Compatible with everything.
+    ENCODE   : Encode the notes in the format of the Cassette as soon as the
+               Tune is created and keep only the encoded data. The encoded
+               notes are copied directly into the output when the Tune is
+               written. Far cheaper than DEEPCOPY for large arguments.
+
+    Usage:
+
+      recorder = Recorder.get_recorder(..., snapshot=Snapshot.ENCODE)
+  '''
+  DEEPCOPY = 401
+  ENCODE = 402
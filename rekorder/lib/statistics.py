@@ -0,0 +1,129 @@
+
+import sys
+import time
+
+
+class Measure:
+  '''Count, total, min & max of a measured value.
+  '''
+
+  __slots__ = ('count', 'total', 'min', 'max')
+
+  def __init__(self):
+    self.count = 0
+    self.total = 0
+    self.min = None
+    self.max = None
+
+  def add(self, value):
+    self.count += 1
+    self.total += value
+    if self.min is None or value < self.min:
+      self.min = value
+    if self.max is None or value > self.max:
+      self.max = value
+
+  @staticmethod
+  def recordable_data(obj):
+    return {'count': obj.count, 'total': obj.total, 'min': obj.min, 'max': obj.max}
+
+
+class Statistics:
+  '''What a Recorder in counting mode keeps about a decorated function
+      instead of recording its calls.
+
+    For each function:
+      calls       : Number of calls.
+      exceptions  : Number of exceptions raised, by class name.
+      duration    : Measure of the duration of a call (ns) and a histogram
+                    of durations. Bucket n counts the calls that took less
+                    than 2**n ns (and at least 2**(n-1) ns).
+      arg_bytes   : Measure of the size of the arguments of a call
+                    (sys.getsizeof() of each argument, not of what it
+                    refers to).
+      rval_bytes  : Measure of the size of the return value.
+
+    The Recorder records the Statistics of every function that was called
+    on the 'statistics' track (see FunctionStatistics).
+
+    Usage:
+
+      recorder = Recorder.get_recorder(..., counting=True)
+  '''
+
+  __slots__ = ('descriptor', 'calls', 'exceptions', 'duration', 'histogram',
+               'arg_bytes', 'rval_bytes')
+
+  def __init__(self, descriptor):
+    super().__init__()
+
+    self.descriptor = descriptor
+    self.calls = 0
+    self.exceptions = {}
+    self.duration = Measure()
+    self.histogram = [0] * 65
+    self.arg_bytes = Measure()
+    self.rval_bytes = Measure()
+
+  def invoke(self, function, args, kwargs):
+    '''Call `function(*args, **kwargs)` and update our statistics.
+    '''
+    self.calls += 1
+    self.arg_bytes.add(
+        sum(map(sys.getsizeof, args)) + sum(map(sys.getsizeof, kwargs.values())))
+
+    start = time.perf_counter_ns()
+    try:
+      rval = function(*args, **kwargs)
+    except Exception as e:
+      self._timed(start)
+      name = e.__class__.__name__
+      self.exceptions[name] = self.exceptions.get(name, 0) + 1
+      raise
+
+    self._timed(start)
+    self.rval_bytes.add(sys.getsizeof(rval))
+    return rval
+
+  async def ainvoke(self, function, args, kwargs):
+    '''Await `function(*args, **kwargs)` and update our statistics.
+        The duration of a coroutine includes the time it spent waiting.
+    '''
+    self.calls += 1
+    self.arg_bytes.add(
+        sum(map(sys.getsizeof, args)) + sum(map(sys.getsizeof, kwargs.values())))
+
+    start = time.perf_counter_ns()
+    try:
+      rval = await function(*args, **kwargs)
+    except Exception as e:
+      self._timed(start)
+      name = e.__class__.__name__
+      self.exceptions[name] = self.exceptions.get(name, 0) + 1
+      raise
+
+    self._timed(start)
+    self.rval_bytes.add(sys.getsizeof(rval))
+    return rval
+
+  def _timed(self, start):
+    duration = time.perf_counter_ns() - start
+    self.duration.add(duration)
+    self.histogram[min(duration.bit_length(), 64)] += 1
+
+  @property
+  def notes(self):
+    '''What FunctionStatistics records.
+    '''
+    return {
+        'function': {'id': self.descriptor},
+        'calls': self.calls,
+        'exceptions': self.exceptions,
+        'duration': {
+            **Measure.recordable_data(self.duration),
+            # [less than ns, count]
+            'histogram': [[1 << n, count] for n, count in enumerate(self.histogram) if count],
+        },
+        'arg_bytes': self.arg_bytes,
+        'rval_bytes': self.rval_bytes,
+    }
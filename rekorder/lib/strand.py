@@ -0,0 +1,35 @@
+import asyncio
+import threading
+
+
+def running_loop():
+  '''The asyncio event loop that the calling thread is running. None if
+      it is not running one.
+  '''
+  try:
+    return asyncio.get_running_loop()
+  except RuntimeError:
+    return None
+
+
+def strand(thread=None):
+  '''The name of the calling strand of execution: the name of the calling
+      thread or, while it runs an asyncio Task, "thread/task".
+
+    Tunes are tagged with the strand that recorded them (see ThreadBuffers)
+    so that the concurrent Tasks of an event loop can be told apart and
+    each is played back from its own position on the 'recording' track
+    (see Track). Task names (Task-1, Task-2, ...) are given in the order in
+    which the Tasks are created so they are the same on playback.
+
+      Args:
+        thread (str): Optional. The name of the calling thread if the caller
+                      already knows it.
+  '''
+  if thread is None:
+    thread = threading.current_thread().name
+  loop = running_loop()
+  if loop is None:
+    return thread
+  task = asyncio.current_task(loop)
+  return thread if task is None else '{}/{}'.format(thread, task.get_name())
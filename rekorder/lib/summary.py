@@ -0,0 +1,194 @@
+
+import collections
+import json
+import os
+
+from .timestamp import Timestamp
+from .tune import Tune
+
+
+class Summary:
+  '''A small description of a Cassette maintained by its Writer while
+      recording.
+
+    The Summary is saved to a sidecar file (the cassette's path + '.summary')
+    whenever the Writer is flushed or closed so that `rekorder describe
+    --summary` can describe a recording without reading any of it.
+
+    It has:
+      - The number of tunes on each track and the byte offsets of the first
+        and last of them. For a compressed cassette these are offsets into
+        the decompressed data.
+      - How many tunes were recorded by each class of Device.
+      - How many tunes were recorded for each function.
+      - The timestamps of the first and last tunes.
+
+    Usage:
+
+      summary = Summary.load('greatest-hits.json')
+      for line in summary.describe():
+        print(line)
+  '''
+
+  SUFFIX = '.summary'
+  VERSION = 1
+
+  @staticmethod
+  def sidecar(path):
+    return path + Summary.SUFFIX
+
+  @staticmethod
+  def load(path):
+    '''Load the summary of the cassette at `path`.
+        Returns None if there is no (readable) summary.
+    '''
+    try:
+      with open(Summary.sidecar(path), 'r') as f:
+        data = json.load(f)
+    except (OSError, ValueError):
+      return None
+    if data.get('version') != Summary.VERSION:
+      return None
+    return Summary.playback_instance(data)
+
+  @staticmethod
+  def playback_instance(data):
+    summary = Summary(format=data['format'])
+    summary.bytes = data['bytes']
+    summary.tracks = {track['index']: track for track in data['tracks']}
+    summary.devices.update(data['devices'])
+    summary.functions.update(data['functions'])
+    summary.first = data['first']['time'] if data['first'] else None
+    summary.last = data['last']['time'] if data['last'] else None
+    return summary
+
+  @staticmethod
+  def recordable_data(obj):
+    return {
+        'version': Summary.VERSION,
+        'format': obj.format,
+        'bytes': obj.bytes,
+        'tracks': [obj.tracks[n] for n in sorted(obj.tracks)],
+        'devices': dict(obj.devices.most_common()),
+        'functions': dict(obj.functions.most_common()),
+        'first': Timestamp.recordable_data(Timestamp(time=obj.first)) if obj.first is not None else None,
+        'last': Timestamp.recordable_data(Timestamp(time=obj.last)) if obj.last is not None else None
+    }
+
+  @staticmethod
+  def entry(record):
+    '''The parts of `record` (see Cassette.record()) that are summarised.
+
+        Returns (index, title, device, function, time).
+    '''
+    tune = record['tune']
+    if isinstance(tune, dict):
+      # Copied from another cassette. See Shards.merge().
+      device = tune['device']
+      return (record['index'], record['title'],
+              '{}.{}'.format(device['module'], device['class']),
+              Tune.function_name(tune['notes']),
+              tune['timestamp']['time'])
+    device = tune.device.__class__
+    return (record['index'], record['title'],
+            '{}.{}'.format(device.__module__, device.__name__),
+            tune.function,
+            tune.timestamp.time)
+
+  def __init__(self, format):
+    '''Construct an empty Summary.
+
+      Args:
+        format (str): The cassette's RecordingMedium.format.
+    '''
+    super().__init__()
+
+    self.format = format
+    self.bytes = 0
+    # track index -> {index, title, tunes, start, end}
+    self.tracks = {}
+    self.devices = collections.Counter()
+    self.functions = collections.Counter()
+    # time.time() of the first & last tunes
+    self.first = None
+    self.last = None
+
+  @property
+  def tunes(self):
+    return sum(track['tunes'] for track in self.tracks.values())
+
+  def add(self, entry, size):
+    '''Account for a record that was just appended to the cassette.
+
+      Args:
+        entry (tuple): See entry().
+        size (int): Size of the encoded record.
+    '''
+    index, title, device, function, time = entry
+
+    track = self.tracks.get(index, None)
+    if not track:
+      track = self.tracks[index] = {
+          'index': index, 'title': title, 'tunes': 0, 'start': self.bytes, 'end': None}
+    track['tunes'] += 1
+    track['end'] = self.bytes + size
+    self.bytes += size
+
+    self.devices[device] += 1
+    if function:
+      self.functions[function] += 1
+
+    if self.first is None:
+      self.first = time
+    self.last = time
+
+  def skip(self, size):
+    '''Account for bytes written to the cassette that are not tunes.
+    '''
+    self.bytes += size
+
+  def save(self, path):
+    '''Save the summary of the cassette at `path`. Failure to do so (e.g. -
+        a read-only directory) is not an error.
+    '''
+    sidecar = Summary.sidecar(path)
+    temp = sidecar + '.tmp'
+    try:
+      with open(temp, 'w') as f:
+        json.dump(Summary.recordable_data(self), f)
+      os.replace(temp, sidecar)
+    except OSError:
+      pass
+
+  @staticmethod
+  def discard(path):
+    '''Remove any summary left by a previous recording at `path`.
+    '''
+    try:
+      os.remove(Summary.sidecar(path))
+    except OSError:
+      pass
+
+  def describe(self):
+    '''Lines describing the summary.
+    '''
+    lines = ["format [{}] bytes [{}]".format(self.format, self.bytes)]
+    if self.first is not None:
+      lines.append("time [{}] - [{}] ({:.3f}s)".format(
+          Timestamp(time=self.first).localtime, Timestamp(time=self.last).localtime,
+          self.last - self.first))
+
+    lines.append("tracks")
+    for n in sorted(self.tracks):
+      track = self.tracks[n]
+      lines.append("  {title:<10} tunes [{tunes}] bytes [{start}, {end})".format(**track))
+
+    lines.append("devices")
+    for device, count in self.devices.most_common():
+      lines.append("  {:>8}  {}".format(count, device))
+
+    lines.append("functions")
+    for function, count in self.functions.most_common():
+      lines.append("  {:>8}  {}".format(count, function))
+
+    return lines
@@ -3,22 +3,43 @@ import time
 
 
 class Timestamp:
+  '''When a Tune was recorded.
+
+    Recording only reads time.time_ns(). `time` (seconds since the epoch)
+    and `localtime` (time.asctime()) are derived from it when they are
+    needed. Only `time` is recorded.
+  '''
+
+  __slots__ = ('ns', '_time', '_localtime')
 
   @staticmethod
-  def playback_instance(*args, **kwargs):
-    return Timestamp(*args, **kwargs)
+  def playback_instance(data, *args, **kwargs):
+    return Timestamp(time=data['time'], localtime=data.get('localtime', None))
 
   def __init__(self, *args, **kwargs):
     super().__init__()
-    self.time = kwargs.get('time', time.time())
-    self.localtime = kwargs.get('localtime', time.asctime(time.localtime(self.time)))
+    t = kwargs.get('time', None)
+    # Integer nanoseconds since the epoch.
+    self.ns = time.time_ns() if t is None else int(t * 1e9)
+    # A recorded (or given) time is used as is rather than rounded via ns.
+    self._time = t
+    self._localtime = kwargs.get('localtime', None)
 
   def __call__(self):
     return self
 
+  @property
+  def time(self):
+    return self._time if self._time is not None else self.ns / 1e9
+
+  @property
+  def localtime(self):
+    if self._localtime is None:
+      self._localtime = time.asctime(time.localtime(self.time))
+    return self._localtime
+
   @staticmethod
   def recordable_data(obj):
     return {
-        'time': obj.time,
-        'localtime': obj.localtime
+        'time': obj.time
     }
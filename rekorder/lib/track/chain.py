@@ -0,0 +1,35 @@
+
+import bisect
+
+from collections.abc import Sequence
+
+
+class TuneChain(Sequence):
+  '''The recorded tunes of one track across the segments of a recording
+      (see RotationPolicy) as a single sequence.
+
+    Each part is a sequence of recorded tunes (e.g. - a list or a TuneView).
+    Indexing a TuneChain accesses just the part containing the tune.
+  '''
+
+  def __init__(self, parts):
+    self._parts = [part for part in parts if len(part)]
+    # _ends[n] is the index (in the chain) after the last tune of part n
+    self._ends = []
+    end = 0
+    for part in self._parts:
+      end += len(part)
+      self._ends.append(end)
+
+  def __len__(self):
+    return self._ends[-1] if self._ends else 0
+
+  def __getitem__(self, i):
+    if isinstance(i, slice):
+      return [self[n] for n in range(*i.indices(len(self)))]
+    if i < 0:
+      i += len(self)
+    if not 0 <= i < len(self):
+      raise IndexError("Tune index [{}] out of range".format(i))
+    n = bisect.bisect_right(self._ends, i)
+    return self._parts[n][i - (self._ends[n - 1] if n else 0)]
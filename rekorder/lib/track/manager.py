@@ -1,14 +1,83 @@
 
+import contextvars
+
+from ..strand import strand
 from ..what import What
 
+from .chain import TuneChain
 from .track import Track
 
+# The sub-track (if any) on which each TrackManager's tunes are recorded by
+# the calling thread / asyncio Task. id(TrackManager) -> Track. The dict is
+# replaced, never changed, so that each context keeps its own. See
+# TrackManager.sub_track_begin().
+_SUB_TRACKS = contextvars.ContextVar('rekorder_sub_tracks', default={})
+
 
 class TrackManager:
 
+  # The tracks of every recording, in the order in which they are recorded.
+  TITLES = ['header', 'entry', 'recording', 'exit', 'trailer', 'statistics']
+
+  @staticmethod
+  def playback_instance(tracks, mode, drop=False):
+    return TrackManager(tracks=tracks, mode=mode, drop=drop)
+
+  @staticmethod
+  def playback_segments(segments, mode, drop=False, threads=None):
+    '''Construct the tracks of a recording made of one or more segments
+        (see RotationPolicy).
+
+      Tracks on which nothing was recorded do not appear in any segment but
+      must still be present for playback.
+
+      Args:
+        segments (list): The tracks of each segment, in order, as returned
+                         by stream_tracks() or index_tracks().
+        threads (list): Optional. The names of the threads whose tunes on
+                        the 'recording' track are validated. See Track.
+    '''
+    titles = dict(enumerate(TrackManager.TITLES))
+    parts = {n: [] for n in titles}
+    for segment in segments:
+      for n, (title, tunes) in segment.items():
+        titles.setdefault(n, title)
+        parts.setdefault(n, []).append(tunes)
+
+    # In a merged cassette (see Shards) every tune names its process. The
+    # first is the process that began the recording.
+    header = parts[0]
+    process = header[0][0].get('process', None) if header and len(header[0]) else None
+
+    tracks = [
+        Track.playback_view(
+            n, titles[n], parts[n][0] if len(parts[n]) == 1 else TuneChain(parts[n]),
+            mode=mode, drop=drop, threads=threads if titles[n] == 'recording' else None,
+            process=process)
+        for n in sorted(titles)
+    ]
+    return TrackManager(tracks=tracks, mode=mode, process=process)
+
+  @staticmethod
+  def stream_tracks(records):
+    '''Collect the tunes of each track from a stream of records.
+
+        Each record names the track (index & title) on which its tune was
+        recorded. Returns {index: (title, [recorded tune, ...])}.
+    '''
+    tracks = {}
+    for record in records:
+      if record['index'] not in tracks:
+        tracks[record['index']] = (record['title'], [])
+      tracks[record['index']][1].append(record['tune'])
+    return tracks
+
   @staticmethod
-  def playback_instance(tracks, mode):
-    return TrackManager(tracks=tracks, mode=mode)
+  def index_tracks(index):
+    '''The tunes of each track of a CassetteIndex.
+        Returns {index: (title, TuneView)}.
+    '''
+    return {n: (title, index.view(n)) for n, title in index.tracks()}
 
   def __init__(self, *args, **kwargs):
     super().__init__()
@@ -16,34 +85,64 @@ class TrackManager:
     self.mode = kwargs['mode']
 
     if self.mode == What.RECORD:
+      self.keep = kwargs.get('keep', False)
       self._tracks = [
-          Track(index=n, title=title)
-          for n, title in enumerate(['header', 'entry', 'recording', 'exit', 'trailer'])
+          Track(index=n, title=title, keep=self.keep)
+          for n, title in enumerate(TrackManager.TITLES)
       ]
 
     elif self.mode in [What.DESCRIBE, What.PLAYBACK]:
       self._tracks = [
-          Track.playback_instance(track, mode=self.mode)
+          track if isinstance(track, Track) else Track.playback_instance(
+              track, mode=self.mode, drop=kwargs.get('drop', False))
           for track in kwargs['tracks']
       ]
 
     else:
       raise Exception("Unsupported mode [{}]".format(self.mode))
 
-    self.current_track = None
+    self._current_track = None
+    # On playback, set in a forked child. See validating().
+    self.forked = False
+    # On playback of a merged cassette, the process that began the
+    # recording. Only its tunes are played back. See Track.
+    self.process = kwargs.get('process', None)
     self.reset()
 
+  @property
+  def current_track(self):
+    '''The Track on which the calling thread (or Task) records (or validates).
+    '''
+    sub_track = _SUB_TRACKS.get().get(id(self), None)
+    return self._current_track if sub_track is None else sub_track
+
+  @current_track.setter
+  def current_track(self, track):
+    self._current_track = track
+
   @staticmethod
   def recordable_data(obj):
     return obj._tracks
 
+  def __getitem__(self, key):
+    '''Get a Track by title or by index.
+
+      Usage:
+        track_manager['recording'][0]
+        track_manager[2][-10:]
+    '''
+    for track in self._tracks:
+      if key in [track.title, track.index]:
+        return track
+    raise KeyError(key)
+
   def __iter__(self):
     self._index = 0
     return self
 
   def __next__(self):
     self._check_state()
-    was = self.current_track.title if self.current_track else ''
+    was = self.current_track.title if self.current_track is not None else ''
     if self._index < self._max:
       self.current_track = self._tracks[self._index]
       self._index += 1
@@ -53,19 +152,40 @@ class TrackManager:
 
   def set_track(self, new_track):
     self._check_state()
-    while self.current_track and self.current_track.title != new_track:
+    while self.current_track is not None and self.current_track.title != new_track:
       next(self)
 
   def sub_track_begin(self, new_sub_track):
+    '''Record on a sub-track of the current track.
+        Only the calling thread (or Task) moves to the sub-track.
+    '''
     sub_track = Track(index=self.current_track.index * 10, title=new_sub_track, parent=self.current_track)
     # self.current_track.sub_track = sub_track
-    self.current_track = sub_track
-    return self.current_track
+    self._set_sub_track(sub_track)
+    return sub_track
 
   def sub_track_conclude(self, new_sub_track):
-    self.current_track = self.current_track.parent
+    parent = self.current_track.parent
+    self._set_sub_track(parent if parent is not None and parent.parent is not None else None)
     return self.current_track
 
+  def _set_sub_track(self, sub_track):
+    '''Move the calling thread (or Task) to `sub_track` (None for none).
+    '''
+    sub_tracks = dict(_SUB_TRACKS.get())
+    if sub_track is None:
+      sub_tracks.pop(id(self), None)
+    else:
+      sub_tracks[id(self)] = sub_track
+    _SUB_TRACKS.set(sub_tracks)
+
+  def validating(self):
+    '''On playback, are the tunes of the calling thread (or Task) validated?
+        See Track.validates(). A forked child's calls were recorded to a
+        shard of the recording (see Shards) so a child does not validate.
+    '''
+    return not self.forked and self.current_track.validates(strand())
+
   @property
   def tracks(self):
     return self
@@ -76,13 +196,13 @@ class TrackManager:
 
   def reset(self):
     self._check_state()
-    self.current_track = None
+    self._current_track = None
     self._index = 0
     self._max = len(self._tracks)
     return self.next
 
   def _check_state(self):
-    if not self.current_track:
+    if self.current_track is None:
       return
-    if self.current_track.parent:
+    if self.current_track.parent is not None:
       raise Exception("Illegal state.")
@@ -1,15 +1,59 @@
 
+import threading
+
+from ..strand import strand
 from ..tune import Tune
 from ..what import What
 
+# Placeholder for a tune that was dropped after use. See Track(drop=True).
+_DROPPED = object()
+
 
 class Track:
   '''A Track is a collection of Tunes.
+
+    In record mode a Track only counts the tunes recorded on it (see
+    `recorded`) unless it is asked to keep them. Once a tune has been given
+    to the Cassette's Writer nothing else needs it.
+
+    On playback a Track holds the recorded data of its tunes and only
+    instantiates a Tune (and its Device) when it is accessed, either by
+    next_tune(), by iteration or by position / slice:
+
+      track[0], track[-1], track[10:20], len(track)
+
+    If the tunes of the 'recording' track were tagged with the thread (or
+    asyncio Task) that recorded them (see ThreadBuffers & strand()) each
+    thread / Task has its own position on the Track: next_tune() & peek()
+    return the next tune recorded by a strand of the same name as the
+    calling one. Tunes that were not tagged (those recorded before an event
+    loop was first seen) belong to the main thread. `threads` limits the
+    threads whose tunes are validated (see validates()).
+
+    The tunes of a merged cassette (see Shards) were tagged with the
+    process that recorded them. Its forked children do not validate on
+    playback so next_tune() & peek() only return the tunes of `process`,
+    the process that began the recording.
   '''
 
+  __slots__ = ('current_tune', 'mode', 'index', 'title', 'parent', 'sub_track',
+               'drop', 'keep', 'recorded', 'threads', 'process', '_records', '_tunes', '_next',
+               '_positions', '_cursors')
+
+  @staticmethod
+  def playback_instance(track, mode, drop=False):
+    return Track(**track, mode=mode, drop=drop)
+
   @staticmethod
-  def playback_instance(track, mode):
-    return Track(**track, mode=mode)
+  def playback_view(index, title, view, mode, drop=False, threads=None, process=None):
+    '''Construct a Track whose tunes are decoded only when they are accessed.
+
+      Args:
+        view (Sequence): The recorded tunes. e.g. - a TuneView (see
+                         CassetteIndex) or a TuneChain.
+    '''
+    return Track(index=index, title=title, tunes=view, mode=mode, drop=drop, threads=threads,
+                 process=process)
 
   @staticmethod
   def recordable_data(obj):
@@ -22,7 +66,24 @@ class Track:
     #   r['sub_track'] = Track.recordable_data(obj.sub_track)
     return r
 
-  def __init__(self, index, title, tunes=None, mode=What.RECORD, parent=None):
+  def __init__(self, index, title, tunes=None, mode=What.RECORD, parent=None, drop=False, keep=False,
+               threads=None, process=None):
+    '''Construct the Track.
+
+      Args:
+        tunes (list): Optional. The recorded data of the tunes on playback.
+        keep (bool): Optional. In record mode, keep every tune added to the
+                     Track. Memory use then grows with every tune recorded.
+        drop (bool): Optional. On playback, release each tune once the
+                     next one has been fetched so that memory use does
+                     not grow with the length of the Track. A tune that
+                     has been dropped cannot be accessed again. Ignored
+                     if each thread has its own position.
+        threads (list): Optional. On playback, the names of the threads
+                        whose tunes are validated. Default is every thread.
+        process (int): Optional. On playback of a merged cassette, the id
+                       of the process whose tunes are played back.
+    '''
     super().__init__()
 
     self.current_tune = None
@@ -31,21 +92,146 @@ class Track:
     self.title = title
     self.parent = parent
     self.sub_track = None
-    self.tunes = [
-        Tune.playback_instance(t, mode=self.mode) for t in tunes
-    ] if tunes else []
+    self.drop = drop
+    self.keep = keep
+    self.recorded = 0
+    self.threads = set(threads) if threads else None
+    self.process = process
+
+    # _records holds the recorded data of the tunes that have not been
+    # instantiated yet (i.e. - the None entries of _tunes).
+    self._records = tunes
+    self._tunes = [None] * len(tunes) if tunes is not None else []
+    # Thread name -> positions of its tunes. None until we know whether our
+    # tunes were tagged, False if they were not.
+    self._positions = None
     self.reset()
 
+  def __len__(self):
+    return len(self._tunes)
+
+  def __getitem__(self, i):
+    if isinstance(i, slice):
+      return [self[n] for n in range(*i.indices(len(self)))]
+    tune = self._tunes[i]
+    if tune is None:
+      tune = self._tunes[i] = Tune.playback_instance(self._records[i], mode=self.mode)
+    elif tune is _DROPPED:
+      raise Exception("Tune [{}] of track [{}] was dropped after use.".format(i, self.title))
+    return tune
+
+  def __iter__(self):
+    for n in range(len(self)):
+      tune = self[n]
+      self._release(n - 1)
+      yield tune
+
+  @property
+  def tunes(self):
+    '''All of our tunes. Instantiates any that have not been accessed yet.
+    '''
+    return self[:]
+
   def add(self, tune):
-    self.tunes.append(tune)
+    self.recorded += 1
+    self.current_tune = tune
+    if self.keep:
+      self._tunes.append(tune)
 
   def reset(self):
-    self._iter = iter(self.tunes)
+    self._next = 0
     self.current_tune = None
+    # Thread name -> how many of its tunes have been fetched.
+    self._cursors = {}
 
   def size(self):
-    return len(self.tunes)
+    return len(self._tunes)
+
+  def peek(self):
+    '''The tune that next_tune() will return without fetching it.
+        None at the end of the Track.
+    '''
+    if self._positions is None:
+      self._split()
+    if self._positions:
+      name = strand()
+      positions = self._positions.get(name, ())
+      n = self._cursors.get(name, 0)
+      return self[positions[n]] if n < len(positions) else None
+
+    if self._next >= len(self._tunes):
+      return None
+    return self[self._next]
 
   def next_tune(self):
-    self.current_tune = next(self._iter)
+    if self._positions is None:
+      self._split()
+    if self._positions:
+      return self._next_tune_of(strand())
+
+    if self._next >= len(self._tunes):
+      raise StopIteration
+    self.current_tune = self[self._next]
+    self._release(self._next - 1)
+    self._next += 1
+    return self.current_tune
+
+  def plays(self, tune):
+    '''On playback, is `tune` (one of ours) played back? Only the tunes of
+        `process` are.
+    '''
+    return self.process is None or tune.process in (None, self.process)
+
+  def validates(self, name):
+    '''On playback, are the tunes of the strand (thread or "thread/task")
+        called `name` validated?
+    '''
+    return self.threads is None or name in self.threads or name.split('/')[0] in self.threads
+
+  # Internals
+
+  def _split(self):
+    '''Give each thread its own position if our tunes were tagged (and
+        leave out those of other processes).
+    '''
+    if self.mode == What.RECORD or self.title != 'recording' or not len(self) or \
+        (self.process is None and self._tag(0, 'thread') is None and self._tag(-1, 'thread') is None):
+      self._positions = False
+      return
+    main = threading.main_thread().name
+    positions = {}
+    for n in range(len(self)):
+      if self.process is not None and self._tag(n, 'process') not in (None, self.process):
+        continue
+      thread = self._tag(n, 'thread')
+      positions.setdefault(main if thread is None else thread, []).append(n)
+    self._positions = positions
+
+  def _tag(self, n, name):
+    '''The thread (or process) that recorded our nth tune. Read from its
+        recorded data so that the Tune is not instantiated before it is
+        needed.
+    '''
+    tune = self._tunes[n]
+    if tune is None:
+      return self._records[n].get(name, None)
+    return getattr(tune, name)
+
+  def _next_tune_of(self, name):
+    positions = self._positions.get(name, None)
+    if positions is None:
+      raise Exception("No tunes were recorded by thread [{}] on track [{}].".format(name, self.title))
+    n = self._cursors.get(name, 0)
+    if n >= len(positions):
+      raise StopIteration
+    # Only the thread called `name` moves its cursor.
+    self._cursors[name] = n + 1
+    self.current_tune = self[positions[n]]
     return self.current_tune
+
+  def _release(self, n):
+    if not self.drop or n < 0:
+      return
+    self._tunes[n] = _DROPPED
+    if isinstance(self._records, list):
+      self._records[n] = None
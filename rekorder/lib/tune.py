@@ -2,6 +2,8 @@
 import copy
 
 from . import util
+from .function import FunctionDescriptor
+from .snapshot import Snapshot
 from .timestamp import Timestamp
 from .what import What
 from .when import When
@@ -11,6 +13,10 @@ class Tune:
   '''Tune captures Device details, the Notes created by the Device and a timestamp.
   '''
 
+  # A Tune is created for every recorded call.
+  __slots__ = ('mode', 'device', 'when', 'timestamp', 'function', 'descriptor',
+               'thread', 'sequence', 'process', 'encoded_notes', '_notes')
+
   @staticmethod
   def playback_instance(tune, mode):
     if isinstance(tune, Tune):
@@ -25,42 +31,38 @@ class Tune:
                                    timestamp=timestamp,
                                    when=when,
                                    **tune['notes'])
-    return Tune(device=device,
-                mode=mode,
-                notes=tune['notes'],
-                timestamp=timestamp,
-                when=when
-                )
+    r = Tune(device=device,
+             mode=mode,
+             notes=tune['notes'],
+             timestamp=timestamp,
+             when=when
+             )
+    r.thread = tune.get('thread', None)
+    r.sequence = tune.get('sequence', None)
+    r.process = tune.get('process', None)
+    return r
 
   @staticmethod
   def recordable_data(obj):
     '''Used by Cassette when recording `obj` to the output file.
     '''
 
-    notes = {}
-    for key, value in obj.notes.items():
-      # TODO - Make this smarter.
-      if value == None:
-        notes[key] = value
-      elif isinstance(value, dict):
-        notes[key] = value
-      elif isinstance(value, list) or isinstance(value, set) or isinstance(value, tuple):
-        notes[key] = list(value)
-      elif isinstance(value, int) or isinstance(value, float) or isinstance(value, str):
-        notes[key] = value
-      else:
-        notes[key] = str(value)
-
     r = {
         'device': {
             'module': obj.device.__class__.__module__,
             'class': obj.device.__class__.__name__
         },
-        'notes': notes,
+        # Values the medium cannot record by itself are converted by its
+        # Serializers as they are encoded.
+        'notes': obj.encoded_notes if obj.encoded_notes is not None else obj.notes,
         'timestamp': obj.timestamp
     }
     if obj.when:
       r.update({'when': obj.when})
+    if obj.thread is not None:
+      r.update({'thread': obj.thread, 'sequence': obj.sequence})
+    if obj.process is not None:
+      r.update({'process': obj.process})
     return r
 
   def __init__(self, device, notes, when=When.NA, timestamp=None, mode=What.RECORD):
@@ -69,6 +71,13 @@ class Tune:
     self.device = device
     self.when = when
     self.timestamp = timestamp if timestamp else Timestamp()
+    # The thread that recorded us and our place in the recording. Only set
+    # when each thread records to its own buffer. See ThreadBuffers.
+    self.thread = None
+    self.sequence = None
+    # The id of the process that recorded us. Only set in a merged cassette.
+    # See Shards.
+    self.process = None
 
     # Bugfix: If mutable parameters change during function invocation
     #         MethodParameters recorded the new/changed value for both before
@@ -76,7 +85,17 @@ class Tune:
     # We need to make a deep copy of the notes in case they change after this.
     # For instance, if the notes represent function parameters it is possible
     # that they could change during function invocation.
-    self.notes = copy.deepcopy(notes)
+    # With Snapshot.ENCODE the "copy" is the notes encoded for the output.
+    # They are only decoded again if someone asks for them.
+    self.descriptor = Tune.function_descriptor(notes)
+    self.function = self.descriptor.key if self.descriptor else Tune.function_name(notes)
+    medium = Tune._snapshot_medium(device)
+    if medium:
+      self.encoded_notes = medium.snapshot(notes)
+      self._notes = None
+    else:
+      self.encoded_notes = None
+      self._notes = copy.deepcopy(notes)
 
     from .device import Device
     from .device import DeviceProxy
@@ -87,5 +106,41 @@ class Tune:
         "[{}] must be a Device or provide a get_device() method that returns a Device".format(
             self.device))
 
+  @property
+  def notes(self):
+    if self._notes is None:
+      self._notes = self.encoded_notes.value
+    return self._notes
+
+  @staticmethod
+  def function_descriptor(notes):
+    '''The FunctionDescriptor to which `notes` refer (if any).
+        Only recorded notes refer to one. See Decorator.before().
+    '''
+    function = notes.get('function', None) if isinstance(notes, dict) else None
+    descriptor = function.get('id', None) if isinstance(function, dict) else None
+    return descriptor if isinstance(descriptor, FunctionDescriptor) else None
+
+  @staticmethod
+  def function_name(notes):
+    '''module.qualname of the function described by `notes` (if any).
+    '''
+    function = notes.get('function', None) if isinstance(notes, dict) else None
+    if not isinstance(function, dict) or 'qualname' not in function:
+      return None
+    return '{}.{}'.format(function.get('module', ''), function['qualname'])
+
+  @staticmethod
+  def _snapshot_medium(device):
+    '''The RecordingMedium with which to snapshot notes recorded by
+        `device` or None to deepcopy them.
+    '''
+    recorder = getattr(device, 'recorder', None)
+    if getattr(recorder, 'snapshot', Snapshot.DEEPCOPY) != Snapshot.ENCODE or \
+            recorder.mode != What.RECORD:
+      return None
+    # The Cassette records itself before the Recorder knows about it.
+    return getattr(getattr(recorder, 'recording_medium', None), 'medium', None)
+
   def playback(self, *args, **kwargs):
     return self.device.playback(*args, **kwargs)
@@ -6,8 +6,12 @@ class What(Enum):
   '''What are we doing?
 
     Tell something that we want it to record, playback, describe or verify itself.
+
+    OFF means nothing is recorded at all: decorators return the function
+    they are given and no Cassette is created.
   '''
   RECORD = 201
   PLAYBACK = 202
   DESCRIBE = 203
   VALIDATE = 204
+  OFF = 205
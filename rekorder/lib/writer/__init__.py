@@ -0,0 +1,9 @@
+
+from .backpressure import Backpressure
+from .buffers import ThreadBuffers
+from .flush import FlushPolicy
+from .rotation import Manifest, RotationPolicy
+from .writer import Writer
+from .threaded import ThreadedWriter
+from .sink import LoopSink
+from .shards import Shards
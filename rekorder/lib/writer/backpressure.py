@@ -0,0 +1,15 @@
+
+from enum import Enum
+
+
+class Backpressure(Enum):
+  '''What should a ThreadedWriter do when its queue is full?
+
+    BLOCK : Wait for the writer thread to make room. Nothing is lost.
+    DROP  : Discard the newest tune and count it in ThreadedWriter.dropped.
+    SPILL : Write the tune to a spill file next to the output. The writer
+            thread copies the spill file to the output once it catches up.
+  '''
+  BLOCK = 301
+  DROP = 302
+  SPILL = 303
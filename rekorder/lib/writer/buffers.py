@@ -0,0 +1,126 @@
+
+import heapq
+import itertools
+import threading
+import time
+
+from collections import deque
+
+from ..strand import running_loop, strand
+
+
+def _sequence(record):
+  return record['tune'].sequence
+
+
+class ThreadBuffer:
+  '''The records of one thread that have not been merged yet.
+  '''
+
+  __slots__ = ('thread', 'name', 'records', 'busy')
+
+  def __init__(self, thread):
+    self.thread = thread
+    self.name = thread.name
+    # Appended to by `thread` only. Taken from by ThreadBuffers.merge().
+    self.records = deque()
+    # True while `thread` takes a sequence number and buffers its record.
+    self.busy = False
+
+
+class ThreadBuffers:
+  '''Per-thread buffers of records, merged in the order they were recorded.
+
+    Each thread appends the records that it records to a buffer of its own.
+    Before it is buffered, the record's tune is tagged with the name of
+    the thread (Tune.thread) and a sequence number (Tune.sequence) taken
+    from a counter shared by every thread. No lock is taken to record.
+    While the thread runs an asyncio Task the tune is tagged with the name
+    of the Task as well (see strand()).
+
+    Whenever a thread has buffered `size` records, and on flush() & close(),
+    the buffers are merged: every buffered record is given to the Writer in
+    sequence order. Sequence numbers always increase but are not always
+    consecutive.
+
+    Usage:
+
+      buffers = ThreadBuffers(writer)
+      buffers.write({'index': ..., 'title': ..., 'tune': tune})  # Any thread.
+      buffers.merge()
+  '''
+
+  def __init__(self, writer, size=256):
+    '''Construct the ThreadBuffers.
+
+      Args:
+        writer (Writer): Writes the merged records.
+        size (int): Records a thread buffers before the buffers are merged.
+    '''
+    super().__init__()
+
+    if size < 1:
+      raise Exception("ThreadBuffers size must be >= 1. Got [{}].".format(size))
+
+    self.writer = writer
+    self.size = size
+
+    # next() of an itertools.count is atomic.
+    self._sequence = itertools.count()
+    self._local = threading.local()
+    # Only changed while merging.
+    self._buffers = []
+    self._lock = threading.Lock()
+
+  def write(self, record):
+    '''Tag `record`'s tune and buffer it on the calling thread.
+    '''
+    buffer = getattr(self._local, 'buffer', None)
+    if buffer is None:
+      buffer = self._register()
+
+    tune = record['tune']
+    tune.thread = buffer.name if running_loop() is None else strand(buffer.name)
+    buffer.busy = True
+    tune.sequence = next(self._sequence)
+    buffer.records.append(record)
+    buffer.busy = False
+
+    if len(buffer.records) >= self.size:
+      self.merge()
+
+  def merge(self):
+    '''Give every buffered record to the Writer in sequence order.
+    '''
+    with self._lock:
+      # Any record numbered below the barrier is buffered or is about to be
+      # (its thread is busy). Records numbered above it wait for the next
+      # merge so that none is written before a record numbered below it.
+      barrier = next(self._sequence)
+
+      runs = []
+      for buffer in self._buffers:
+        while buffer.busy:
+          time.sleep(0)
+        records = buffer.records
+        run = []
+        while records and records[0]['tune'].sequence < barrier:
+          run.append(records.popleft())
+        if run:
+          runs.append(run)
+
+      # The buffers of threads that have finished are no longer needed.
+      self._buffers = [
+          buffer for buffer in self._buffers if buffer.records or buffer.thread.is_alive()]
+
+      # Each buffer is already in sequence order.
+      for record in heapq.merge(*runs, key=_sequence):
+        self.writer.write(record)
+
+  # Internals
+
+  def _register(self):
+    buffer = self._local.buffer = ThreadBuffer(threading.current_thread())
+    with self._lock:
+      self._buffers.append(buffer)
+    return buffer
@@ -0,0 +1,75 @@
+
+import time
+
+
+class FlushPolicy:
+  '''When should a Writer write what it has buffered to the output?
+
+    Every flush is a single write of everything that is buffered, optionally
+    followed by an fsync. Because the output is append-only, a process that
+    is killed part way through a flush leaves at most one incomplete record
+    at the end of the output. That record is ignored on playback.
+
+    A .bz2 or .xz output ends a compressed stream at every flush (see
+    compression.StreamedOutput) so it is flushed in batches unless it is
+    given a FlushPolicy.
+
+    The age limit (`milliseconds`) is only kept by a background writer
+    (`Recorder.get_recorder(..., background=True)`) whose thread flushes
+    when the deadline passes. A synchronous Writer only checks it when the
+    next tune is written, so a quiet recording stays buffered until then
+    (or until RecordingEnd).
+
+    Usage:
+
+      FlushPolicy()                              # After every tune (the default).
+      FlushPolicy(tunes=100)                     # After every 100 tunes.
+      FlushPolicy(tunes=None, milliseconds=500)  # At most 500ms after a tune is
+                                                 # recorded (with background=True).
+      FlushPolicy(tunes=None)                    # Only at RecordingEnd (and exit).
+      FlushPolicy(tunes=100, fsync=True)
+
+      recorder = Recorder.get_recorder(..., flush_policy=FlushPolicy(tunes=100))
+  '''
+
+  def __init__(self, tunes=1, milliseconds=None, fsync=False):
+    '''Construct the FlushPolicy.
+
+      Args:
+        tunes (int): Flush when this many tunes are buffered.
+                     None to flush regardless of how many are buffered.
+        milliseconds (int): Flush when the oldest buffered tune is this old.
+                            None to flush regardless of age. See above.
+        fsync (bool): fsync() the output after every flush.
+    '''
+    super().__init__()
+
+    self.tunes = tunes
+    self.milliseconds = milliseconds
+    self.fsync = fsync
+
+  def __repr__(self):
+    return "FlushPolicy(tunes={}, milliseconds={}, fsync={})".format(
+        self.tunes, self.milliseconds, self.fsync)
+
+  def deadline(self, since):
+    '''The time.monotonic() by which tunes buffered `since` must be flushed.
+        None if there is no time limit.
+    '''
+    if self.milliseconds is None:
+      return None
+    return since + self.milliseconds / 1000.0
+
+  def due(self, pending, since):
+    '''Is a flush due?
+
+      Args:
+        pending (int): Number of buffered tunes.
+        since (float): time.monotonic() when the oldest of them was buffered.
+    '''
+    if not pending:
+      return False
+    if self.tunes is not None and pending >= self.tunes:
+      return True
+    deadline = self.deadline(since)
+    return deadline is not None and time.monotonic() >= deadline
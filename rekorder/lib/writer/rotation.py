@@ -0,0 +1,171 @@
+
+import json
+import os
+import time
+
+from .. import compression
+
+
+class RotationPolicy:
+  '''When should a Writer move on to a new segment of the output?
+
+    With a RotationPolicy the output is never written to directly. Tunes are
+    written to numbered segments instead:
+
+      greatest-hits.json -> greatest-hits.0001.json, greatest-hits.0002.json, ...
+
+    and a Manifest (greatest-hits.json.manifest) lists the segments so that
+    they can be played back as one recording. Every segment can be decoded
+    on its own. Once the Writer has moved on from a segment it is closed and
+    never written to again so it can be compressed, shipped, etc. while
+    recording continues (see `finalize`).
+
+    Rotation is checked whenever tunes are written to the output. A segment
+    may therefore go a little past its limits (up to the FlushPolicy's batch
+    of tunes) and a segment that receives no tunes is never rotated.
+
+    Usage:
+
+      RotationPolicy(bytes=64 << 20)       # Every 64MB (before compression)
+      RotationPolicy(tunes=100000)         # Every 100,000 tunes
+      RotationPolicy(seconds=3600)         # Every hour
+      RotationPolicy(seconds=3600, finalize=ship)
+
+      recorder = Recorder.get_recorder(..., rotation_policy=RotationPolicy(seconds=3600))
+  '''
+
+  def __init__(self, bytes=None, tunes=None, seconds=None, finalize=None):
+    '''Construct the RotationPolicy.
+
+      Args:
+        bytes (int): Rotate when a segment has this many (uncompressed) bytes.
+        tunes (int): Rotate when a segment has this many tunes.
+        seconds (float): Rotate when a segment is this old.
+        finalize (callable): Optional. Called with the path of each segment
+                             after it is closed. May return a new path for
+                             the segment (e.g. - after compressing it) which
+                             is recorded in the Manifest.
+    '''
+    super().__init__()
+
+    self.bytes = bytes
+    self.tunes = tunes
+    self.seconds = seconds
+    self.finalize = finalize
+
+  def __repr__(self):
+    return "RotationPolicy(bytes={}, tunes={}, seconds={})".format(
+        self.bytes, self.tunes, self.seconds)
+
+  def due(self, size, tunes, since):
+    '''Is a rotation due?
+
+      Args:
+        size (int): Bytes written to the current segment.
+        tunes (int): Tunes written to the current segment.
+        since (float): time.monotonic() when the current segment was begun.
+    '''
+    if not tunes:
+      return False
+    if self.bytes is not None and size >= self.bytes:
+      return True
+    if self.tunes is not None and tunes >= self.tunes:
+      return True
+    return self.seconds is not None and time.monotonic() - since >= self.seconds
+
+
+class Manifest:
+  '''The list of segments of an output written with a RotationPolicy.
+
+    Saved (as JSON) next to the output whenever a segment is begun or
+    finished:
+
+      {
+        "version": 1,
+        "segments": [
+          {"path": "greatest-hits.0001.json", "final": true},
+          {"path": "greatest-hits.0002.json", "final": false}
+        ]
+      }
+
+    Segment paths are relative to the Manifest.
+  '''
+
+  SUFFIX = '.manifest'
+  VERSION = 1
+
+  @staticmethod
+  def find(path):
+    '''Load the Manifest for the output `path`.
+
+      `path` may be the output (if it does not exist) or the Manifest itself.
+      Returns None if there is no Manifest.
+    '''
+    if path.endswith(Manifest.SUFFIX):
+      path = path[:-len(Manifest.SUFFIX)]
+    elif os.path.exists(path):
+      return None
+
+    try:
+      with open(path + Manifest.SUFFIX, 'r') as f:
+        data = json.load(f)
+    except (OSError, ValueError):
+      return None
+
+    if data.get('version') != Manifest.VERSION:
+      raise Exception("Unsupported manifest version [{}] for [{}]".format(
+          data.get('version'), path))
+
+    manifest = Manifest(path)
+    manifest.segments = data['segments']
+    return manifest
+
+  @staticmethod
+  def segment_path(path, n):
+    '''greatest-hits.json.gz, 1 -> greatest-hits.0001.json.gz
+    '''
+    stripped = compression.strip(path)
+    root, extension = os.path.splitext(stripped)
+    return '{}.{:04d}{}{}'.format(root, n, extension, path[len(stripped):])
+
+  def __init__(self, path):
+    '''Construct an empty Manifest.
+
+      Args:
+        path (str): The output. The Manifest is saved to path + SUFFIX.
+    '''
+    super().__init__()
+
+    self.path = path
+    self.segments = []
+
+  def paths(self):
+    '''The paths of the segments, in order.
+    '''
+    directory = os.path.dirname(self.path)
+    return [os.path.join(directory, segment['path']) for segment in self.segments]
+
+  def begin(self):
+    '''Add a segment. Returns its path.
+    '''
+    path = Manifest.segment_path(self.path, len(self.segments) + 1)
+    self.segments.append({'path': os.path.basename(path), 'final': False})
+    self.save()
+    return path
+
+  def finish(self, path):
+    '''Mark the last segment final.
+
+      Args:
+        path (str): Path of the segment (it may have been renamed by
+                    RotationPolicy.finalize).
+    '''
+    self.segments[-1] = {'path': os.path.basename(path), 'final': True}
+    self.save()
+
+  def save(self):
+    data = {'version': Manifest.VERSION, 'segments': self.segments}
+    temp = self.path + Manifest.SUFFIX + '.tmp'
+    with open(temp, 'w') as f:
+      json.dump(data, f, indent=2)
+    os.replace(temp, self.path + Manifest.SUFFIX)
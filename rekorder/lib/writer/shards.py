@@ -0,0 +1,118 @@
+import heapq
+import os
+import re
+
+from .. import compression
+from ..medium import RecordingMedium
+from .flush import FlushPolicy
+from .rotation import Manifest
+from .writer import Writer
+
+
+def _order(record):
+  tune = record['tune']
+  sequence = tune.get('sequence', None)
+  return (tune['timestamp']['time'], sequence if sequence is not None else 0)
+
+
+class Shards:
+  '''The cassettes recorded by the processes forked from a recording
+      process.
+
+    A forked child does not write to its parent's output. Its Cassette
+    switches to a shard of its own next to it:
+
+      greatest-hits.json -> greatest-hits.pid.4242.json
+
+    and records its header there, linked to the parent's output & process
+    id (see Cassette). A child forked by a child shards the child's shard:
+
+      greatest-hits.pid.4242.pid.4250.json
+
+    merge() combines a recording and all of its shards into one cassette.
+
+    Usage:
+
+      Shards.merge('greatest-hits.json', 'greatest-hits.merged.json')
+  '''
+
+  # Tunes written to the merged cassette at once.
+  BATCH = 1024
+
+  @staticmethod
+  def path(output, pid):
+    '''greatest-hits.json.gz, 4242 -> greatest-hits.pid.4242.json.gz
+    '''
+    stripped = compression.strip(output)
+    root, extension = os.path.splitext(stripped)
+    return '{}.pid.{}{}{}'.format(root, pid, extension, output[len(stripped):])
+
+  @staticmethod
+  def find(output):
+    '''The shards of `output` (and of its shards), by process id. Each
+        parent comes before its children.
+    '''
+    stripped = compression.strip(output)
+    root, extension = os.path.splitext(stripped)
+    directory, base = os.path.split(root)
+    pattern = re.compile('{}((?:\\.pid\\.\\d+)+){}(?:{})?$'.format(
+        re.escape(base), re.escape(extension + output[len(stripped):]),
+        re.escape(Manifest.SUFFIX)))
+
+    shards = {}
+    for name in os.listdir(directory or '.'):
+      match = pattern.match(name)
+      if match:
+        # A shard written with a RotationPolicy is found by its Manifest.
+        path = os.path.join(directory, name[:len(name) - len(Manifest.SUFFIX)] if \
+            name.endswith(Manifest.SUFFIX) else name)
+        shards[path] = [int(pid) for pid in match.group(1).split('.pid.')[1:]]
+    return sorted(shards, key=lambda path: shards[path])
+
+  @staticmethod
+  def merge(input, output, format=None, compression_level=None):
+    '''Write the tunes of `input` and of all of its shards (see find()) to
+        `output` in the order in which they were recorded.
+
+      The tunes of each cassette stay in the order they were written. The
+      cassettes are interleaved by the timestamp (then sequence number) of
+      their tunes. Each tune is tagged with the id of the process that
+      recorded it (Tune.process).
+
+      Args:
+        input (str): The output of the recording process.
+        output (str): Path of the merged cassette.
+        format (str): Optional. See Cassette.
+        compression_level (int): Optional. See compression.open_output().
+
+      Returns the number of cassettes merged.
+    '''
+    paths = [input] + Shards.find(input)
+    medium = RecordingMedium.for_output(output, format=format)
+    writer = Writer(output, medium, compression_level=compression_level,
+                    flush_policy=FlushPolicy(tunes=Shards.BATCH))
+    try:
+      for record in heapq.merge(*[Shards._records(path) for path in paths], key=_order):
+        writer.write(record)
+    finally:
+      writer.close()
+    return len(paths)
+
+  @staticmethod
+  def _records(path):
+    '''The tune records of the cassette (or segmented cassette) at `path`,
+        each tagged with the process that recorded it.
+    '''
+    manifest = Manifest.find(path)
+    process = None
+    for segment in manifest.paths() if manifest else [path]:
+      with compression.open_input(segment) as f:
+        for record in RecordingMedium.for_input(f).decode(f):
+          tune = record.get('tune', None)
+          if not isinstance(tune, dict):
+            continue
+          # A cassette begins with the Cassette's own tune.
+          if process is None and tune['device']['class'] == 'Cassette':
+            process = tune['notes'].get('pid', None)
+          tune['process'] = process
+          yield record
@@ -0,0 +1,113 @@
+import queue
+import threading
+
+# Marker put on the queue by close().
+# flush() puts a threading.Event on the queue.
+_CLOSE = object()
+
+
+class LoopSink:
+  '''Keeps a Writer's file I/O off of a thread that runs an asyncio event
+      loop.
+
+    A Cassette that records from within an event loop hands its Writer to a
+    LoopSink. write() only puts the record on an unbounded queue and never
+    blocks. A dedicated thread gives the queued records to the Writer in
+    the order they were written.
+
+    flush() & close() wait for the thread. RecordingEnd flushes so the end
+    of a recording blocks the loop until the recording is written out.
+
+    Usage:
+
+      sink = LoopSink(writer)
+      sink.write(record)
+      sink.close()
+  '''
+
+  def __init__(self, writer):
+    '''Construct the LoopSink and start its thread.
+
+      Args:
+        writer (Writer): Writes the records.
+    '''
+    super().__init__()
+
+    self.writer = writer
+    self._queue = queue.SimpleQueue()
+    self._error = None
+    self._closed = False
+
+    self._thread = threading.Thread(
+        target=self._run, name='rekorder-sink [{}]'.format(writer.path), daemon=True)
+    self._thread.start()
+
+  @property
+  def path(self):
+    return self.writer.path
+
+  @property
+  def closed(self):
+    return self._closed
+
+  def write(self, record):
+    '''Queue `record` for our thread.
+    '''
+    if self._error:
+      raise Exception("Sink thread for [{}] failed.".format(self.path)) from self._error
+    self._queue.put(record)
+
+  def flush(self):
+    '''Wait for our thread to give everything that is queued to the Writer
+        and flush it.
+    '''
+    if self._thread.is_alive():
+      flushed = threading.Event()
+      self._queue.put(flushed)
+      flushed.wait()
+    if self._error:
+      raise Exception("Sink thread for [{}] failed.".format(self.path)) from self._error
+
+  def close(self):
+    '''Wait for our thread to give everything that is queued to the Writer
+        then close the Writer.
+    '''
+    if self._closed:
+      return
+    self._closed = True
+
+    if self._thread.is_alive():
+      self._queue.put(_CLOSE)
+      self._thread.join()
+
+    self.writer.close()
+
+    if self._error:
+      raise Exception("Sink thread for [{}] failed.".format(self.path)) from self._error
+
+  def abandon(self):
+    '''See Writer.abandon(). Our thread does not survive a fork.
+    '''
+    self._closed = True
+    self.writer.abandon()
+
+  # Internals
+
+  def _run(self):
+    '''Our thread.
+    '''
+    while True:
+      record = self._queue.get()
+      if record is _CLOSE:
+        return
+      try:
+        if isinstance(record, threading.Event):
+          self.writer.flush()
+        else:
+          self.writer.write(record)
+      except Exception as e:
+        self._error = e
+        return
+      finally:
+        if isinstance(record, threading.Event):
+          record.set()
@@ -0,0 +1,208 @@
+
+import logging
+import os
+import queue
+import threading
+import time
+
+from ..summary import Summary
+from .backpressure import Backpressure
+from .writer import Writer
+
+logger = logging.getLogger(__name__)
+
+# Marker put on the queue by close().
+# flush() puts a threading.Event on the queue.
+_CLOSE = object()
+
+
+class ThreadedWriter(Writer):
+  '''A Writer that keeps file I/O off of the recording thread.
+
+    write() only puts the (already built) record on a bounded queue.
+    A dedicated writer thread drains the queue in batches, encodes the
+    records and appends them to the output as its FlushPolicy dictates.
+
+    When the queue is full the `backpressure` policy decides what happens
+    to the record being written. See Backpressure.
+
+    Everything still in the queue is written by close() which is called
+    automatically at interpreter exit.
+  '''
+
+  def __init__(self, path, medium, *,
+               queue_size=1024, batch_size=256, backpressure=Backpressure.BLOCK, **kwargs):
+    '''Construct the ThreadedWriter and start its writer thread.
+
+      Args:
+        path (str): Path to which records are appended.
+        medium (RecordingMedium): Encodes the records.
+        queue_size (int): Maximum number of records waiting to be written.
+        batch_size (int): Maximum number of records written at once.
+        backpressure (Backpressure): What to do when the queue is full.
+        flush_policy (FlushPolicy): Optional. When to write buffered records.
+    '''
+    super().__init__(path, medium, **kwargs)
+
+    self.batch_size = batch_size
+    self.backpressure = backpressure
+    self.dropped = 0
+
+    self._queue = queue.Queue(maxsize=queue_size)
+    self._error = None
+
+    # SPILL bookkeeping. Once we start spilling, everything goes to the
+    # spill file until the writer thread has emptied the queue and copied
+    # the spill file to the output. This keeps the output in order.
+    self._spill_lock = threading.Lock()
+    self._spill_path = self.path + '.spill'
+    self._spill = None
+    self._spilling = False
+    # Summary entries & sizes of the spilled records.
+    self._spilled = []
+
+    self._thread = threading.Thread(
+        target=self._run, name='rekorder-writer [{}]'.format(self.path), daemon=True)
+    self._thread.start()
+
+  def write(self, record):
+    '''Queue `record` for the writer thread.
+    '''
+    if self._error:
+      raise Exception("Writer thread for [{}] failed.".format(self.path)) from self._error
+
+    if self.backpressure == Backpressure.BLOCK:
+      self._queue.put(record)
+
+    elif self.backpressure == Backpressure.DROP:
+      try:
+        self._queue.put_nowait(record)
+      except queue.Full:
+        self.dropped += 1
+
+    elif self.backpressure == Backpressure.SPILL:
+      with self._spill_lock:
+        if not self._spilling:
+          try:
+            self._queue.put_nowait(record)
+            return
+          except queue.Full:
+            self._spilling = True
+        self._spill_record(record)
+
+    else:
+      raise Exception("Unsupported backpressure [{}]".format(self.backpressure))
+
+  def flush(self):
+    '''Wait for the writer thread to write everything that is queued.
+    '''
+    if self._thread.is_alive():
+      flushed = threading.Event()
+      self._queue.put(flushed)
+      flushed.wait()
+
+  def close(self):
+    '''Wait for the writer thread to write everything that is queued then
+        close the output.
+    '''
+    if self.closed:
+      return
+
+    if self._thread.is_alive():
+      self._queue.put(_CLOSE)
+      self._thread.join()
+    self._drain_spill()
+
+    if self._spill:
+      self._spill.close()
+      os.remove(self._spill_path)
+
+    if self.dropped:
+      logger.warning("Dropped [{}] tunes while recording [{}].".format(self.dropped, self.path))
+
+    super().close()
+
+    if self._error:
+      raise Exception("Writer thread for [{}] failed.".format(self.path)) from self._error
+
+  # Internals
+
+  def _run(self):
+    '''The writer thread.
+    '''
+    done = False
+    while not done:
+      try:
+        batch = [self._queue.get(timeout=self._timeout())]
+      except queue.Empty:
+        # The oldest buffered tune has reached the FlushPolicy's deadline.
+        batch = []
+
+      while len(batch) < self.batch_size:
+        try:
+          batch.append(self._queue.get_nowait())
+        except queue.Empty:
+          break
+
+      flushed = [record for record in batch if isinstance(record, threading.Event)]
+      try:
+        for record in batch:
+          if record is _CLOSE:
+            done = True
+          elif not isinstance(record, threading.Event):
+            self._buffer(self._encode(record))
+
+        if not batch or flushed or done or \
+                self.flush_policy.due(len(self._pending), self._pending_since):
+          self._flush()
+
+        if flushed and not self.connected:
+          self.summary.save(self.segment)
+
+        if self._queue.empty():
+          self._drain_spill()
+
+      except Exception as e:
+        self._error = e
+        return
+
+      finally:
+        for event in flushed:
+          event.set()
+
+  def _timeout(self):
+    '''How long the writer thread may wait for the next record.
+    '''
+    deadline = self.flush_policy.deadline(self._pending_since) if self._pending else None
+    if deadline is None:
+      return None
+    return max(0, deadline - time.monotonic())
+
+  def _spill_record(self, record):
+    if not self._spill:
+      self._spill = open(self._spill_path, 'w+b')
+    # The writer thread may be encoding other records at the same time.
+    data = self.medium.encode(record, standalone=True)
+    self._spill.write(data)
+    self._spilled.append((Summary.entry(record), len(data)))
+
+  def _drain_spill(self):
+    '''Copy the spill file to the output and resume queueing.
+        Only called when the queue is empty.
+    '''
+    with self._spill_lock:
+      if not self._spilling:
+        return
+      # Everything that is buffered was queued before the first spilled tune.
+      self._spill.seek(0)
+      spilled = self._spill.read()
+      self._buffer(spilled)
+      if self.connected:
+        self._unsent.append(spilled)
+      for entry, size in self._spilled:
+        self.summary.add(entry, size)
+      self._spilled = []
+      self._flush()
+      self._spill.seek(0)
+      self._spill.truncate()
+      self._spilling = False
@@ -0,0 +1,289 @@
+
+import atexit
+import json
+import logging
+import os
+import socket
+import time
+
+from .. import compression
+from ..medium import RecordingMedium
+from ..summary import Summary
+from .flush import FlushPolicy
+from .rotation import Manifest
+
+logger = logging.getLogger(__name__)
+
+
+class Writer:
+  '''Append encoded records to a Cassette's output.
+
+    Writer encodes each record on the calling thread as soon as it is given
+    one and writes to the output whenever its FlushPolicy says so.
+    See ThreadedWriter for an asynchronous alternative.
+
+    The Writer also maintains a Summary of what it has written which is
+    saved next to the output by flush() and close().
+
+    With a RotationPolicy the records are written to a series of segments
+    listed by a Manifest rather than to the output itself.
+
+    Given a `collector` (the path of the Unix domain socket on which
+    `rekorder collect` listens, see Collector) the records are sent to the
+    collector rather than written to the output. The output is only written
+    if there is no collector or if the collector goes away while recording.
+    The records are sent a batch at a time as the FlushPolicy dictates
+    (by default COLLECTOR_BATCH records or every COLLECTOR_MILLISECONDS) and
+    no Summary is saved. If the collector goes away, the output begins with
+    the header and the batch that could not be sent. It continues the
+    collector's cassette and can be described but not played back.
+
+    Usage:
+
+      writer = Writer(path='greatest-hits.json', medium=JsonMedium())
+      writer.write({...})
+      writer.close()  # Also done automatically at interpreter exit.
+  '''
+
+  # Default FlushPolicy with a collector.
+  COLLECTOR_BATCH = 64
+  COLLECTOR_MILLISECONDS = 100
+  # Default FlushPolicy for a .bz2 or .xz output. See compression.streamed().
+  STREAMED_BATCH = 1024
+
+  def __init__(self, path, medium, *,
+               flush_policy=None, compression_level=None, rotation_policy=None,
+               collector=None, name=None, **kwargs):
+    '''Construct the Writer.
+
+      Any previous content of `path` is discarded.
+
+      Args:
+        path (str): Path to which records are appended.
+        medium (RecordingMedium): Encodes the records.
+        flush_policy (FlushPolicy): Optional. When to write buffered records.
+                                    Default is after every record (in
+                                    batches with a `collector` or a .bz2
+                                    or .xz `path`).
+        compression_level (int): Optional. Used when `path` ends in .gz,
+                                 .bz2 or .xz. See compression.open_output().
+        rotation_policy (RotationPolicy): Optional. When to begin a new
+                                          segment. Default is never.
+        collector (str): Optional. Path of the socket of the Collector to
+                         which the records are sent.
+        name (str): Optional. The name of the Recorder, for the Collector.
+    '''
+    super().__init__()
+
+    if collector and rotation_policy:
+      raise Exception("A cassette sent to a collector [{}] cannot be rotated.".format(collector))
+
+    self.path = path
+    self.medium = medium
+    if not flush_policy:
+      if collector:
+        flush_policy = FlushPolicy(
+            tunes=Writer.COLLECTOR_BATCH, milliseconds=Writer.COLLECTOR_MILLISECONDS)
+      elif compression.streamed(path):
+        flush_policy = FlushPolicy(tunes=Writer.STREAMED_BATCH)
+      else:
+        flush_policy = FlushPolicy()
+    self.flush_policy = flush_policy
+    self.compression_level = compression_level
+    self.rotation_policy = rotation_policy
+    self.manifest = Manifest(self.path) if rotation_policy else None
+    self.collector = collector
+    self.name = name
+    # Are we sending to the collector?
+    self.connected = False
+    self.closed = False
+
+    self._pending = []
+    self._pending_since = None
+    # While we are connected, the records of the header and those buffered
+    # since the last batch was sent. See _disconnected().
+    self._header = []
+    self._unsent = []
+
+    self._begin_segment()
+
+    atexit.register(self.close)
+
+  def write(self, record):
+    '''Encode `record` and buffer it. Flush if our FlushPolicy says so.
+    '''
+    self._buffer(self._encode(record))
+    if self.flush_policy.due(len(self._pending), self._pending_since):
+      self._flush()
+
+  def flush(self):
+    '''Write everything that is buffered to the output and save the Summary.
+    '''
+    self._flush()
+    if not self.connected:
+      self.summary.save(self.segment)
+
+  def close(self):
+    '''Write anything that is pending and close the output.
+        It is safe to call close() more than once.
+    '''
+    if self.closed:
+      return
+    self._flush()
+    self.closed = True
+    self._finish_segment()
+    atexit.unregister(self.close)
+
+  def abandon(self):
+    '''Give up the output without writing anything more to it.
+
+      A forked child inherits its parent's Writer. What the Writer has
+      pending is the parent's to write so the child abandons it (see
+      Cassette) rather than closing it.
+    '''
+    if self.closed:
+      return
+    self.closed = True
+    self._pending = []
+    atexit.unregister(self.close)
+    # Whatever the stream still holds (e.g. - the end of a compressed
+    # stream) goes nowhere when it is closed.
+    null = os.open(os.devnull, os.O_WRONLY)
+    try:
+      os.dup2(null, self.stream.fileno())
+    finally:
+      os.close(null)
+    self.stream.close()
+
+  # Internals
+
+  def _begin_segment(self):
+    '''Open the output (or, with a RotationPolicy, its next segment).
+    '''
+    self.segment = self.manifest.begin() if self.manifest else self.path
+    self.segment_since = time.monotonic()
+
+    self.summary = Summary(format=self.medium.format)
+    self.stream = self._connect() if self.collector else None
+    if not self.connected:
+      Summary.discard(self.segment)
+      self.stream = compression.open_output(self.segment, level=self.compression_level)
+    preamble = self.medium.preamble()
+    self._write(preamble)
+    self.summary.skip(len(preamble))
+
+  def _finish_segment(self):
+    self.stream.close()
+    if self.connected:
+      return
+    path = self.segment
+    if self.manifest and self.rotation_policy.finalize:
+      path = self.rotation_policy.finalize(path) or path
+      if path != self.segment:
+        Summary.discard(self.segment)
+    self.summary.save(path)
+    if self.manifest:
+      self.manifest.finish(path)
+
+  def _rotate(self):
+    self._finish_segment()
+    # Every segment must be readable without the ones before it so the
+    # next one is encoded by a medium without any state (e.g. - strings
+    # interned by BinaryMedium).
+    self.medium = RecordingMedium.for_output(
+        self.path, format=self.medium.format, serializers=self.medium.serializers)
+    self._begin_segment()
+
+  def _encode(self, record):
+    data = self.medium.encode(record)
+    self.summary.add(Summary.entry(record), len(data))
+    if self.connected:
+      self._unsent.append(record)
+      if record.get('title', None) == 'header':
+        self._header.append(record)
+    return data
+
+  def _buffer(self, data):
+    if not self._pending:
+      self._pending_since = time.monotonic()
+    self._pending.append(data)
+
+  def _flush(self):
+    if not self._pending:
+      return
+
+    data = b''.join(self._pending)
+    self._pending = []
+    self._pending_since = None
+
+    self._write(data)
+    self._unsent = []
+
+    if self.flush_policy.fsync and not self.connected:
+      os.fsync(self.stream.fileno())
+
+    if self.rotation_policy and self.rotation_policy.due(
+            self.summary.bytes, self.summary.tunes, self.segment_since):
+      self._rotate()
+
+  def _write(self, data):
+    try:
+      view = memoryview(data)
+      while view:
+        view = view[self.stream.write(view):]
+      # A no-op for uncompressed outputs. Compressed outputs push what they
+      # have compressed so far to the file.
+      self.stream.flush()
+    except OSError as e:
+      if not self.connected:
+        raise
+      self._disconnected(e, len(data))
+
+  def _connect(self):
+    '''A stream to our collector or None if it is not there.
+    '''
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+      sock.connect(self.collector)
+      # The collector files what follows by who we are.
+      sock.sendall(json.dumps({
+          'name': self.name, 'pid': os.getpid(), 'format': self.medium.format,
+          'output': self.path}).encode() + b'\n')
+    except OSError as e:
+      sock.close()
+      logger.warning("No collector at [{}] ({}). Recording to [{}].".format(
+          self.collector, e, self.path))
+      return None
+    self.connected = True
+    stream = sock.makefile('wb', buffering=0)
+    # Closed when `stream` is.
+    sock.close()
+    return stream
+
+  def _disconnected(self, error, lost):
+    '''The collector went away. Record the rest to the output, beginning
+        with the header and the batch that may not have been sent.
+    '''
+    logger.warning(
+        "Lost the collector at [{}] ({}) while sending [{}] bytes. Recording them and the rest to [{}] "
+        "which continues the collected cassette. It can be described but not played back.".format(
+            self.collector, error, lost, self.path))
+    try:
+      self.stream.close()
+    except OSError:
+      pass
+    self.connected = False
+    self.collector = None
+    # Like a new segment, the output must be readable without what the
+    # collector was sent (e.g. - strings interned by BinaryMedium) so the
+    # records are encoded again.
+    self.medium = RecordingMedium.for_output(
+        self.path, format=self.medium.format, serializers=self.medium.serializers)
+    self._begin_segment()
+    header = [record for record in self._header if not any(record is r for r in self._unsent)]
+    self._write(b''.join(
+        # Spilled records (see ThreadedWriter) were encoded standalone.
+        record if isinstance(record, bytes) else self._encode(record)
+        for record in header + self._unsent))
+    self._header = []
+    self._unsent = []